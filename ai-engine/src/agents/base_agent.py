@@ -8,6 +8,18 @@ from datetime import datetime, timezone
 from src.core.memory import MemoryCore
 from src.core.message_bus import message_bus
 from src.services.db import db_pool
+from src.services.queries import queries
+
+queries.register(
+    "agent.heartbeat",
+    """INSERT INTO ualgo_agent_heartbeat
+       (agent_name, last_heartbeat, status, active_tasks, version, uptime_seconds)
+       VALUES (:agent_name, NOW(), 'alive', :active_tasks, :version, :uptime_seconds)
+       ON CONFLICT (agent_name)
+       DO UPDATE SET last_heartbeat = NOW(), status = 'alive',
+                    active_tasks = :active_tasks, version = :version,
+                    uptime_seconds = :uptime_seconds""",
+)
 
 
 class BaseAgent(ABC):
@@ -36,17 +48,12 @@ class BaseAgent(ABC):
     async def heartbeat(self):
         """Report agent health to the database."""
         uptime = int(time.monotonic() - self._start_time)
-        await db_pool.execute(
-            """INSERT INTO ualgo_agent_heartbeat
-               (agent_name, last_heartbeat, status, active_tasks, version, uptime_seconds)
-               VALUES ($1, NOW(), 'alive', $2, $3, $4)
-               ON CONFLICT (agent_name)
-               DO UPDATE SET last_heartbeat = NOW(), status = 'alive',
-                            active_tasks = $2, version = $3, uptime_seconds = $4""",
-            self.name,
-            self._active_tasks,
-            self.version,
-            uptime,
+        await db_pool.execute_named(
+            "agent.heartbeat",
+            agent_name=self.name,
+            active_tasks=self._active_tasks,
+            version=self.version,
+            uptime_seconds=uptime,
         )
 
     async def run_with_tracking(self, symbol: str, **kwargs) -> dict:
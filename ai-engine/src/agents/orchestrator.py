@@ -15,7 +15,16 @@ Decision cycle (6 steps):
 Consensus logic:
 - Risk Sentinel reject → always reject (hard veto)
 - Otherwise: weighted vote (technical 40%, alpha 30%, risk 30%)
+- Vote weights are the calibrated set for the symbol's price regime
+  (``market_regime``, trend × volatility on the scan timeframe)
 - Approve if weighted_confidence >= min_confidence threshold
+
+Steps 1-2 (``gather_inputs``) depend only on the (symbol, timeframe), not the
+strategy. The multi-strategy scan planner (``src/tasks/scan_planner.py``) runs
+them once per pair, sizes every strategy's candidate of the dispatch in one
+``size_candidates`` call (each with its strategy's ``max_risk_per_trade``),
+runs ``assess_risk`` per candidate and hands the results to ``run_scan_cycle``
+for each strategy; a standalone call computes them itself.
 """
 
 import asyncio
@@ -25,8 +34,12 @@ from collections import deque
 from datetime import datetime, timezone
 
 from src.agents.base_agent import BaseAgent
+from src.config import settings
 from src.core.decision_engine import decision_engine
+from src.core.mark_to_market import mark_to_market
+from src.core.market_regime import market_regime
 from src.core.message_bus import message_bus
+from src.core.position_sizing import position_sizer
 from src.models.signal import ConsensusVote, Signal, SignalDirection, SignalStatus, VoteType
 from src.services.db import db_pool
 
@@ -47,7 +60,7 @@ class PrimeOrchestrator(BaseAgent):
         super().__init__(
             name="orchestrator",
             role="The Brain — Consensus voting, signal aggregation, final decision",
-            version="1.3.0",
+            version="1.4.0",
         )
         self._cycles_run: int = 0
         self._signals_approved: int = 0
@@ -67,11 +80,137 @@ class PrimeOrchestrator(BaseAgent):
             timeframe=kwargs.get("timeframe", "1h"),
         )
 
+    async def gather_inputs(
+        self, symbol: str, timeframe: str = "1h", candles: list[dict] | None = None, sentiment: bool = True
+    ) -> dict:
+        """Steps 1-2: candles, then Alpha Scout + Technical Analyst in parallel.
+
+        Returns ``{"candles", "technical", "alpha"}``; ``alpha`` is None when
+        ``sentiment`` is off.
+        """
+        from src.agents.alpha_scout import alpha_scout
+        from src.agents.technical_analyst import technical_analyst
+
+        if candles is None:
+            candles = await self._get_candles(symbol, timeframe=timeframe)
+        technical = technical_analyst.run_with_tracking(symbol, candles=candles, timeframe=timeframe)
+        if not sentiment:
+            return {"candles": candles, "technical": await technical, "alpha": None}
+        alpha_result, tech_result = await asyncio.gather(
+            alpha_scout.run_with_tracking(symbol, include_macro=True),
+            technical,
+        )
+        return {"candles": candles, "technical": tech_result, "alpha": alpha_result}
+
+    @staticmethod
+    def candidate(symbol: str, tech_result: dict, max_risk_per_trade: float | None = None) -> dict:
+        """Sizing candidate for a technical result."""
+        return {
+            "symbol": symbol,
+            "entry_price": tech_result.get("entry_price"),
+            "stop_loss": tech_result.get("stop_loss"),
+            "atr": tech_result.get("atr"),
+            "max_risk_per_trade": max_risk_per_trade,
+        }
+
+    async def size_candidates(self, candidates: list[dict]) -> list[dict]:
+        """Size every candidate of a cycle in one pass against equity and open exposure.
+
+        Uses the configured sizing method (``U2ALGO_SIZING_METHOD``) with
+        per-trade risk, concentration and gross exposure caps; concentration
+        and gross exposure apply across the whole batch. Each sizing also
+        carries its ``trade_risk`` (fraction of portfolio to the stop).
+        """
+        from src.agents.risk_sentinel import risk_sentinel
+
+        if not candidates:
+            return []
+        portfolio = await risk_sentinel.get_portfolio_state()
+        sizings = position_sizer.size(
+            candidates,
+            equity=portfolio["total_value"],
+            exposure=mark_to_market.exposure_by_symbol(),
+        )
+        trade_risks = risk_sentinel.compute_trade_risks(
+            [{**c, "quantity": s["quantity"]} for c, s in zip(candidates, sizings)], portfolio
+        )
+        for sizing, trade_risk in zip(sizings, trade_risks):
+            sizing["trade_risk"] = round(float(trade_risk), 6)
+        return sizings
+
+    async def assess_risk(
+        self,
+        symbol: str,
+        timeframe: str,
+        tech_result: dict,
+        sizing: dict | None = None,
+        max_risk_per_trade: float | None = None,
+    ) -> dict:
+        """Run the Risk Sentinel on the technical candidate.
+
+        Args:
+            sizing: The candidate's ``size_candidates`` result; sized alone when None.
+            max_risk_per_trade: Strategy's per-trade risk limit (default: setting).
+
+        Returns ``{"sizing", "risk"}``.
+        """
+        from src.agents.risk_sentinel import risk_sentinel
+
+        if sizing is None:
+            [sizing] = await self.size_candidates([self.candidate(symbol, tech_result, max_risk_per_trade)])
+        risk_result = await risk_sentinel.run_with_tracking(
+            symbol,
+            proposed_signal={
+                "direction": tech_result.get("direction", "NEUTRAL"),
+                "entry_price": tech_result.get("entry_price"),
+                "stop_loss": tech_result.get("stop_loss"),
+                "quantity": sizing["quantity"],
+                "trade_risk": sizing.get("trade_risk"),
+                "max_risk_per_trade": sizing.get("max_risk_per_trade"),
+            },
+            timeframe=timeframe,
+        )
+        return {"sizing": sizing, "risk": risk_result}
+
+    @staticmethod
+    def skip_reason(tech_result: dict) -> str | None:
+        """Why a technical result gives no candidate signal (None if it does)."""
+        if tech_result.get("error"):
+            return f"Technical analysis error: {tech_result['error']}"
+        direction = tech_result.get("direction", "NEUTRAL")
+        confidence = tech_result.get("confidence", 0.5)
+        # Neutral signals are skipped early — no point in consensus voting
+        if direction == "NEUTRAL" and confidence < 0.4:
+            return f"No clear direction (direction={direction}, confidence={confidence:.2%})"
+        return None
+
     async def run_scan_cycle(
-        self, symbol: str, strategy_id: str = "default", timeframe: str = "1h"
+        self,
+        symbol: str,
+        strategy_id: str = "default",
+        timeframe: str = "1h",
+        inputs: dict | None = None,
+        risk: dict | None = None,
+        min_confidence: float = MIN_CONSENSUS_CONFIDENCE,
+        agents_enabled: list[str] | None = None,
+        paper: bool = True,
+        max_risk_per_trade: float | None = None,
+        features: dict[str, dict | None] | None = None,
     ) -> dict:
         """Full orchestration cycle for one symbol.
 
+        Args:
+            inputs: Shared ``gather_inputs`` result; fetched here when None.
+            risk: Shared ``assess_risk`` result; evaluated here when None.
+            min_confidence: Strategy's minimum weighted consensus confidence.
+            agents_enabled: Strategy's agents; Alpha Scout is left out of the
+                blend and the vote when absent (default: all).
+            paper: Submit approved signals to the paper executor.
+            max_risk_per_trade: Strategy's per-trade risk limit, used when
+                ``risk`` is evaluated here (default: setting).
+            features: Strategy's feature-store values at the scanned bar,
+                recorded with the signal's reasoning.
+
         Returns a result dict describing the decision, or a skip reason.
         """
         self._cycles_run += 1
@@ -81,25 +220,22 @@ class PrimeOrchestrator(BaseAgent):
             f"(strategy={strategy_id}, tf={timeframe})"
         )
 
-        # Step 1: Fetch candle data
-        candles = await self._get_candles(symbol, timeframe=timeframe)
-
-        # Step 2: Run Alpha Scout + Technical Analyst in parallel
-        from src.agents.alpha_scout import alpha_scout
         from src.agents.risk_sentinel import risk_sentinel
-        from src.agents.technical_analyst import technical_analyst
 
-        alpha_result, tech_result = await asyncio.gather(
-            alpha_scout.run_with_tracking(symbol, include_macro=True),
-            technical_analyst.run_with_tracking(symbol, candles=candles, timeframe=timeframe),
-        )
+        # Steps 1-2: candles, sentiment and technical analysis
+        use_alpha = agents_enabled is None or "alpha_scout" in agents_enabled
+        if inputs is None:
+            inputs = await self.gather_inputs(symbol, timeframe, sentiment=use_alpha)
+        tech_result = inputs["technical"]
+        alpha_result = (inputs.get("alpha") if use_alpha else None) or {}
 
         # Step 3: Evaluate technical result — it's the primary signal source
-        if tech_result.get("error"):
+        skip = self.skip_reason(tech_result)
+        if skip:
             return {
                 "symbol": symbol,
                 "action": "skip",
-                "reason": f"Technical analysis error: {tech_result['error']}",
+                "reason": skip,
                 "cycle": self._cycles_run,
                 "timestamp": cycle_start.isoformat(),
             }
@@ -107,23 +243,15 @@ class PrimeOrchestrator(BaseAgent):
         direction = tech_result.get("direction", "NEUTRAL")
         tech_confidence = tech_result.get("confidence", 0.5)
 
-        # Skip neutral signals early — no point in consensus voting
-        if direction == "NEUTRAL" and tech_confidence < 0.4:
-            return {
-                "symbol": symbol,
-                "action": "skip",
-                "reason": f"No clear direction (direction={direction}, confidence={tech_confidence:.2%})",
-                "cycle": self._cycles_run,
-                "timestamp": cycle_start.isoformat(),
-            }
-
         # Sentiment confirmation: if alpha strongly disagrees with direction, reduce confidence
         alpha_direction = alpha_result.get("direction", "NEUTRAL")
         alpha_confidence = alpha_result.get("confidence", 0.3)
         sentiment_agreement = alpha_direction == direction
 
         # Confidence blend: 70% technical, 30% sentiment
-        if sentiment_agreement or alpha_direction == "NEUTRAL":
+        if not use_alpha:
+            blended_confidence = tech_confidence
+        elif sentiment_agreement or alpha_direction == "NEUTRAL":
             blended_confidence = tech_confidence * 0.70 + alpha_confidence * 0.30
         else:
             # Disagreement: penalize confidence
@@ -131,6 +259,9 @@ class PrimeOrchestrator(BaseAgent):
 
         blended_confidence = max(0.0, min(0.95, blended_confidence))
 
+        # Price regime, updated when the Technical Analyst's snapshot closed a new candle
+        regime = market_regime.get(symbol, timeframe)
+
         # Step 4: Build candidate signal
         signal = Signal(
             symbol=symbol,
@@ -151,6 +282,8 @@ class PrimeOrchestrator(BaseAgent):
                     "regime": alpha_result.get("market_regime", "UNKNOWN"),
                     "summary": alpha_result.get("summary", ""),
                 },
+                "market_regime": regime.as_dict() if regime else None,
+                "features": features or {},
                 "confidence_blend": {
                     "technical": round(tech_confidence, 4),
                     "sentiment": round(alpha_confidence, 4),
@@ -165,15 +298,10 @@ class PrimeOrchestrator(BaseAgent):
         signal.id = signal_id
 
         # Step 5: Risk Sentinel evaluation (hard veto authority)
-        risk_result = await risk_sentinel.run_with_tracking(
-            symbol,
-            proposed_signal={
-                "direction": direction,
-                "entry_price": signal.entry_price,
-                "stop_loss": signal.stop_loss,
-                "quantity": self._compute_position_size(signal, risk_result_placeholder=None),
-            },
-        )
+        if risk is None:
+            risk = await self.assess_risk(symbol, timeframe, tech_result, max_risk_per_trade=max_risk_per_trade)
+        sizing, risk_result = risk["sizing"], risk["risk"]
+        quantity = sizing["quantity"]
 
         # Kill switch: immediate reject without consensus
         if risk_result.get("kill_switch_active", False):
@@ -192,16 +320,6 @@ class PrimeOrchestrator(BaseAgent):
 
         # Step 6: Collect consensus votes
         votes = [
-            ConsensusVote(
-                signal_id=signal_id,
-                agent_name="alpha_scout",
-                vote=VoteType.APPROVE if sentiment_agreement else VoteType.ABSTAIN,
-                confidence=alpha_confidence,
-                reasoning={
-                    "sentiment_score": alpha_result.get("sentiment_score", 0),
-                    "market_regime": alpha_result.get("market_regime", "UNKNOWN"),
-                },
-            ),
             ConsensusVote(
                 signal_id=signal_id,
                 agent_name="technical_analyst",
@@ -224,15 +342,28 @@ class PrimeOrchestrator(BaseAgent):
                 },
             ),
         ]
+        if use_alpha:
+            votes.insert(0, ConsensusVote(
+                signal_id=signal_id,
+                agent_name="alpha_scout",
+                vote=VoteType.APPROVE if sentiment_agreement else VoteType.ABSTAIN,
+                confidence=alpha_confidence,
+                reasoning={
+                    "sentiment_score": alpha_result.get("sentiment_score", 0),
+                    "market_regime": alpha_result.get("market_regime", "UNKNOWN"),
+                },
+            ))
 
-        consensus = await decision_engine.collect_votes(signal, votes)
+        consensus = await decision_engine.collect_votes(
+            signal, votes, regime=regime.label if regime else None
+        )
 
         # Override: require minimum confidence even if votes approve
-        if consensus.approved and consensus.weighted_confidence < MIN_CONSENSUS_CONFIDENCE:
+        if consensus.approved and consensus.weighted_confidence < min_confidence:
             consensus.approved = False
             logger.info(
                 f"[{self.name}] signal {signal_id} overridden: "
-                f"confidence {consensus.weighted_confidence:.2%} < {MIN_CONSENSUS_CONFIDENCE:.2%} threshold"
+                f"confidence {consensus.weighted_confidence:.2%} < {min_confidence:.2%} threshold"
             )
 
         # Step 7: Update signal status
@@ -260,6 +391,7 @@ class PrimeOrchestrator(BaseAgent):
 
         result = {
             "symbol": symbol,
+            "strategy_id": strategy_id,
             "signal_id": signal_id,
             "direction": direction,
             "action": "execute" if consensus.approved else "reject",
@@ -269,19 +401,22 @@ class PrimeOrchestrator(BaseAgent):
             "stop_loss": signal.stop_loss,
             "take_profit": signal.take_profit,
             "risk_reward": signal.risk_reward,
+            "quantity": quantity,
+            "sizing": sizing,
             "timeframe": timeframe,
             "consensus": {
                 "approved": consensus.approved,
                 "approve_count": consensus.approve_count,
                 "reject_count": consensus.reject_count,
                 "weighted_confidence": consensus.weighted_confidence,
-                "min_required": MIN_CONSENSUS_CONFIDENCE,
+                "min_required": min_confidence,
             },
             "risk": {
                 "score": risk_result.get("risk_score", 0),
                 "flags": risk_result.get("risk_flags", []),
                 "kill_switch": risk_result.get("kill_switch_active", False),
             },
+            "market_regime": regime.as_dict() if regime else None,
             "sentiment": {
                 "direction": alpha_direction,
                 "score": alpha_result.get("sentiment_score", 0),
@@ -316,15 +451,16 @@ class PrimeOrchestrator(BaseAgent):
         if consensus.approved:
             risk_sentinel.record_trade_executed()
 
-        return result
-
-    def _compute_position_size(self, signal: Signal, risk_result_placeholder) -> float:
-        """Compute position quantity using fixed fractional sizing (placeholder).
+        # Paper execution: entry order on the local matching engine
+        if consensus.approved and paper and settings.paper_trading_enabled:
+            from src.execution.paper_executor import paper_executor
+            try:
+                order = await paper_executor.submit_signal(signal, quantity)
+                result["order_id"] = order.id if order else None
+            except Exception as e:
+                logger.error(f"[{self.name}] paper execution failed for signal {signal_id}: {e}")
 
-        In production: use portfolio value from risk_sentinel + max_risk_per_trade.
-        """
-        # Default micro-size for safety — real implementation queries portfolio
-        return 0.01
+        return result
 
     async def _persist_signal(self, signal: Signal) -> int:
         """Insert a pending signal into the database and return its ID."""
@@ -362,7 +498,7 @@ class PrimeOrchestrator(BaseAgent):
         """Fetch OHLCV candle data from Binance via the binance_ws service."""
         try:
             from src.services.binance_ws import get_recent_candles
-            return await get_recent_candles(symbol, timeframe=timeframe, limit=limit)
+            return await get_recent_candles(symbol, interval=timeframe, limit=limit)
         except Exception as e:
             logger.warning(f"[{self.name}] candle fetch failed for {symbol}: {e}")
             return []
@@ -9,9 +9,10 @@ Analysis pipeline:
 1. Compute 30-day trading performance (win rate, Sharpe, drawdown, Calmar ratio)
 2. Analyze per-agent voting accuracy vs realized outcomes
 3. Detect regime changes and strategy drift
-4. Generate parameter tuning recommendations
-5. Create daily portfolio snapshot
-6. Store structured learnings in persistent memory
+4. Walk-forward validate the RSI / ATR parameter grid out of sample
+5. Generate parameter tuning recommendations
+6. Create daily portfolio snapshot
+7. Store structured learnings in persistent memory
 """
 
 import logging
@@ -21,6 +22,9 @@ from typing import Optional
 import numpy as np
 
 from src.agents.base_agent import BaseAgent
+from src.backtest.walk_forward import LIVE_PARAMS, walk_forward
+from src.config import settings
+from src.core.agent_weights import PRIOR_WEIGHTS, agent_weights
 from src.services.db import db_pool
 
 logger = logging.getLogger(__name__)
@@ -33,6 +37,7 @@ class QuantLabAgent(BaseAgent):
     - Trading performance: win rate, PnL, Sharpe ratio, Calmar ratio, max drawdown
     - Agent accuracy: how well each agent's votes predicted signal outcomes
     - Strategy health: signal volume, direction balance, confidence calibration
+    - Parameter validation: walk-forward out-of-sample stability of the RSI / ATR grid
     - System recommendations: actionable parameter changes with expected impact
     """
 
@@ -71,9 +76,13 @@ class QuantLabAgent(BaseAgent):
         # Run all analyses
         performance = await self._compute_performance(strategy_id, lookback_days)
         agent_accuracy = await self._analyze_agent_accuracy(lookback_days=7)
+        weights = await agent_weights.calibrate()
         signal_health = await self._analyze_signal_health(lookback_days)
         regime = self._classify_regime(performance)
-        recommendations = self._generate_recommendations(performance, agent_accuracy, signal_health)
+        validation = await self._validate_parameters(strategy_id)
+        recommendations = self._generate_recommendations(
+            performance, agent_accuracy, signal_health, validation
+        )
         await self._create_snapshot(performance)
 
         # Store structured learning in persistent memory
@@ -85,6 +94,7 @@ class QuantLabAgent(BaseAgent):
             "agent_accuracy": agent_accuracy,
             "signal_health": signal_health,
             "regime": regime,
+            "validation": validation and validation["overall"],
             "recommendations": recommendations,
         }
         await self.memory.store_learning(learning_payload)
@@ -99,6 +109,14 @@ class QuantLabAgent(BaseAgent):
             "agent_accuracy": agent_accuracy,
             "signal_health": signal_health,
             "regime": regime,
+            "agent_weights": {"version": weights.version, "weights": weights.weights},
+            "validation": validation and {
+                "report_id": validation["report_id"],
+                "windows_planned": validation["windows_planned"],
+                "windows_completed": validation["windows_completed"],
+                "budget_exhausted": validation["budget_exhausted"],
+                "overall": validation["overall"],
+            },
             "recommendations": recommendations,
             "snapshot_created": True,
             "optimization_number": self._optimization_count,
@@ -299,6 +317,16 @@ class QuantLabAgent(BaseAgent):
             "unique_symbols": len(symbol_counts),
         }
 
+    async def _validate_parameters(self, strategy_id: str) -> dict | None:
+        """Walk-forward stability report for the parameter grid (None when disabled or failed)."""
+        if not settings.walk_forward_enabled:
+            return None
+        try:
+            return await walk_forward.run(strategy_id=strategy_id)
+        except Exception as e:
+            logger.error(f"[{self.name}] walk-forward validation failed: {e}")
+            return None
+
     def _classify_regime(self, performance: dict) -> str:
         """Classify current market regime based on performance metrics."""
         win_rate = performance.get("win_rate", 0)
@@ -323,6 +351,7 @@ class QuantLabAgent(BaseAgent):
         performance: dict,
         agent_accuracy: dict,
         signal_health: dict,
+        validation: dict | None = None,
     ) -> list[str]:
         """Generate prioritized, actionable parameter tuning recommendations."""
         recs: list[str] = []
@@ -377,7 +406,7 @@ class QuantLabAgent(BaseAgent):
 
         # Approval rate
         if approval_rate < 0.20:
-            recs.append(f"🟡 Low approval rate ({approval_rate:.0%}) — risk_sentinel may be too conservative; review volatility_threshold")
+            recs.append(f"🟡 Low approval rate ({approval_rate:.0%}) — risk_sentinel may be too conservative; review var_limit / max_risk_per_trade")
         elif approval_rate > 0.80:
             recs.append(f"🟡 High approval rate ({approval_rate:.0%}) — risk_sentinel may be too permissive; tighten risk_score threshold")
 
@@ -385,15 +414,17 @@ class QuantLabAgent(BaseAgent):
         for agent, acc in agent_accuracy.items():
             agent_accuracy_val = acc.get("accuracy")
             if agent_accuracy_val is not None:
+                weight = agent_weights.weight(agent)
+                prior = PRIOR_WEIGHTS.get(agent, weight)
                 if agent_accuracy_val < 0.45:
                     recs.append(
                         f"🟡 Agent '{agent}' vote accuracy low ({agent_accuracy_val:.1%}) — "
-                        f"reduce its consensus weight or review its signal logic"
+                        f"calibrated weight {weight:.2f} (prior {prior:.2f}); review its signal logic"
                     )
                 elif agent_accuracy_val > 0.70:
                     recs.append(
                         f"🟢 Agent '{agent}' performing well ({agent_accuracy_val:.1%}) — "
-                        f"consider increasing its consensus vote weight"
+                        f"calibrated weight {weight:.2f} (prior {prior:.2f})"
                     )
 
         # Holding period
@@ -403,6 +434,31 @@ class QuantLabAgent(BaseAgent):
             elif avg_hold > 72:
                 recs.append(f"🟡 Long avg hold ({avg_hold:.1f}h) — consider time-based exits for stale positions")
 
+        # Out-of-sample parameter validation
+        overall = (validation or {}).get("overall") or {}
+        if validation and not overall.get("windows"):
+            recs.append("🟡 Walk-forward scored no windows — check candle history and U2ALGO_WALK_FORWARD_* window sizes")
+        elif overall:
+            oos = (
+                f"{overall['windows']} windows, {overall['oos_positive_share']:.0%} profitable out-of-sample, "
+                f"efficiency {overall['efficiency'] if overall['efficiency'] is not None else 'N/A'}"
+            )
+            recommended = overall["recommended"]
+            if not overall["stable"]:
+                recs.append(f"🟡 Walk-forward found no stable RSI/ATR parameter set ({oos}) — keep current parameters; treat stop/target changes above as unvalidated")
+            elif recommended != LIVE_PARAMS:
+                recs.append(
+                    f"🟢 Walk-forward validated RSI {recommended['rsi_period']} at {recommended['oversold']}/{100 - recommended['oversold']}, "
+                    f"SL {recommended['sl_atr']} / TP {recommended['tp_atr']} ATR ({oos}) — candidate to replace the live set"
+                )
+            else:
+                recs.append(f"🟢 Walk-forward confirms the live RSI/ATR parameters out-of-sample ({oos})")
+            if validation["budget_exhausted"]:
+                recs.append(
+                    f"🟡 Walk-forward hit its time budget ({validation['windows_completed']}/{validation['windows_planned']} windows) — "
+                    f"raise U2ALGO_WALK_FORWARD_WORKERS or U2ALGO_WALK_FORWARD_BUDGET_SECONDS"
+                )
+
         if not recs:
             recs.append("🟢 All metrics within target ranges — no parameter changes recommended")
 
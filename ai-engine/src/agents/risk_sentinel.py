@@ -1,4 +1,4 @@
-"""Risk Sentinel Agent — Portfolio protection, kill switch, position sizing, volatility guard.
+"""Risk Sentinel Agent — Portfolio protection, kill switch, position sizing, tail-risk guard.
 
 Role: Risk Guardian
 Mission: Act as the last line of defense before any signal is approved for execution.
@@ -10,7 +10,9 @@ Risk checks (in order of severity):
 2. Daily loss limit breached → activate kill switch + reject
 3. Max drawdown exceeded → activate kill switch + reject
 4. Max open positions reached → reject
-5. Extreme volatility spike → caution or reject
+5. Portfolio tail risk: CVaR beyond limit → activate kill switch + reject;
+   VaR with the proposed trade beyond limit → reject
+5a. High-volatility price regime → caution
 6. Per-trade risk exceeds limit → reject
 7. Concentration risk (same symbol multiple open positions) → caution
 
@@ -25,8 +27,12 @@ import numpy as np
 
 from src.agents.base_agent import BaseAgent
 from src.config import settings
+from src.core.mark_to_market import mark_to_market
+from src.core.market_regime import HIGH_VOL_RATIO, market_regime
 from src.core.message_bus import message_bus
+from src.core.portfolio_var import portfolio_var
 from src.services.db import db_pool
+from src.services.prices import price_service
 
 logger = logging.getLogger(__name__)
 
@@ -37,7 +43,8 @@ class RiskSentinelAgent(BaseAgent):
     The Risk Sentinel has veto power over all trade signals. It evaluates:
     - Portfolio-level metrics (drawdown, daily PnL, position count)
     - Trade-level metrics (per-trade risk % of portfolio)
-    - Market-level metrics (volatility regime from recent signal variance)
+    - Market-level metrics (VaR / CVaR of the open book from simulated returns,
+      the symbol's price volatility regime)
 
     Kill switch activation is logged to memory at max importance (1.0) and
     broadcast to all agents via message bus.
@@ -59,7 +66,8 @@ class RiskSentinelAgent(BaseAgent):
         self.max_open_positions: int = 5
         self.max_daily_loss_pct: float = 0.03        # 3% daily loss limit
         self.max_concentration_pct: float = 0.40     # Max 40% of positions in one symbol
-        self.volatility_threshold: float = 0.30      # Signal confidence std dev threshold
+        self.var_limit: float = getattr(settings, "var_limit", 0.05)
+        self.var_kill_switch_cvar: float = getattr(settings, "var_kill_switch_cvar", 0.10)
 
         # Extended risk controls (from AAnti Trading Agent spec)
         self.max_daily_trades: int = getattr(settings, "max_daily_trades", 10)
@@ -75,15 +83,23 @@ class RiskSentinelAgent(BaseAgent):
         Args:
             symbol: Trading pair e.g. 'BTCUSDT'
             **kwargs:
-                proposed_signal: dict with 'direction', 'entry_price', 'stop_loss', 'quantity'
+                proposed_signal: dict with 'direction', 'entry_price', 'stop_loss', 'quantity',
+                    optionally 'trade_risk' (precomputed by a batch ``compute_trade_risks``)
+                    and 'max_risk_per_trade' (the strategy's limit)
+                timeframe: timeframe whose price regime is checked (default 1h)
 
         Returns:
             Risk evaluation dict including vote, risk_score, flags, and kill_switch status.
         """
         proposed: dict | None = kwargs.get("proposed_signal")
-
-        portfolio = await self._get_portfolio_state()
-        volatility = await self._check_volatility(symbol)
+        mark_price = price_service.get(symbol)
+        if proposed and not proposed.get("entry_price") and mark_price:
+            # Value the proposal at the live price when it carries no entry
+            proposed = {**proposed, "entry_price": mark_price}
+
+        portfolio = await self.get_portfolio_state()
+        market_risk = await self._check_market_risk(symbol, proposed, portfolio)
+        regime = market_regime.get(symbol, kwargs.get("timeframe", "1h"))
         concentration = await self._check_concentration(symbol) if proposed else None
 
         risk_flags: list[str] = []
@@ -145,18 +161,35 @@ class RiskSentinelAgent(BaseAgent):
                 )
                 risk_score = max(risk_score, 0.70)
 
-        # --- SEVERITY 5: Volatility regime ---
-        if volatility.get("is_extreme", False):
-            vol_value = volatility.get("value", 0)
-            risk_flags.append(f"EXTREME_VOLATILITY (signal_std={vol_value:.3f} > {self.volatility_threshold:.2f})")
-            risk_score = max(risk_score, 0.55)
+        # --- SEVERITY 5: Portfolio tail risk ---
+        cvar_pct = market_risk["current"]["cvar_pct"]
+        if cvar_pct > self.var_kill_switch_cvar:
+            risk_flags.append(f"CVAR_EXCEEDED ({cvar_pct:.2%} > {self.var_kill_switch_cvar:.2%} of equity)")
+            risk_score = max(risk_score, 0.90)
+            await self._activate_kill_switch(f"Portfolio CVaR exceeded: {cvar_pct:.2%}")
+        post_trade = market_risk.get("post_trade")
+        if post_trade and post_trade["var_pct"] > max(self.var_limit, market_risk["current"]["var_pct"]):
+            risk_flags.append(
+                f"VAR_LIMIT_EXCEEDED ({post_trade['var_pct']:.2%} > {self.var_limit:.2%} of equity with trade)"
+            )
+            risk_score = max(risk_score, 0.80)
+
+        # --- SEVERITY 5a: High-volatility regime ---
+        if proposed and regime and regime.volatility == "high":
+            risk_flags.append(
+                f"HIGH_VOLATILITY_REGIME ({regime.vol_ratio:.1f}× baseline realized vol, {regime.trend})"
+            )
+            risk_score = max(risk_score, 0.45)
 
         # --- SEVERITY 6: Per-trade risk ---
+        max_risk_per_trade = (proposed or {}).get("max_risk_per_trade") or self.max_risk_per_trade
         if proposed:
-            trade_risk = self._compute_trade_risk(proposed, portfolio)
-            if trade_risk > self.max_risk_per_trade:
+            trade_risk = proposed.get("trade_risk")
+            if trade_risk is None:
+                trade_risk = self._compute_trade_risk(proposed, portfolio)
+            if trade_risk > max_risk_per_trade:
                 risk_flags.append(
-                    f"TRADE_RISK_EXCEEDED ({trade_risk:.2%} > {self.max_risk_per_trade:.2%} max per trade)"
+                    f"TRADE_RISK_EXCEEDED ({trade_risk:.2%} > {max_risk_per_trade:.2%} max per trade)"
                 )
                 risk_score = max(risk_score, 0.80)
 
@@ -177,6 +210,7 @@ class RiskSentinelAgent(BaseAgent):
         result = {
             "agent": self.name,
             "symbol": symbol,
+            "mark_price": mark_price,
             "direction": direction,
             "confidence": confidence,
             "vote": vote,
@@ -186,12 +220,16 @@ class RiskSentinelAgent(BaseAgent):
             "kill_switch_active": self.kill_switch_active,
             "kill_switch_reason": self.kill_switch_reason,
             "portfolio": portfolio,
-            "volatility": volatility,
+            "market_risk": market_risk,
+            "market_regime": regime.as_dict() if regime else None,
             "thresholds": {
                 "max_daily_loss_pct": self.max_daily_loss_pct,
                 "max_drawdown_pct": self.max_drawdown_pct,
                 "max_open_positions": self.max_open_positions,
-                "max_risk_per_trade": self.max_risk_per_trade,
+                "max_risk_per_trade": max_risk_per_trade,
+                "var_limit": self.var_limit,
+                "var_kill_switch_cvar": self.var_kill_switch_cvar,
+                "high_vol_ratio": HIGH_VOL_RATIO,
             },
         }
 
@@ -209,16 +247,20 @@ class RiskSentinelAgent(BaseAgent):
 
         return result
 
-    async def _get_portfolio_state(self) -> dict:
+    async def get_portfolio_state(self) -> dict:
         """Query current portfolio metrics from the database."""
         try:
             open_count = await db_pool.fetchval(
                 "SELECT COUNT(*) FROM ualgo_position WHERE status = 'open'"
             ) or 0
 
-            total_unrealized = await db_pool.fetchval(
-                "SELECT COALESCE(SUM(unrealized_pnl), 0) FROM ualgo_position WHERE status = 'open'"
-            ) or 0
+            if mark_to_market.loaded_at is not None:
+                # Live marks, fresher than the last bulk write
+                total_unrealized = mark_to_market.unrealized_pnl()
+            else:
+                total_unrealized = await db_pool.fetchval(
+                    "SELECT COALESCE(SUM(unrealized_pnl), 0) FROM ualgo_position WHERE status = 'open'"
+                ) or 0
 
             latest_snapshot = await db_pool.fetchrow(
                 "SELECT * FROM ualgo_portfolio_snapshot ORDER BY snapshot_date DESC LIMIT 1"
@@ -250,30 +292,25 @@ class RiskSentinelAgent(BaseAgent):
                 "max_drawdown_pct": 0.0,
             }
 
-    async def _check_volatility(self, symbol: str) -> dict:
-        """Assess recent signal confidence variance as a volatility proxy."""
+    async def _check_market_risk(self, symbol: str, proposed: dict | None, portfolio: dict) -> dict:
+        """Portfolio VaR / CVaR of the open book and, for a proposal, with the trade added."""
         try:
-            rows = await db_pool.fetch(
-                """SELECT confidence FROM ualgo_signal
-                   WHERE symbol = $1 AND created_at >= NOW() - INTERVAL '24 hours'
-                   ORDER BY created_at DESC LIMIT 30""",
-                symbol,
-            )
-
-            if not rows or len(rows) < 3:
-                return {"value": 0.0, "is_extreme": False, "sample_size": len(rows) if rows else 0}
-
-            confidences = [float(r["confidence"]) for r in rows if r["confidence"] is not None]
-            volatility = float(np.std(confidences)) if len(confidences) >= 2 else 0.0
-
-            return {
-                "value": round(volatility, 4),
-                "is_extreme": volatility > self.volatility_threshold,
-                "sample_size": len(confidences),
-            }
+            exposure = mark_to_market.exposure_by_symbol(signed=True)
+            book = dict(exposure)
+            if proposed and proposed.get("direction") in ("LONG", "SHORT"):
+                notional = (proposed.get("entry_price") or 0) * (proposed.get("quantity") or 0)
+                sign = 1 if proposed["direction"] == "LONG" else -1
+                book[symbol.upper()] = book.get(symbol.upper(), 0.0) + sign * notional
+
+            await portfolio_var.refresh(s for s, v in book.items() if v)
+            equity = portfolio.get("total_value", 0.0)
+            result = {"current": portfolio_var.evaluate(exposure, equity)}
+            if book != exposure:
+                result["post_trade"] = portfolio_var.evaluate(book, equity)
+            return result
         except Exception as e:
-            logger.error(f"[{self.name}] volatility check failed: {e}")
-            return {"value": 0.0, "is_extreme": False, "sample_size": 0}
+            logger.error(f"[{self.name}] VaR check failed: {e}")
+            return {"current": {"var_pct": 0.0, "cvar_pct": 0.0}, "error": str(e)}
 
     async def _check_concentration(self, symbol: str) -> dict:
         """Check if symbol would create excessive position concentration."""
@@ -298,16 +335,21 @@ class RiskSentinelAgent(BaseAgent):
 
         Risk = |entry - stop_loss| * quantity / total_portfolio_value
         """
-        entry = proposed.get("entry_price", 0) or 0
-        stop = proposed.get("stop_loss", 0) or 0
-        quantity = proposed.get("quantity", 0) or 0
-        total_value = portfolio.get("total_value", 10_000.0) or 10_000.0
+        return float(self.compute_trade_risks([proposed], portfolio)[0])
 
-        if not entry or not stop or not quantity or not total_value:
-            return 0.0
+    def compute_trade_risks(self, proposals: list[dict], portfolio: dict) -> np.ndarray:
+        """Per-trade risk (fraction of portfolio) for many proposals in one pass.
 
-        risk_amount = abs(entry - stop) * quantity
-        return risk_amount / total_value
+        Proposals missing entry, stop or quantity score 0.0, as in ``_compute_trade_risk``.
+        """
+        total_value = portfolio.get("total_value", 10_000.0) or 10_000.0
+        values = np.array(
+            [[p.get("entry_price") or 0, p.get("stop_loss") or 0, p.get("quantity") or 0] for p in proposals],
+            dtype=float,
+        ).reshape(-1, 3)
+        entry, stop, quantity = values.T
+        risk = np.abs(entry - stop) * quantity / total_value
+        return np.where((entry > 0) & (stop > 0) & (quantity > 0), risk, 0.0)
 
     async def _activate_kill_switch(self, reason: str):
         """Activate the kill switch — halt all new trade approvals."""
@@ -386,7 +428,8 @@ class RiskSentinelAgent(BaseAgent):
                 "max_open_positions": self.max_open_positions,
                 "max_risk_per_trade": self.max_risk_per_trade,
                 "max_concentration_pct": self.max_concentration_pct,
-                "volatility_threshold": self.volatility_threshold,
+                "var_limit": self.var_limit,
+                "var_kill_switch_cvar": self.var_kill_switch_cvar,
                 "max_daily_trades": self.max_daily_trades,
                 "cool_down_after_loss_seconds": self.cool_down_after_loss_seconds,
                 "max_single_asset_ratio": self.max_single_asset_ratio,
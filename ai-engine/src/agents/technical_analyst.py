@@ -10,37 +10,49 @@ Indicator stack:
 - Smart Money Concepts: Order Blocks + Fair Value Gaps (institutional footprint)
 - Elliott Wave (wave structure context)
 - Support / Resistance (key price levels)
+- Volume: VWAP bands, volume profile value area, OBV flow, relative-volume spikes
 - ATR (volatility-based position sizing)
 
 Signal synthesis: Weighted voting across all indicators with confidence normalization.
+
+Indicator outputs come from the shared per-candle snapshot
+(``src/core/indicator_snapshot.py``), so the indicator stack runs once per
+(symbol, timeframe) candle close no matter how many consumers read it.
 """
 
+import asyncio
+import hashlib
+import json
 import logging
 
-import numpy as np
-
 from src.agents.base_agent import BaseAgent
-from src.indicators.bollinger import compute_bollinger
-from src.indicators.elliott_wave import detect_elliott_wave
-from src.indicators.rsi import compute_rsi
-from src.indicators.smc import detect_order_blocks, detect_fvg
-from src.indicators.support_resistance import detect_support_resistance
+from src.config import settings
+from src.core.cache import ResponseCache
+from src.core.indicator_snapshot import MIN_CANDLES, closed_candles, indicator_snapshots
 
 logger = logging.getLogger(__name__)
 
-# Minimum candles required for reliable analysis
-MIN_CANDLES = 50
-
 # Indicator weights in consensus — must sum to 1.0
 INDICATOR_WEIGHTS = {
-    "rsi": 0.20,
-    "bollinger": 0.18,
-    "order_block": 0.22,  # SMC — institutional bias, highest weight
-    "fvg": 0.15,          # Fair Value Gaps — structural imbalances
-    "support_resistance": 0.15,
-    "elliott_wave": 0.10,
+    "rsi": 0.18,
+    "bollinger": 0.16,
+    "order_block": 0.20,  # SMC — institutional bias, highest weight
+    "fvg": 0.14,          # Fair Value Gaps — structural imbalances
+    "support_resistance": 0.14,
+    "elliott_wave": 0.08,
+    "volume": 0.10,       # Participation behind the move — confirms SMC setups
 }
 
+# |OBV change| / volume over the slope window that counts as directional flow
+OBV_FLOW_THRESHOLD = 0.30
+
+# Distance from price within which a live order block / breaker is in play
+ZONE_PROXIMITY = 0.005
+
+# ATR multiples for stop-loss / take-profit distances (1.67 R/R minimum)
+ATR_MULTIPLIER_SL = 1.5
+ATR_MULTIPLIER_TP = 2.5
+
 
 class TechnicalAnalystAgent(BaseAgent):
     """Multi-indicator technical analysis with Smart Money Concepts.
@@ -56,12 +68,19 @@ class TechnicalAnalystAgent(BaseAgent):
     def __init__(self):
         super().__init__(
             name="technical_analyst",
-            role="Technical Analysis — SMC, RSI, Bollinger, Elliott, S/R",
-            version="1.3.0",
+            role="Technical Analysis — SMC, RSI, Bollinger, Elliott, S/R, Volume",
+            version="1.5.0",
         )
+        # Results memoized per (symbol, timeframe, last closed candle, params);
+        # entries never expire on their own — a new candle is a new key
+        self._memo = ResponseCache(max_entries=settings.analysis_memo_size)
 
     async def analyze(self, symbol: str, **kwargs) -> dict:
-        """Run full technical analysis for a symbol.
+        """Run full technical analysis for a symbol, memoized per closed candle.
+
+        The result is a pure function of the closed candle window and the
+        analysis parameters, so repeated and concurrent calls for the same
+        state share one computation (and one decision-memory write).
 
         Args:
             symbol: Trading pair e.g. 'BTCUSDT'
@@ -74,8 +93,44 @@ class TechnicalAnalystAgent(BaseAgent):
         """
         candles: list[dict] = kwargs.get("candles", [])
         timeframe: str = kwargs.get("timeframe", "1h")
+        closed = closed_candles(candles)
+        last = closed[-1] if closed else {}
+        key = "|".join((
+            symbol.upper(),
+            timeframe,
+            str(last.get("close_time", last.get("open_time", len(closed)))),
+            self._param_hash(kwargs),
+        ))
+        return await self._memo.get_or_load(
+            key, lambda: self._analyze(symbol, timeframe, candles), ttl=float("inf")
+        )
+
+    async def analyze_batch(
+        self, candles_by_symbol: dict[str, list[dict]], timeframe: str = "1h"
+    ) -> dict[str, dict]:
+        """Analyze many symbols of one timeframe.
+
+        Indicators for all symbols with a new closed candle are computed in one
+        batched (symbols × time) pass; per-symbol synthesis then reads the
+        shared snapshots through the usual memoized ``analyze`` path.
 
-        if not candles or len(candles) < MIN_CANDLES:
+        Returns:
+            symbol → analysis dict, same shape as ``analyze``.
+        """
+        indicator_snapshots.compute_batch(
+            timeframe, {symbol: candles for symbol, candles in candles_by_symbol.items() if candles}
+        )
+        symbols = list(candles_by_symbol)
+        results = await asyncio.gather(*(
+            self.analyze(symbol, candles=candles_by_symbol[symbol], timeframe=timeframe)
+            for symbol in symbols
+        ))
+        return dict(zip(symbols, results))
+
+    async def _analyze(self, symbol: str, timeframe: str, candles: list[dict]) -> dict:
+        """Uncached analysis of one candle window."""
+        snapshot = indicator_snapshots.compute(symbol, timeframe, candles) if candles else None
+        if snapshot is None or len(snapshot.candles) < MIN_CANDLES:
             return {
                 "agent": self.name,
                 "symbol": symbol,
@@ -86,24 +141,18 @@ class TechnicalAnalystAgent(BaseAgent):
                 "stop_loss": None,
                 "take_profit": None,
                 "risk_reward": None,
-                "error": f"Insufficient candle data: {len(candles)} < {MIN_CANDLES} required",
+                "error": f"Insufficient candle data: {len(snapshot.candles) if snapshot else 0} < {MIN_CANDLES} required",
             }
 
-        closes = np.array([c["close"] for c in candles], dtype=float)
-        highs = np.array([c["high"] for c in candles], dtype=float)
-        lows = np.array([c["low"] for c in candles], dtype=float)
-        volumes = np.array([c.get("volume", 0) for c in candles], dtype=float)
+        current_price = snapshot.current_price
 
-        current_price = float(closes[-1])
-
-        # Run all indicators
-        rsi_data = compute_rsi(closes)
-        bb_data = compute_bollinger(closes)
-        sr_levels = detect_support_resistance(highs, lows, closes)
-        order_blocks = detect_order_blocks(candles)
-        fvg_zones = detect_fvg(candles)
-        elliott = detect_elliott_wave(closes)
-        atr = self._compute_atr(highs, lows, closes)
+        # Shared indicator results for the last closed candle
+        rsi_data = snapshot.rsi
+        bb_data = snapshot.bollinger
+        sr_levels = snapshot.support_resistance
+        elliott = snapshot.elliott_wave
+        volume = snapshot.volume
+        atr = snapshot.atr
 
         # Collect weighted sub-signals: (direction, raw_confidence, weight, label)
         sub_signals: list[tuple[str, float, float, str]] = []
@@ -152,60 +201,99 @@ class TechnicalAnalystAgent(BaseAgent):
                                 f"Near resistance {nearest_resistance:.4f} ({proximity_pct:.2%} away)"))
 
         # --- Order Blocks (Smart Money Concepts) ---
-        bullish_obs = order_blocks.get("bullish", [])
-        bearish_obs = order_blocks.get("bearish", [])
-
-        if bullish_obs:
-            last_bull_ob = bullish_obs[-1]
-            ob_high = last_bull_ob.get("high", 0)
-            if current_price <= ob_high * 1.005:
-                sub_signals.append(("LONG", 0.75, INDICATOR_WEIGHTS["order_block"],
-                                    f"Bullish OB at {last_bull_ob.get('low', 0):.4f}–{ob_high:.4f}"))
-
-        if bearish_obs:
-            last_bear_ob = bearish_obs[-1]
-            ob_low = last_bear_ob.get("low", float("inf"))
-            if current_price >= ob_low * 0.995:
-                sub_signals.append(("SHORT", 0.75, INDICATOR_WEIGHTS["order_block"],
-                                    f"Bearish OB at {ob_low:.4f}–{last_bear_ob.get('high', 0):.4f}"))
+        # Live zones from the snapshot's zone book; an untouched block carries the
+        # most unfilled orders, each revisit absorbs some of them
+        zones = snapshot.zones
+        near_zones = zones.near(current_price, ZONE_PROXIMITY) if zones else []
+        for zone in near_zones:
+            if zone.kind == "fvg":
+                continue
+            direction = "LONG" if zone.side == "bullish" else "SHORT"
+            if zone.status == "active":
+                confidence, state = 0.75, "fresh"
+            elif zone.status == "touched":
+                confidence, state = max(0.75 - 0.10 * zone.touches, 0.50), f"{zone.touches}x touched"
+            else:
+                confidence, state = 0.45, "mitigated"
+            label = "breaker" if zone.kind == "breaker" else "OB"
+            sub_signals.append((direction, confidence, INDICATOR_WEIGHTS["order_block"],
+                                f"{zone.side.capitalize()} {label} ({state}) at {zone.low:.4f}–{zone.high:.4f}"))
 
         # --- Fair Value Gaps ---
-        bullish_fvgs = fvg_zones.get("bullish", [])
-        bearish_fvgs = fvg_zones.get("bearish", [])
+        # Only unfilled gaps count; filled ones have left the book
+        bullish_fvgs = zones.zones("fvg", "bullish") if zones else []
+        bearish_fvgs = zones.zones("fvg", "bearish") if zones else []
 
         if bullish_fvgs:
             sub_signals.append(("LONG", 0.60, INDICATOR_WEIGHTS["fvg"],
-                                f"{len(bullish_fvgs)} bullish FVG(s) — price likely to fill gap upward"))
+                                f"{len(bullish_fvgs)} open bullish FVG(s) — price likely to fill gap upward"))
         if bearish_fvgs:
             sub_signals.append(("SHORT", 0.60, INDICATOR_WEIGHTS["fvg"],
-                                f"{len(bearish_fvgs)} bearish FVG(s) — price likely to fill gap downward"))
+                                f"{len(bearish_fvgs)} open bearish FVG(s) — price likely to fill gap downward"))
 
         # --- Elliott Wave ---
-        wave_count = elliott.get("wave_count")
-        if wave_count:
-            if wave_count in (2, 4):  # Corrective waves — expect impulse continuation
-                sub_signals.append(("LONG", 0.55, INDICATOR_WEIGHTS["elliott_wave"],
-                                    f"Elliott wave {wave_count} (corrective end — impulse expected)"))
-            elif wave_count == 3:  # Strongest impulse wave — could be topping
-                sub_signals.append(("SHORT", 0.45, INDICATOR_WEIGHTS["elliott_wave"],
-                                    f"Elliott wave {wave_count} (impulse peak region)"))
-            elif wave_count == 5:  # Terminal impulse — reversal setup
-                sub_signals.append(("SHORT", 0.60, INDICATOR_WEIGHTS["elliott_wave"],
-                                    f"Elliott wave 5 (terminal impulse — reversal likely)"))
+        wave_label = elliott.get("wave_label")
+        if wave_label and elliott.get("trend") in ("bullish", "bearish"):
+            with_trend = "LONG" if elliott["trend"] == "bullish" else "SHORT"
+            against = "SHORT" if with_trend == "LONG" else "LONG"
+            # A count running against the higher-degree wave is less trustworthy
+            discount = 0.15 if elliott.get("aligned") is False else 0.0
+            if wave_label in ("2", "4"):  # Corrective waves — expect impulse continuation
+                sub_signals.append((with_trend, 0.55 - discount, INDICATOR_WEIGHTS["elliott_wave"],
+                                    f"Elliott wave {wave_label} (corrective end — impulse expected)"))
+            elif wave_label == "3":  # Strongest impulse wave — could be topping
+                sub_signals.append((against, 0.45 - discount, INDICATOR_WEIGHTS["elliott_wave"],
+                                    "Elliott wave 3 (impulse peak region)"))
+            elif wave_label == "5":  # Terminal impulse — reversal setup
+                sub_signals.append((against, 0.60 - discount, INDICATOR_WEIGHTS["elliott_wave"],
+                                    "Elliott wave 5 (terminal impulse — reversal likely)"))
+            elif wave_label == "C":  # Correction complete — trend resumes
+                sub_signals.append((with_trend, 0.55 - discount, INDICATOR_WEIGHTS["elliott_wave"],
+                                    "Elliott A-B-C complete (correction end — trend resumption)"))
+
+        # --- Volume ---
+        vwap_lower, vwap_upper = volume.get("vwap_lower"), volume.get("vwap_upper")
+        value_area_low, value_area_high = volume.get("value_area_low"), volume.get("value_area_high")
+        if vwap_lower is not None and current_price <= vwap_lower:
+            sub_signals.append(("LONG", 0.60, INDICATOR_WEIGHTS["volume"],
+                                f"Price below VWAP −2σ ({vwap_lower:.4f}) — stretched from fair value"))
+        elif vwap_upper is not None and current_price >= vwap_upper:
+            sub_signals.append(("SHORT", 0.60, INDICATOR_WEIGHTS["volume"],
+                                f"Price above VWAP +2σ ({vwap_upper:.4f}) — stretched from fair value"))
+        elif value_area_low is not None and current_price < value_area_low:
+            sub_signals.append(("LONG", 0.40, INDICATOR_WEIGHTS["volume"],
+                                f"Price below value area ({value_area_low:.4f}–{value_area_high:.4f}), POC {volume['poc']:.4f}"))
+        elif value_area_high is not None and current_price > value_area_high:
+            sub_signals.append(("SHORT", 0.40, INDICATOR_WEIGHTS["volume"],
+                                f"Price above value area ({value_area_low:.4f}–{value_area_high:.4f}), POC {volume['poc']:.4f}"))
+
+        last_candle = snapshot.candles[-1]
+        if volume.get("volume_spike"):
+            rvol = volume["relative_volume"]
+            candle_open = last_candle.get("open", last_candle["close"])
+            if last_candle["close"] > candle_open:
+                sub_signals.append(("LONG", 0.65, INDICATOR_WEIGHTS["volume"],
+                                    f"Volume spike ({rvol:.1f}× avg) on bullish candle"))
+            elif last_candle["close"] < candle_open:
+                sub_signals.append(("SHORT", 0.65, INDICATOR_WEIGHTS["volume"],
+                                    f"Volume spike ({rvol:.1f}× avg) on bearish candle"))
+        elif volume.get("obv_slope", 0.0) >= OBV_FLOW_THRESHOLD:
+            sub_signals.append(("LONG", 0.45, INDICATOR_WEIGHTS["volume"],
+                                f"OBV rising ({volume['obv_slope']:+.2f}) — accumulation"))
+        elif volume.get("obv_slope", 0.0) <= -OBV_FLOW_THRESHOLD:
+            sub_signals.append(("SHORT", 0.45, INDICATOR_WEIGHTS["volume"],
+                                f"OBV falling ({volume['obv_slope']:+.2f}) — distribution"))
 
         # Synthesize all sub-signals into final direction + confidence
         direction, confidence, reasoning = self._synthesize_weighted(sub_signals)
 
         # Compute levels using ATR (1.5x ATR stop, 2.5x ATR target = 1.67 R/R minimum)
-        atr_multiplier_sl = 1.5
-        atr_multiplier_tp = 2.5
-
         if direction == "LONG":
-            stop_loss = current_price - atr_multiplier_sl * atr
-            take_profit = current_price + atr_multiplier_tp * atr
+            stop_loss = current_price - ATR_MULTIPLIER_SL * atr
+            take_profit = current_price + ATR_MULTIPLIER_TP * atr
         elif direction == "SHORT":
-            stop_loss = current_price + atr_multiplier_sl * atr
-            take_profit = current_price - atr_multiplier_tp * atr
+            stop_loss = current_price + ATR_MULTIPLIER_SL * atr
+            take_profit = current_price - ATR_MULTIPLIER_TP * atr
         else:
             stop_loss = None
             take_profit = None
@@ -230,15 +318,19 @@ class TechnicalAnalystAgent(BaseAgent):
                 "bollinger": {k: round(v, 8) if isinstance(v, float) else v for k, v in bb_data.items()},
                 "support_resistance": sr_levels,
                 "order_blocks": {
-                    "bullish_count": len(bullish_obs),
-                    "bearish_count": len(bearish_obs),
+                    "bullish_count": len(zones.zones("order_block", "bullish")) if zones else 0,
+                    "bearish_count": len(zones.zones("order_block", "bearish")) if zones else 0,
+                    "near": [z.as_dict() for z in near_zones if z.kind != "fvg"],
                 },
                 "fvg": {
                     "bullish_count": len(bullish_fvgs),
                     "bearish_count": len(bearish_fvgs),
                 },
                 "elliott_wave": elliott,
+                "volume": {k: round(v, 8) if isinstance(v, float) else v for k, v in volume.items()},
             },
+            "events": sorted(f"{t}/{s}" for t, s in snapshot.events),
+            "bar_time": snapshot.bar_time,
             "reasoning": reasoning,
             "signal_count": len(sub_signals),
         }
@@ -252,6 +344,20 @@ class TechnicalAnalystAgent(BaseAgent):
 
         return result
 
+    def _param_hash(self, kwargs: dict) -> str:
+        """Hash of everything besides the candles that the result depends on."""
+        params = {
+            "version": self.version,
+            "weights": INDICATOR_WEIGHTS,
+            "atr_multipliers": (ATR_MULTIPLIER_SL, ATR_MULTIPLIER_TP),
+            "extra": {k: v for k, v in kwargs.items() if k not in ("candles", "timeframe")},
+        }
+        encoded = json.dumps(params, sort_keys=True, default=str).encode()
+        return hashlib.sha1(encoded).hexdigest()[:16]
+
+    def get_memo_stats(self) -> dict:
+        return self._memo.get_stats()
+
     def _synthesize_weighted(
         self, signals: list[tuple[str, float, float, str]]
     ) -> tuple[str, float, list[str]]:
@@ -289,22 +395,6 @@ class TechnicalAnalystAgent(BaseAgent):
         else:
             return "NEUTRAL", 0.50, reasoning
 
-    def _compute_atr(
-        self, highs: np.ndarray, lows: np.ndarray, closes: np.ndarray, period: int = 14
-    ) -> float:
-        """Compute Average True Range for volatility-based level sizing."""
-        if len(highs) < period + 1:
-            return float(np.mean(highs - lows))
-
-        tr = np.maximum(
-            highs[1:] - lows[1:],
-            np.maximum(
-                np.abs(highs[1:] - closes[:-1]),
-                np.abs(lows[1:] - closes[:-1]),
-            ),
-        )
-        return float(np.mean(tr[-period:]))
-
 
 # Global singleton
 technical_analyst = TechnicalAnalystAgent()
@@ -2,11 +2,23 @@
 
 from fastapi import APIRouter
 
+from src.core.cache import cached_route
 from src.models.agent_config import AgentInfo, AgentStatus, SwarmStatus
 from src.services.db import db_pool
+from src.services.queries import queries
 
 router = APIRouter()
 
+queries.register("agents.heartbeats", "SELECT * FROM ualgo_agent_heartbeat ORDER BY agent_name")
+queries.register(
+    "agents.signals_today",
+    "SELECT COUNT(*) FROM ualgo_signal WHERE created_at >= CURRENT_DATE",
+)
+queries.register(
+    "agents.open_positions",
+    "SELECT COUNT(*) FROM ualgo_position WHERE status = 'open'",
+)
+
 AGENT_ROLES = {
     "alpha_scout": "Sentiment Hunter — RSS feeds, news analysis",
     "technical_analyst": "Technical Analysis — SMC, Elliott Wave, S/R, indicators",
@@ -17,11 +29,12 @@ AGENT_ROLES = {
 
 
 @router.get("/status", response_model=SwarmStatus)
+# TTL only: every agent run upserts its heartbeat and mark-to-market rewrites
+# open positions, so table tags would evict this on every scan and tick
+@cached_route(ttl=5)
 async def get_swarm_status():
     """Get status of all agents in the swarm."""
-    heartbeats = await db_pool.fetch(
-        "SELECT * FROM ualgo_agent_heartbeat ORDER BY agent_name"
-    )
+    heartbeats = await db_pool.fetch_named("agents.heartbeats")
 
     agents = []
     heartbeat_map = {row["agent_name"]: row for row in heartbeats}
@@ -36,12 +49,8 @@ async def get_swarm_status():
             active_tasks=hb["active_tasks"] if hb else 0,
         ))
 
-    today_signals = await db_pool.fetchval(
-        "SELECT COUNT(*) FROM ualgo_signal WHERE created_at >= CURRENT_DATE"
-    )
-    active_positions = await db_pool.fetchval(
-        "SELECT COUNT(*) FROM ualgo_position WHERE status = 'open'"
-    )
+    today_signals = await db_pool.fetchval_named("agents.signals_today")
+    active_positions = await db_pool.fetchval_named("agents.open_positions")
 
     return SwarmStatus(
         agents=agents,
@@ -60,3 +69,10 @@ async def get_agent_heartbeat(agent_name: str):
     if not row:
         return {"error": "Agent not found", "agent_name": agent_name}
     return dict(row)
+
+
+@router.get("/weights")
+async def get_agent_weights():
+    """Current calibrated consensus weights (per regime) and their version."""
+    from src.core.agent_weights import agent_weights
+    return agent_weights.get_stats()
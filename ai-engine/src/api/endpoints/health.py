@@ -2,7 +2,11 @@
 
 from fastapi import APIRouter
 
+from src.core.alert_engine import alert_engine
+from src.core.cache import response_cache
+from src.core.indicator_snapshot import indicator_snapshots
 from src.services.db import db_pool
+from src.services.queries import queries
 
 router = APIRouter()
 
@@ -21,3 +25,76 @@ async def readiness():
     except Exception:
         pass
     return {"ready": False, "database": "unavailable"}
+
+
+@router.get("/cache/stats")
+async def cache_stats():
+    return response_cache.get_stats()
+
+
+@router.get("/queries/stats")
+async def query_stats():
+    return queries.get_stats()
+
+
+@router.get("/alerts/stats")
+async def alert_stats():
+    return alert_engine.get_stats()
+
+
+@router.get("/indicators/stats")
+async def indicator_stats():
+    from src.agents.technical_analyst import technical_analyst
+    return {
+        **indicator_snapshots.get_stats(),
+        "analysis_memo": technical_analyst.get_memo_stats(),
+    }
+
+
+@router.get("/regimes/stats")
+async def regime_stats():
+    from src.core.market_regime import market_regime
+    return market_regime.get_stats()
+
+
+@router.get("/features/stats")
+async def feature_stats():
+    from src.core.feature_store import feature_store
+    return feature_store.get_stats()
+
+
+@router.get("/paper/stats")
+async def paper_stats():
+    from src.execution.paper_executor import paper_executor
+    return paper_executor.get_stats()
+
+
+@router.get("/positions/stats")
+async def position_stats():
+    from src.core.mark_to_market import mark_to_market
+    return mark_to_market.get_stats()
+
+
+@router.get("/exits/stats")
+async def exit_stats():
+    from src.core.exit_triggers import exit_triggers
+    return exit_triggers.get_stats()
+
+
+@router.get("/risk/var/stats")
+async def var_stats():
+    from src.core.portfolio_var import portfolio_var
+    return portfolio_var.get_stats()
+
+
+@router.get("/prices/stats")
+async def price_stats():
+    from src.services.prices import price_service
+    return price_service.get_stats()
+
+
+@router.get("/scans/stats")
+async def scan_stats():
+    from src.tasks.scan_planner import scan_planner
+    from src.tasks.scan_priority import scan_priority
+    return {**scan_priority.get_stats(), "planner": scan_planner.get_stats()}
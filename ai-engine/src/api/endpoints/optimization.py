@@ -1,7 +1,10 @@
 """Optimization and performance endpoints."""
 
+import json
+
 from fastapi import APIRouter, Query
 
+from src.core.cache import cached_route
 from src.services.db import db_pool
 
 router = APIRouter()
@@ -17,6 +20,7 @@ async def run_optimization(strategy_id: str = "default"):
 
 
 @router.get("/performance")
+@cached_route(ttl=60, tables=("ualgo_portfolio_snapshot",))
 async def get_performance(
     days: int = Query(30, ge=1, le=365),
     strategy_id: str = "default",
@@ -45,3 +49,27 @@ async def get_performance(
         })
 
     return {"strategy_id": strategy_id, "days": days, "data": data}
+
+
+@router.get("/walk-forward")
+@cached_route(ttl=60, tables=("ualgo_walk_forward_report",))
+async def get_walk_forward_reports(
+    limit: int = Query(5, ge=1, le=50),
+    strategy_id: str = "default",
+):
+    """Latest persisted walk-forward stability reports."""
+    rows = await db_pool.fetch(
+        """SELECT id, created_at, report FROM ualgo_walk_forward_report
+           WHERE strategy_id = $1
+           ORDER BY created_at DESC
+           LIMIT $2""",
+        strategy_id,
+        limit,
+    )
+    return {
+        "strategy_id": strategy_id,
+        "data": [
+            {"id": r["id"], "created_at": r["created_at"].isoformat(), **json.loads(r["report"])}
+            for r in rows
+        ],
+    }
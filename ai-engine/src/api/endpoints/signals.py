@@ -1,15 +1,61 @@
 """Signal scanning and retrieval endpoints."""
 
+import base64
+import csv
+import io
 import json
 from datetime import datetime, timezone
+from decimal import Decimal
 
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
 
+from src.core.cache import cached_route
 from src.models.signal import Signal, SignalDirection, SignalStatus
 from src.services.db import db_pool
+from src.services.queries import queries
 
 router = APIRouter()
 
+# Columns clients may request via ``fields``. ``reasoning`` is large JSONB and opt-in only.
+SIGNAL_COLUMNS = (
+    "id", "symbol", "direction", "confidence", "source_agent", "status",
+    "entry_price", "stop_loss", "take_profit", "risk_reward", "timeframe",
+    "strategy_id", "created_at", "reasoning",
+)
+DEFAULT_SIGNAL_FIELDS = (
+    "id", "symbol", "direction", "confidence", "source_agent", "status",
+    "entry_price", "stop_loss", "take_profit", "timeframe", "created_at",
+)
+
+queries.register(
+    "signals.recent",
+    """SELECT {columns} FROM ualgo_signal
+       WHERE true {filters}
+       ORDER BY created_at DESC, id DESC
+       LIMIT :limit""",
+    optional={
+        "symbol": "AND symbol = :symbol",
+        "status": "AND status = :status",
+        "cursor_ts": "AND (created_at, id) < (:cursor_ts, :cursor_id)",
+    },
+    default_columns=DEFAULT_SIGNAL_FIELDS,
+)
+
+# Rows per chunk written to the export stream
+EXPORT_CHUNK_ROWS = 500
+
+# Per-signal consensus votes, aggregated next to each exported row
+_VOTES_JOIN = """
+    LEFT JOIN LATERAL (
+        SELECT json_agg(json_build_object(
+                   'agent_name', cv.agent_name, 'vote', cv.vote,
+                   'confidence', cv.confidence, 'created_at', cv.created_at
+               ) ORDER BY cv.created_at) AS votes
+        FROM ualgo_consensus_vote cv
+        WHERE cv.signal_id = s.id
+    ) v ON true"""
+
 
 @router.post("/scan")
 async def scan_signals(
@@ -30,45 +76,170 @@ async def scan_signals(
 
 
 @router.get("/recent")
+@cached_route(ttl=15, tables=("ualgo_signal",))
 async def get_recent_signals(
-    limit: int = Query(20, ge=1, le=100),
+    limit: int = Query(20, ge=1, le=500),
     symbol: str | None = None,
     status: str | None = None,
+    cursor: str | None = Query(None, description="next_cursor from a previous page"),
+    fields: str | None = Query(None, description="Comma-separated columns, e.g. id,symbol,reasoning"),
 ):
-    """Retrieve recent signals from the database."""
-    query = "SELECT * FROM ualgo_signal WHERE 1=1"
+    """Retrieve signals newest first, paginated by a (created_at, id) cursor."""
+    cursor_ts, cursor_id = _decode_cursor(cursor) if cursor else (None, None)
+
+    # Fetch one extra row to know whether another page exists
+    rows = await db_pool.fetch_named(
+        "signals.recent",
+        columns=tuple(_parse_fields(fields)),
+        symbol=symbol or None,
+        status=status or None,
+        cursor_ts=cursor_ts,
+        cursor_id=cursor_id,
+        limit=limit + 1,
+    )
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    signals = [_serialize_signal(row, fields is not None) for row in rows]
+    next_cursor = _encode_cursor(rows[-1]["created_at"], rows[-1]["id"]) if has_more else None
+
+    return {"signals": signals, "count": len(signals), "next_cursor": next_cursor}
+
+
+@router.get("/export")
+async def export_signals(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    symbol: str | None = None,
+    status: str | None = None,
+    strategy_id: str | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    fields: str | None = None,
+    include_votes: bool = False,
+):
+    """Stream signal history (optionally with consensus votes) as NDJSON or CSV.
+
+    Rows come from a server-side cursor, so memory use is independent of the
+    exported range.
+    """
+    columns = _parse_fields(fields, default=SIGNAL_COLUMNS)
+    select = ", ".join(f"s.{c}" for c in columns)
+    query = f"SELECT {select}"
+    if include_votes:
+        query += ", COALESCE(v.votes, '[]'::json) AS votes FROM ualgo_signal s" + _VOTES_JOIN
+    else:
+        query += " FROM ualgo_signal s"
+    query += " WHERE 1=1"
     params = []
     idx = 1
 
-    if symbol:
-        query += f" AND symbol = ${idx}"
-        params.append(symbol)
+    for column, value in (("symbol", symbol), ("status", status), ("strategy_id", strategy_id)):
+        if value:
+            query += f" AND s.{column} = ${idx}"
+            params.append(value)
+            idx += 1
+
+    if since:
+        query += f" AND s.created_at >= ${idx}"
+        params.append(since)
         idx += 1
 
-    if status:
-        query += f" AND status = ${idx}"
-        params.append(status)
+    if until:
+        query += f" AND s.created_at < ${idx}"
+        params.append(until)
         idx += 1
 
-    query += f" ORDER BY created_at DESC LIMIT ${idx}"
-    params.append(limit)
-
-    rows = await db_pool.fetch(query, *params)
-
-    signals = []
-    for row in rows:
-        signals.append({
-            "id": row["id"],
-            "symbol": row["symbol"],
-            "direction": row["direction"],
-            "confidence": float(row["confidence"]) if row["confidence"] else None,
-            "source_agent": row["source_agent"],
-            "status": row["status"],
-            "entry_price": float(row["entry_price"]) if row.get("entry_price") else None,
-            "stop_loss": float(row["stop_loss"]) if row.get("stop_loss") else None,
-            "take_profit": float(row["take_profit"]) if row.get("take_profit") else None,
-            "timeframe": row.get("timeframe", "1h"),
-            "created_at": row["created_at"].isoformat() if row["created_at"] else None,
-        })
-
-    return {"signals": signals, "count": len(signals)}
+    query += " ORDER BY s.created_at, s.id"
+
+    header = list(columns) + (["votes"] if include_votes else [])
+
+    async def ndjson_lines():
+        chunk: list[str] = []
+        async for row in db_pool.stream(query, *params):
+            chunk.append(json.dumps(_serialize_signal(row, True)))
+            if len(chunk) >= EXPORT_CHUNK_ROWS:
+                yield "\n".join(chunk) + "\n"
+                chunk = []
+        if chunk:
+            yield "\n".join(chunk) + "\n"
+
+    async def csv_lines():
+        buf = io.StringIO()
+        writer = csv.writer(buf)
+        writer.writerow(header)
+        rows_in_chunk = 0
+        async for row in db_pool.stream(query, *params):
+            record = _serialize_signal(row, True)
+            writer.writerow([
+                json.dumps(record.get(c)) if isinstance(record.get(c), (dict, list)) else record.get(c)
+                for c in header
+            ])
+            rows_in_chunk += 1
+            if rows_in_chunk >= EXPORT_CHUNK_ROWS:
+                yield buf.getvalue()
+                buf.seek(0)
+                buf.truncate()
+                rows_in_chunk = 0
+        yield buf.getvalue()
+
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    if format == "csv":
+        return StreamingResponse(
+            csv_lines(),
+            media_type="text/csv",
+            headers={"Content-Disposition": f'attachment; filename="signals_{stamp}.csv"'},
+        )
+    return StreamingResponse(
+        ndjson_lines(),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="signals_{stamp}.ndjson"'},
+    )
+
+
+def _parse_fields(fields: str | None, default: tuple[str, ...] = DEFAULT_SIGNAL_FIELDS) -> list[str]:
+    """Validate a comma-separated projection. id and created_at are always included."""
+    if not fields:
+        return list(default)
+    requested = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = [f for f in requested if f not in SIGNAL_COLUMNS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    # Canonical column order keeps the number of distinct statements small
+    return [c for c in SIGNAL_COLUMNS if c in requested or c in ("id", "created_at")]
+
+
+def _encode_cursor(created_at: datetime, row_id: int) -> str:
+    raw = f"{created_at.isoformat()}|{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        ts, row_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(ts), int(row_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _serialize_signal(row, projected: bool) -> dict:
+    """Convert a signal row to JSON-safe values.
+
+    Without an explicit projection the legacy response shape is kept
+    (``timeframe`` defaults to '1h', missing prices are None).
+    """
+    out = {}
+    for key, value in row.items():
+        if isinstance(value, Decimal):
+            value = float(value)
+        elif isinstance(value, datetime):
+            value = value.isoformat()
+        elif key in ("reasoning", "votes") and isinstance(value, str):
+            value = json.loads(value)
+        out[key] = value
+    if not projected:
+        out["confidence"] = out.get("confidence") or None
+        out["timeframe"] = out.get("timeframe") or "1h"
+        for key in ("entry_price", "stop_loss", "take_profit"):
+            out[key] = out.get(key) or None
+    return out
@@ -1,26 +1,207 @@
-"""WebSocket endpoint — streams real-time agent events to the .NET backend."""
+"""WebSocket endpoint — streams real-time agent events to the .NET backend.
+
+Clients receive every event by default. They can narrow the stream and change
+how it is delivered by sending control messages:
+
+    {"type": "subscribe", "topics": ["signal"], "symbols": ["BTCUSDT"]}
+    {"type": "unsubscribe", "topics": ["heartbeat"], "symbols": ["ETHUSDT"]}
+    {"type": "configure", "batch_ms": 250, "compress": true}
+
+The first ``subscribe`` narrows the default "everything" to the listed topics
+or symbols; later ones add to them. ``unsubscribe`` removes from whatever the
+client currently receives, so unsubscribing the last topic leaves the client
+with no topics rather than all of them.
+
+The same options can be given as query parameters on connect
+(``/ws/events?topics=signal,consensus&symbols=BTCUSDT&batch_ms=250&compress=1``).
+
+With ``batch_ms > 0`` events are buffered and sent as one
+``{"type": "batch", "events": [...]}`` frame per window. With ``compress``
+enabled, frames are zlib-compressed JSON sent as binary messages.
+
+Every event carries a monotonically increasing ``seq`` and is kept in a bounded
+in-memory replay buffer. A client that reconnects with
+``/ws/events?since=<seq>&stream=<stream_id>`` (or sends
+``{"type": "resume", "since": <seq>}``) receives the events it missed as
+``{"type": "replay", ...}`` frames before live delivery resumes. If the gap is
+no longer in the buffer, or the server restarted (``stream_id`` changed), the
+client gets ``{"type": "replay_incomplete"}`` and should resync from the API.
+"""
 
 import asyncio
 import json
 import logging
+import uuid
+import zlib
+from collections import deque
+from itertools import islice
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 
+from src.config import settings
 from src.core.message_bus import message_bus, AgentMessage
 
 logger = logging.getLogger(__name__)
 router = APIRouter(tags=["websocket"])
 
+# Upper bound for the client-selected batch window
+MAX_BATCH_MS = 5000
+
+# Max events per replay frame
+REPLAY_CHUNK_SIZE = 200
+
+# MessageBus topics forwarded to clients
+TOPICS = (
+    "signal",
+    "heartbeat",
+    "scan_result",
+    "consensus",
+    "risk_alert",
+    "kill_switch",
+    "optimization",
+    "agent_status",
+)
+
+
+class _ReplayBuffer:
+    """Bounded buffer of recent events, addressable by sequence number.
+
+    Sequence numbers are contiguous, so the gap after ``since`` is found by
+    offset arithmetic instead of a scan. ``stream_id`` changes on every process
+    start so clients can tell a restart apart from a gap.
+    """
+
+    def __init__(self, maxlen: int):
+        self.stream_id = uuid.uuid4().hex[:12]
+        self.last_seq = 0
+        self._events: deque[dict] = deque(maxlen=maxlen)
+
+    def append(self, event: dict) -> dict:
+        self.last_seq += 1
+        event["seq"] = self.last_seq
+        self._events.append(event)
+        return event
+
+    @property
+    def oldest_seq(self) -> int:
+        return self._events[0]["seq"] if self._events else self.last_seq + 1
+
+    def covers(self, since: int) -> bool:
+        """True if every event after ``since`` is still buffered."""
+        return 0 <= since <= self.last_seq and since + 1 >= self.oldest_seq
+
+    def since(self, since: int) -> list[dict]:
+        """Return buffered events with seq > since, oldest first."""
+        if since >= self.last_seq:
+            return []
+        start = max(since + 1 - self.oldest_seq, 0)
+        return list(islice(self._events, start, None))
+
+
+_replay = _ReplayBuffer(settings.ws_replay_buffer_size)
+
+
+@dataclass
+class _WsClient:
+    """Per-connection subscription filters and delivery options.
+
+    ``None`` means "all" for ``topics`` and ``symbols``; an empty set means
+    none. The symbol universe is open-ended, so symbols unsubscribed from "all"
+    are kept in ``excluded_symbols`` instead.
+    """
+    ws: WebSocket
+    topics: set[str] | None = None
+    symbols: set[str] | None = None
+    excluded_symbols: set[str] = field(default_factory=set)
+    batch_ms: int = 0
+    compress: bool = False
+    pending: list[dict] = field(default_factory=list)
+    flush_task: asyncio.Task | None = None
+    replaying: bool = False   # live fan-out paused while a resume replays
+
+    def wants(self, event: dict) -> bool:
+        """Check an event against the client's topic and symbol filters.
+
+        Events without a symbol (kill switch, heartbeats) are only filtered by topic.
+        """
+        data = event["data"]
+        if self.topics is not None and data["topic"] not in self.topics:
+            return False
+        symbol = data["payload"].get("symbol") if isinstance(data["payload"], dict) else None
+        if not symbol:
+            return True
+        if self.symbols is None:
+            return symbol not in self.excluded_symbols
+        return symbol in self.symbols
+
+    def subscribe(self, topics: set[str], symbols: set[str]):
+        """Narrow "all" to the given topics/symbols, or add to an explicit set."""
+        if topics:
+            self.topics = topics if self.topics is None else self.topics | topics
+        if symbols:
+            self.symbols = symbols if self.symbols is None else self.symbols | symbols
+            self.excluded_symbols.clear()
+
+    def unsubscribe(self, topics: set[str], symbols: set[str]):
+        """Remove topics/symbols; removing the last one leaves the client with none."""
+        if topics:
+            self.topics = (set(TOPICS) if self.topics is None else self.topics) - topics
+        if symbols:
+            if self.symbols is None:
+                self.excluded_symbols |= symbols
+            else:
+                self.symbols -= symbols
+
+    def describe(self) -> dict:
+        return {
+            "topics": None if self.topics is None else sorted(self.topics),
+            "symbols": None if self.symbols is None else sorted(self.symbols),
+            "excluded_symbols": sorted(self.excluded_symbols),
+            "batch_ms": self.batch_ms,
+            "compress": self.compress,
+        }
+
+
 # Connected WebSocket clients (backend instances)
-_ws_clients: set[WebSocket] = set()
+_ws_clients: dict[WebSocket, _WsClient] = {}
+
+
+def _encode(payload: dict, compress: bool) -> str | bytes:
+    text = json.dumps(payload)
+    return zlib.compress(text.encode()) if compress else text
+
+
+async def _send(client: _WsClient, frame: str | bytes):
+    if isinstance(frame, bytes):
+        await client.ws.send_bytes(frame)
+    else:
+        await client.ws.send_text(frame)
+
+
+async def _send_json(client: _WsClient, payload: dict):
+    await _send(client, _encode(payload, client.compress))
+
+
+async def _flush_later(client: _WsClient):
+    """Send the client's buffered events as one batch frame after its window."""
+    try:
+        await asyncio.sleep(client.batch_ms / 1000)
+        events, client.pending = client.pending, []
+        if events:
+            await _send_json(client, {"type": "batch", "count": len(events), "events": events})
+    except asyncio.CancelledError:
+        raise
+    except Exception:
+        _ws_clients.pop(client.ws, None)
+    finally:
+        client.flush_task = None
 
 
 async def _on_agent_event(msg: AgentMessage):
-    """Forward every MessageBus event to connected WebSocket clients."""
-    if not _ws_clients:
-        return
-    payload = json.dumps({
+    """Sequence a MessageBus event and forward it to every client whose filters match."""
+    event = _replay.append({
         "type": f"agent:{msg.topic}",
         "data": {
             "sender": msg.sender,
@@ -30,14 +211,28 @@ async def _on_agent_event(msg: AgentMessage):
             "priority": msg.priority,
         },
     })
+    if not _ws_clients:
+        return
+    # Encode once per delivery mode, not once per client
+    frames: dict[bool, str | bytes] = {}
     dead: list[WebSocket] = []
-    for ws in list(_ws_clients):
+    for client in list(_ws_clients.values()):
+        # A replaying client picks this event up from the buffer in order
+        if client.replaying or not client.wants(event):
+            continue
+        if client.batch_ms > 0:
+            client.pending.append(event)
+            if client.flush_task is None:
+                client.flush_task = asyncio.create_task(_flush_later(client))
+            continue
+        if client.compress not in frames:
+            frames[client.compress] = _encode(event, client.compress)
         try:
-            await ws.send_text(payload)
+            await _send(client, frames[client.compress])
         except Exception:
-            dead.append(ws)
+            dead.append(client.ws)
     for ws in dead:
-        _ws_clients.discard(ws)
+        _ws_clients.pop(ws, None)
 
 
 # Subscribe to all interesting topics
@@ -48,20 +243,87 @@ def _ensure_subscribed():
     global _subscribed
     if _subscribed:
         return
-    for topic in (
-        "signal",
-        "heartbeat",
-        "scan_result",
-        "consensus",
-        "risk_alert",
-        "kill_switch",
-        "optimization",
-        "agent_status",
-    ):
+    for topic in TOPICS:
         message_bus.subscribe(topic, _on_agent_event)
     _subscribed = True
 
 
+def _as_set(value) -> set[str]:
+    """Normalize a list or comma-separated string into a set of non-empty strings."""
+    if isinstance(value, str):
+        value = value.split(",")
+    if not isinstance(value, (list, tuple, set)):
+        return set()
+    return {str(v).strip() for v in value if str(v).strip()}
+
+
+def _apply_options(client: _WsClient, options: dict):
+    """Apply batch/compression options from a control message or query string."""
+    if "batch_ms" in options:
+        try:
+            client.batch_ms = max(0, min(int(options["batch_ms"]), MAX_BATCH_MS))
+        except (TypeError, ValueError):
+            pass
+    if "compress" in options:
+        value = options["compress"]
+        if isinstance(value, str):
+            value = value.lower() in ("1", "true", "yes")
+        client.compress = bool(value)
+
+
+def _handle_control(client: _WsClient, msg: dict) -> dict | None:
+    """Apply a subscribe/unsubscribe/configure message. Returns the reply, if any."""
+    msg_type = msg.get("type")
+    if msg_type == "subscribe":
+        client.subscribe(_as_set(msg.get("topics")), _as_set(msg.get("symbols")))
+        _apply_options(client, msg)
+        return {"type": "subscribed", **client.describe()}
+    if msg_type == "unsubscribe":
+        client.unsubscribe(_as_set(msg.get("topics")), _as_set(msg.get("symbols")))
+        return {"type": "unsubscribed", **client.describe()}
+    if msg_type == "configure":
+        _apply_options(client, msg)
+        return {"type": "configured", **client.describe()}
+    return None
+
+
+def _parse_seq(value) -> int | None:
+    try:
+        return int(value) if value is not None and value != "" else None
+    except (TypeError, ValueError):
+        return None
+
+
+async def _replay_gap(client: _WsClient, since: int, stream_id: str | None = None) -> int:
+    """Send buffered events after ``since`` that match the client's filters.
+
+    Repeats until caught up and returns the last sequence number covered.
+    When the gap cannot be served, sends ``replay_incomplete`` and carries on
+    from the buffer head, so events buffered during the send still arrive.
+    """
+    last = since
+    while True:
+        if (stream_id and stream_id != _replay.stream_id) or not _replay.covers(last):
+            # Continue from the current head so events sent meanwhile still arrive
+            requested, last, stream_id = last, _replay.last_seq, None
+            await _send_json(client, {
+                "type": "replay_incomplete",
+                "requested_since": requested,
+                "oldest_seq": _replay.oldest_seq,
+                "last_seq": last,
+                "stream_id": _replay.stream_id,
+            })
+            continue
+        gap = _replay.since(last)
+        if not gap:
+            return last
+        matching = [e for e in gap if client.wants(e)]
+        for i in range(0, len(matching), REPLAY_CHUNK_SIZE):
+            chunk = matching[i:i + REPLAY_CHUNK_SIZE]
+            await _send_json(client, {"type": "replay", "count": len(chunk), "events": chunk})
+        last = gap[-1]["seq"]
+
+
 @router.websocket("/ws/events")
 async def ws_events(ws: WebSocket):
     """
@@ -72,29 +334,64 @@ async def ws_events(ws: WebSocket):
     """
     await ws.accept()
     _ensure_subscribed()
-    _ws_clients.add(ws)
-    logger.info("WebSocket client connected (total: %d)", len(_ws_clients))
+
+    client = _WsClient(ws=ws)
+    client.subscribe(
+        _as_set(ws.query_params.get("topics", "")),
+        _as_set(ws.query_params.get("symbols", "")),
+    )
+    _apply_options(client, dict(ws.query_params))
+    since = _parse_seq(ws.query_params.get("since"))
 
     try:
         # Send initial hello
-        await ws.send_json({
+        await _send_json(client, {
             "type": "connected",
             "service": "ai-engine",
             "timestamp": datetime.now(timezone.utc).isoformat(),
+            "stream_id": _replay.stream_id,
+            "seq": _replay.last_seq,
+            **client.describe(),
         })
 
-        # Keep alive loop — also handles client pings
+        # Replay the gap before going live. No await between the last
+        # (empty) gap check and registration, so no event can slip through.
+        if since is not None:
+            await _replay_gap(client, since, ws.query_params.get("stream"))
+        _ws_clients[ws] = client
+        logger.info("WebSocket client connected (total: %d)", len(_ws_clients))
+
+        # Keep alive loop — also handles client pings and subscription commands
         while True:
             try:
                 data = await asyncio.wait_for(ws.receive_text(), timeout=30.0)
-                # Client can send ping or subscribe commands
-                msg = json.loads(data)
+                try:
+                    msg = json.loads(data)
+                except json.JSONDecodeError:
+                    continue
+                if not isinstance(msg, dict):
+                    continue
                 if msg.get("type") == "ping":
-                    await ws.send_json({"type": "pong", "timestamp": datetime.now(timezone.utc).isoformat()})
+                    await _send_json(client, {"type": "pong", "timestamp": datetime.now(timezone.utc).isoformat()})
+                    continue
+                if msg.get("type") == "resume":
+                    resume_since = _parse_seq(msg.get("since"))
+                    if resume_since is not None:
+                        # Hold live events until the replay catches up, else
+                        # they would interleave with (and precede) older ones
+                        client.replaying = True
+                        try:
+                            await _replay_gap(client, resume_since, msg.get("stream_id"))
+                        finally:
+                            client.replaying = False
+                    continue
+                reply = _handle_control(client, msg)
+                if reply:
+                    await _send_json(client, reply)
             except asyncio.TimeoutError:
                 # No message in 30s — send a keep-alive ping
                 try:
-                    await ws.send_json({"type": "ping", "timestamp": datetime.now(timezone.utc).isoformat()})
+                    await _send_json(client, {"type": "ping", "timestamp": datetime.now(timezone.utc).isoformat()})
                 except Exception:
                     break
     except WebSocketDisconnect:
@@ -102,5 +399,11 @@ async def ws_events(ws: WebSocket):
     except Exception as e:
         logger.warning("WebSocket error: %s", e)
     finally:
-        _ws_clients.discard(ws)
+        _ws_clients.pop(ws, None)
+        if client.flush_task:
+            client.flush_task.cancel()
         logger.info("WebSocket client disconnected (total: %d)", len(_ws_clients))
+
+
+# Start sequencing at import so events before the first connection are replayable
+_ensure_subscribed()
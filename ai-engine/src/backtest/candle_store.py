@@ -0,0 +1,40 @@
+"""Candle store — OHLCV history as memory-mapped ``.npy`` files.
+
+One file per (symbol, interval) holding a float64 matrix with the columns in
+``COLUMNS``. Writers replace files atomically; readers open them with
+``mmap_mode="r"``, so any number of worker processes share the same pages
+through the OS cache instead of each receiving a pickled copy.
+"""
+
+import os
+from pathlib import Path
+
+import numpy as np
+
+COLUMNS = ("open_time", "open", "high", "low", "close", "volume")
+OPEN_TIME, OPEN, HIGH, LOW, CLOSE, VOLUME = range(len(COLUMNS))
+
+
+class CandleStore:
+    """Directory of per-(symbol, interval) candle matrices."""
+
+    def __init__(self, root: str | Path):
+        self.root = Path(root)
+
+    def path(self, symbol: str, interval: str) -> Path:
+        return self.root / f"{symbol.upper()}_{interval}.npy"
+
+    def write(self, symbol: str, interval: str, candles: list[dict]) -> Path:
+        """Persist candles (oldest first); returns the file path."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        matrix = np.array([[c[col] for col in COLUMNS] for c in candles], dtype=np.float64).reshape(-1, len(COLUMNS))
+        path = self.path(symbol, interval)
+        tmp = path.with_suffix(".tmp.npy")
+        np.save(tmp, matrix)
+        os.replace(tmp, path)
+        return path
+
+    @staticmethod
+    def open(path: str | Path) -> np.ndarray:
+        """Read-only memory map of a stored matrix."""
+        return np.load(path, mmap_mode="r")
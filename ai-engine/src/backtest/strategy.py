@@ -0,0 +1,186 @@
+"""Strategy backtest — RSI reversion entries with ATR stop-loss / take-profit.
+
+The tunable core of the Technical Analyst setup, replayed over a candle matrix:
+
+- LONG when RSI(``rsi_period``) closes below ``oversold``, SHORT above
+  ``100 − oversold``; entry at that close
+- Stop / target at ``sl_atr`` / ``tp_atr`` × ATR(14) from the entry
+- Exit on the first bar whose range touches a level (the stop when both do),
+  otherwise at the close ``max_hold`` bars later
+- One position at a time; ``cost_bps`` charged per round trip
+
+Exit bars of every candidate entry are found in one vectorized pass over a
+sliding window of the following ``max_hold`` bars, so a full parameter grid
+over one window takes milliseconds. The module is pure NumPy: worker processes
+import it without touching the database or network.
+"""
+
+import itertools
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from src.backtest.candle_store import CLOSE, HIGH, LOW, OPEN_TIME, CandleStore
+
+PARAM_GRID: dict[str, tuple] = {
+    "rsi_period": (7, 14, 21),
+    "oversold": (20, 25, 30, 35),
+    "sl_atr": (1.0, 1.5, 2.0),
+    "tp_atr": (1.5, 2.5, 3.5),
+}
+
+ATR_PERIOD = 14
+
+# Fewer trades than this in a train window cannot rank a parameter set
+MIN_TRADES = 5
+
+
+def param_sets(grid: dict[str, tuple] | None = None) -> list[dict]:
+    grid = grid or PARAM_GRID
+    return [dict(zip(grid, values)) for values in itertools.product(*grid.values())]
+
+
+def rsi_series(closes: np.ndarray, period: int) -> np.ndarray:
+    """Wilder RSI aligned with ``closes`` (NaN until ``period`` deltas are seen)."""
+    rsi = np.full(len(closes), np.nan)
+    if len(closes) <= period:
+        return rsi
+    deltas = np.diff(closes)
+    gains = np.where(deltas > 0, deltas, 0.0)
+    losses = np.where(deltas < 0, -deltas, 0.0)
+    avg_gain, avg_loss = gains[:period].mean(), losses[:period].mean()
+    for i in range(period, len(deltas)):
+        avg_gain = (avg_gain * (period - 1) + gains[i]) / period
+        avg_loss = (avg_loss * (period - 1) + losses[i]) / period
+        rsi[i + 1] = 100.0 if avg_loss == 0 else 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+    return rsi
+
+
+def atr_series(highs: np.ndarray, lows: np.ndarray, closes: np.ndarray, period: int = ATR_PERIOD) -> np.ndarray:
+    """Simple-average ATR aligned with ``closes``, as in ``compute_atr``."""
+    atr = np.full(len(closes), np.nan)
+    if len(closes) <= period:
+        return atr
+    tr = np.maximum(
+        highs[1:] - lows[1:],
+        np.maximum(np.abs(highs[1:] - closes[:-1]), np.abs(lows[1:] - closes[:-1])),
+    )
+    total = np.concatenate([[0.0], np.cumsum(tr)])
+    atr[period:] = (total[period:] - total[:-period]) / period
+    return atr
+
+
+class Backtest:
+    """Precomputed series of one candle segment, shared by every parameter set."""
+
+    def __init__(self, candles: np.ndarray, max_hold: int, cost_bps: float):
+        self.highs = np.ascontiguousarray(candles[:, HIGH])
+        self.lows = np.ascontiguousarray(candles[:, LOW])
+        self.closes = np.ascontiguousarray(candles[:, CLOSE])
+        self.max_hold = max_hold
+        self.cost = cost_bps / 10_000
+        self.atr = atr_series(self.highs, self.lows, self.closes)
+        self._rsi: dict[int, np.ndarray] = {}
+
+        # Row i holds bars i+1 .. i+max_hold (NaN past the end)
+        pad = np.full(max_hold, np.nan)
+        self._next_highs = sliding_window_view(np.concatenate([self.highs[1:], pad]), max_hold)
+        self._next_lows = sliding_window_view(np.concatenate([self.lows[1:], pad]), max_hold)
+
+    def rsi(self, period: int) -> np.ndarray:
+        if period not in self._rsi:
+            self._rsi[period] = rsi_series(self.closes, period)
+        return self._rsi[period]
+
+    def run(self, params: dict, start: int, end: int) -> np.ndarray:
+        """Net trade returns for entries in bars ``[start, end)``; exits are cut at ``end``."""
+        rsi = self.rsi(params["rsi_period"])[start:end - 1]
+        oversold = params["oversold"]
+        with np.errstate(invalid="ignore"):
+            direction = np.where(rsi < oversold, 1.0, np.where(rsi > 100 - oversold, -1.0, 0.0))
+        entries = np.flatnonzero(direction) + start
+        entries = entries[np.isfinite(self.atr[entries])]
+        if not len(entries):
+            return np.empty(0)
+
+        side = direction[entries - start]
+        price = self.closes[entries]
+        stop = price - side * params["sl_atr"] * self.atr[entries]
+        target = price + side * params["tp_atr"] * self.atr[entries]
+
+        # Bars after each entry, masked beyond the segment end
+        horizon = np.minimum(end - 1 - entries, self.max_hold)
+        in_range = np.arange(self.max_hold)[None, :] < horizon[:, None]
+        highs, lows = self._next_highs[entries], self._next_lows[entries]
+        long = side[:, None] > 0
+        with np.errstate(invalid="ignore"):
+            stop_hit = in_range & np.where(long, lows <= stop[:, None], highs >= stop[:, None])
+            target_hit = in_range & np.where(long, highs >= target[:, None], lows <= target[:, None])
+        never = self.max_hold
+        first_stop = np.where(stop_hit.any(axis=1), stop_hit.argmax(axis=1), never)
+        first_target = np.where(target_hit.any(axis=1), target_hit.argmax(axis=1), never)
+        offset = np.minimum(np.minimum(first_stop, first_target), np.maximum(horizon - 1, 0))
+        exit_bar = entries + 1 + offset
+        exit_price = np.where(
+            first_stop <= first_target,
+            np.where(first_stop < never, stop, self.closes[exit_bar]),
+            target,
+        )
+        returns = side * (exit_price / price - 1.0) - self.cost
+
+        # One position at a time: skip entries before the previous exit
+        taken = np.zeros(len(entries), dtype=bool)
+        free_from = -1
+        for k, (entry, exit_at) in enumerate(zip(entries, exit_bar)):
+            if entry >= free_from:
+                taken[k] = True
+                free_from = exit_at
+        return returns[taken]
+
+
+def summarize(returns: np.ndarray) -> dict:
+    """Trade count, summed return, win rate and t-stat style score."""
+    n = len(returns)
+    if n == 0:
+        return {"trades": 0, "return": 0.0, "win_rate": None, "score": None}
+    std = float(returns.std())
+    score = float(returns.mean() / std * np.sqrt(n)) if std > 0 else None
+    return {
+        "trades": n,
+        "return": round(float(returns.sum()), 6),
+        "win_rate": round(float((returns > 0).mean()), 4),
+        "score": round(score, 4) if score is not None else None,
+    }
+
+
+def run_window(task: dict) -> dict:
+    """Grid-search one train window and score the winner on the following test window.
+
+    ``task`` carries the store ``path`` and row indexes (``warmup_start``,
+    ``train_start``, ``test_start``, ``test_end``) — never the candles — so
+    it pickles in a few hundred bytes.
+    """
+    data = CandleStore.open(task["path"])
+    base = task["warmup_start"]
+    segment = np.array(data[base:task["test_end"]])
+    backtest = Backtest(segment, task["max_hold"], task["cost_bps"])
+    train = (task["train_start"] - base, task["test_start"] - base)
+    test = (task["test_start"] - base, task["test_end"] - base)
+
+    best, best_score, in_sample = None, -np.inf, None
+    for params in param_sets(task.get("grid")):
+        stats = summarize(backtest.run(params, *train))
+        if stats["trades"] >= MIN_TRADES and stats["score"] is not None and stats["score"] > best_score:
+            best, best_score, in_sample = params, stats["score"], stats
+
+    return {
+        "symbol": task["symbol"],
+        "train_start": int(segment[train[0], OPEN_TIME]),
+        "test_start": int(segment[test[0], OPEN_TIME]),
+        "test_end": int(segment[test[1] - 1, OPEN_TIME]),
+        "train_bars": train[1] - train[0],
+        "test_bars": test[1] - test[0],
+        "params": best,
+        "in_sample": in_sample,
+        "out_of_sample": summarize(backtest.run(best, *test)) if best else None,
+    }
@@ -0,0 +1,245 @@
+"""Walk-forward validation — out-of-sample checks for strategy parameters.
+
+Candle history per symbol is fetched once and written to the memory-mapped
+``CandleStore``, then cut into rolling windows: parameters are picked by grid
+search on ``walk_forward_train_bars`` and scored, untouched, on the following
+``walk_forward_test_bars``; the next window starts one test length later.
+Windows are independent, so they run on a process pool — each worker gets a
+file path and row offsets and maps the candles itself.
+
+Windows are submitted newest first and collection stops at
+``walk_forward_budget_seconds``, so a long symbol list still fits the nightly
+maintenance window; the report covers whatever completed.
+
+The stability report (overall and per symbol) carries:
+
+- out-of-sample return, trades and share of profitable test windows
+- walk-forward efficiency — OOS return per bar over in-sample return per bar
+- per-parameter stability — how often the most-picked value won
+- the most frequently picked parameter set, flagged ``stable`` when it held up
+  out of sample
+"""
+
+import asyncio
+import json
+import logging
+import multiprocessing
+import os
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from src.agents.technical_analyst import ATR_MULTIPLIER_SL, ATR_MULTIPLIER_TP
+from src.backtest.candle_store import CandleStore
+from src.backtest.strategy import PARAM_GRID, run_window
+from src.config import settings
+from src.core.indicator_snapshot import closed_candles
+from src.services.binance_ws import get_candle_history
+from src.services.db import db_pool
+from src.services.queries import queries
+
+logger = logging.getLogger(__name__)
+
+# Parameters the Technical Analyst trades with today (RSI 14 at 30/70)
+LIVE_PARAMS = {"rsi_period": 14, "oversold": 30, "sl_atr": ATR_MULTIPLIER_SL, "tp_atr": ATR_MULTIPLIER_TP}
+
+# Bars before each train window for indicator warm-up (longest RSI + ATR)
+WARMUP_BARS = 64
+
+# A parameter set is "stable" when all of these hold
+MIN_WINDOWS = 3
+MIN_EFFICIENCY = 0.5
+MIN_POSITIVE_SHARE = 0.5
+MIN_PARAM_SHARE = 0.5
+
+# Concurrent history downloads
+FETCH_CONCURRENCY = 8
+
+queries.register(
+    "walk_forward.insert",
+    """INSERT INTO ualgo_walk_forward_report
+           (strategy_id, timeframe, symbols, windows_planned, windows_completed, stable, duration_ms, report)
+       VALUES (:strategy_id, :timeframe, :symbols, :windows_planned, :windows_completed,
+               :stable, :duration_ms, :report::jsonb)
+       RETURNING id""",
+)
+
+
+def stability(windows: list[dict]) -> dict:
+    """Aggregate window results into OOS performance and parameter stability."""
+    scored = [w for w in windows if w["params"]]
+    if not scored:
+        return {"windows": 0, "stable": False, "recommended": None}
+
+    is_per_bar = sum(w["in_sample"]["return"] / w["train_bars"] for w in scored) / len(scored)
+    oos_per_bar = sum(w["out_of_sample"]["return"] / w["test_bars"] for w in scored) / len(scored)
+    efficiency = oos_per_bar / is_per_bar if is_per_bar > 0 else None
+    positive_share = sum(w["out_of_sample"]["return"] > 0 for w in scored) / len(scored)
+
+    params = {}
+    for key in PARAM_GRID:
+        value, count = Counter(w["params"][key] for w in scored).most_common(1)[0]
+        params[key] = {"mode": value, "share": round(count / len(scored), 4)}
+    combo, combo_count = Counter(tuple(sorted(w["params"].items())) for w in scored).most_common(1)[0]
+
+    stable = (
+        len(scored) >= MIN_WINDOWS
+        and efficiency is not None and efficiency >= MIN_EFFICIENCY
+        and positive_share >= MIN_POSITIVE_SHARE
+        and all(p["share"] >= MIN_PARAM_SHARE for p in params.values())
+    )
+    return {
+        "windows": len(scored),
+        "unscored_windows": len(windows) - len(scored),
+        "oos_return": round(sum(w["out_of_sample"]["return"] for w in scored), 6),
+        "oos_trades": sum(w["out_of_sample"]["trades"] for w in scored),
+        "oos_positive_share": round(positive_share, 4),
+        "efficiency": round(efficiency, 4) if efficiency is not None else None,
+        "params": params,
+        "recommended": dict(combo),
+        "recommended_share": round(combo_count / len(scored), 4),
+        "stable": stable,
+    }
+
+
+def _by_recency(per_symbol: list[list[dict]]) -> list[dict]:
+    """Interleave per-symbol window lists (each newest first) rank by rank."""
+    depth = max((len(w) for w in per_symbol), default=0)
+    return [windows[rank] for rank in range(depth) for windows in per_symbol if rank < len(windows)]
+
+
+class WalkForward:
+    """Rolling train/test validation of the strategy parameter grid."""
+
+    def __init__(self):
+        self.store = CandleStore(settings.walk_forward_data_dir)
+        self.last_report: dict | None = None
+        self.runs = 0
+
+    async def _prepare(self, symbols: list[str], timeframe: str) -> dict[str, tuple[str, int]]:
+        """Fetch history into the candle store; returns {symbol: (path, bars)}."""
+        semaphore = asyncio.Semaphore(FETCH_CONCURRENCY)
+
+        async def fetch(symbol: str) -> list[dict]:
+            async with semaphore:
+                return await get_candle_history(symbol, timeframe, settings.walk_forward_history_bars)
+
+        histories = await asyncio.gather(*(fetch(s) for s in symbols))
+        prepared = {}
+        for symbol, candles in zip(symbols, histories):
+            candles = closed_candles(candles)
+            if candles:
+                prepared[symbol] = (str(self.store.write(symbol, timeframe, candles)), len(candles))
+        return prepared
+
+    @staticmethod
+    def _windows(symbol: str, path: str, bars: int) -> list[dict]:
+        """Window tasks for one symbol, newest first."""
+        train, test = settings.walk_forward_train_bars, settings.walk_forward_test_bars
+        cost_bps = 2 * (settings.paper_taker_fee_bps + settings.paper_half_spread_bps)
+        tasks = []
+        test_end = bars
+        while test_end - test - train >= WARMUP_BARS:
+            test_start = test_end - test
+            tasks.append({
+                "symbol": symbol,
+                "path": path,
+                "warmup_start": test_start - train - WARMUP_BARS,
+                "train_start": test_start - train,
+                "test_start": test_start,
+                "test_end": test_end,
+                "max_hold": settings.walk_forward_max_hold_bars,
+                "cost_bps": cost_bps,
+            })
+            test_end = test_start
+        return tasks
+
+    async def run(self, symbols: list[str] | None = None, strategy_id: str = "default") -> dict:
+        """Validate every symbol within the time budget; persist and return the report."""
+        started = time.monotonic()
+        deadline = started + settings.walk_forward_budget_seconds
+        timeframe = settings.walk_forward_timeframe
+        symbols = [s.upper() for s in (symbols or settings.default_symbols)]
+
+        prepared = await self._prepare(symbols, timeframe)
+        per_symbol = [self._windows(s, path, bars) for s, (path, bars) in prepared.items()]
+        # Round-robin by recency so every symbol gets its newest windows first
+        tasks = _by_recency(per_symbol)
+
+        results: list[dict] = []
+        if tasks:
+            loop = asyncio.get_running_loop()
+            pool = ProcessPoolExecutor(
+                max_workers=settings.walk_forward_workers or os.cpu_count(),
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            try:
+                futures = [loop.run_in_executor(pool, run_window, task) for task in tasks]
+                done, pending = await asyncio.wait(futures, timeout=max(deadline - time.monotonic(), 0))
+                for future in pending:
+                    future.cancel()
+                for future in done:
+                    if future.exception():
+                        logger.error(f"Walk-forward window failed: {future.exception()}")
+                    else:
+                        results.append(future.result())
+            finally:
+                pool.shutdown(wait=False, cancel_futures=True)
+
+        by_symbol: dict[str, list[dict]] = {}
+        for window in results:
+            by_symbol.setdefault(window["symbol"], []).append(window)
+        report = {
+            "strategy_id": strategy_id,
+            "timeframe": timeframe,
+            "train_bars": settings.walk_forward_train_bars,
+            "test_bars": settings.walk_forward_test_bars,
+            "windows_planned": len(tasks),
+            "windows_completed": len(results),
+            "budget_exhausted": len(results) < len(tasks),
+            "live_params": LIVE_PARAMS,
+            "overall": stability(results),
+            "symbols": {s: stability(w) for s, w in sorted(by_symbol.items())},
+            "missing_history": sorted(set(symbols) - prepared.keys()),
+            "duration_ms": int((time.monotonic() - started) * 1000),
+        }
+        report["report_id"] = await self._persist(report)
+
+        self.last_report = report
+        self.runs += 1
+        logger.info(
+            f"Walk-forward: {len(results)}/{len(tasks)} windows over {len(prepared)} symbols "
+            f"in {report['duration_ms']}ms (stable={report['overall']['stable']})"
+        )
+        return report
+
+    async def _persist(self, report: dict) -> int | None:
+        try:
+            return await db_pool.fetchval_named(
+                "walk_forward.insert",
+                strategy_id=report["strategy_id"],
+                timeframe=report["timeframe"],
+                symbols=len(report["symbols"]),
+                windows_planned=report["windows_planned"],
+                windows_completed=report["windows_completed"],
+                stable=report["overall"]["stable"],
+                duration_ms=report["duration_ms"],
+                report=json.dumps(report),
+            )
+        except Exception as e:
+            logger.error(f"Walk-forward report persist failed: {e}")
+            return None
+
+    def get_stats(self) -> dict:
+        last = self.last_report or {}
+        return {
+            "runs": self.runs,
+            "last_report_id": last.get("report_id"),
+            "last_windows_completed": last.get("windows_completed"),
+            "last_budget_exhausted": last.get("budget_exhausted"),
+            "last_duration_ms": last.get("duration_ms"),
+        }
+
+
+# Global singleton
+walk_forward = WalkForward()
@@ -0,0 +1,183 @@
+"""Agent weights — consensus weights calibrated per agent and market regime.
+
+A vote is resolved once its signal's position closes: an approve was right if
+the position made money, a reject if it did not. Resolved votes are folded
+into ``ualgo_agent_accuracy`` (one row per agent × regime) incrementally —
+each calibration only reads positions closed since the table's watermark.
+
+Weights are the static prior scaled by skill, then renormalized to the prior
+total within each regime:
+
+    accuracy   = (correct + k × base) / (votes + k)     # shrunk, k = SHRINKAGE_VOTES
+    multiplier = clip(accuracy / 0.5, MIN_MULTIPLIER, MAX_MULTIPLIER)
+
+where ``base`` is 0.5 for an agent's all-regime accuracy and that all-regime
+accuracy for a single regime, so thin regimes fall back to the agent's overall
+record and thin agents to the prior.
+
+The weights live in memory as an immutable, versioned ``WeightTable``.
+Calibration builds a new table and swaps the reference, so
+``DecisionEngine.collect_votes`` reads weights without DB access or locks.
+"""
+
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+
+from src.services.db import db_pool
+from src.services.queries import queries
+
+logger = logging.getLogger(__name__)
+
+# Prior consensus weights (sum to 1.0)
+PRIOR_WEIGHTS = {
+    "alpha_scout": 0.20,
+    "technical_analyst": 0.35,
+    "risk_sentinel": 0.30,
+    "orchestrator": 0.15,
+}
+
+# Weight of an agent missing from the prior
+UNKNOWN_AGENT_WEIGHT = 0.1
+
+# Regime label for votes cast without one
+DEFAULT_REGIME = "default"
+
+# Pseudo-votes pulling accuracy toward its base rate
+SHRINKAGE_VOTES = 20
+MIN_MULTIPLIER = 0.25
+MAX_MULTIPLIER = 2.0
+
+# Positions closed within this lag are left for the next calibration, so a
+# close committed late with an earlier closed_at is not skipped
+CLOSE_LAG_SECONDS = 60
+
+queries.register(
+    "agent_accuracy.accumulate",
+    """WITH mark AS (
+           SELECT COALESCE(MAX(resolved_through), 'epoch'::timestamptz) AS ts FROM ualgo_agent_accuracy
+       ),
+       resolved AS (
+           SELECT cv.agent_name, cv.regime, (cv.vote = 'approve') = (p.unrealized_pnl > 0) AS correct
+           FROM ualgo_position p
+           JOIN ualgo_consensus_vote cv ON cv.signal_id = p.signal_id
+           CROSS JOIN mark
+           WHERE p.status = 'closed' AND cv.vote <> 'abstain'
+             AND p.closed_at > mark.ts AND p.closed_at <= :through
+       )
+       INSERT INTO ualgo_agent_accuracy (agent_name, regime, votes, correct, resolved_through, updated_at)
+       SELECT agent_name, regime, COUNT(*), COUNT(*) FILTER (WHERE correct), :through, now()
+       FROM resolved
+       GROUP BY agent_name, regime
+       ON CONFLICT (agent_name, regime) DO UPDATE SET
+           votes = ualgo_agent_accuracy.votes + EXCLUDED.votes,
+           correct = ualgo_agent_accuracy.correct + EXCLUDED.correct,
+           resolved_through = EXCLUDED.resolved_through,
+           updated_at = now()""",
+)
+queries.register(
+    "agent_accuracy.all",
+    "SELECT agent_name, regime, votes, correct FROM ualgo_agent_accuracy",
+)
+
+
+@dataclass(frozen=True)
+class WeightTable:
+    """Immutable weights snapshot: ``weights[regime][agent]``."""
+    version: int = 0
+    weights: dict[str, dict[str, float]] = field(default_factory=lambda: {DEFAULT_REGIME: dict(PRIOR_WEIGHTS)})
+    calibrated_at: float | None = None
+
+    def weight(self, agent_name: str, regime: str | None = None) -> float:
+        agents = self.weights.get(regime or DEFAULT_REGIME) or self.weights[DEFAULT_REGIME]
+        return agents.get(agent_name, UNKNOWN_AGENT_WEIGHT)
+
+
+def _shrunk(correct: float, votes: float, base: float) -> float:
+    return (correct + SHRINKAGE_VOTES * base) / (votes + SHRINKAGE_VOTES)
+
+
+def _normalized(multipliers: dict[str, float]) -> dict[str, float]:
+    raw = {agent: PRIOR_WEIGHTS[agent] * multipliers.get(agent, 1.0) for agent in PRIOR_WEIGHTS}
+    scale = sum(PRIOR_WEIGHTS.values()) / sum(raw.values())
+    return {agent: round(w * scale, 6) for agent, w in raw.items()}
+
+
+def build_weights(rows: list[dict]) -> dict[str, dict[str, float]]:
+    """Per-regime weights from accumulated (agent_name, regime, votes, correct) rows."""
+    totals: dict[str, list[int]] = {}
+    for r in rows:
+        t = totals.setdefault(r["agent_name"], [0, 0])
+        t[0] += r["votes"]
+        t[1] += r["correct"]
+    overall = {agent: _shrunk(correct, votes, 0.5) for agent, (votes, correct) in totals.items()}
+
+    def multiplier(accuracy: float) -> float:
+        return min(max(accuracy / 0.5, MIN_MULTIPLIER), MAX_MULTIPLIER)
+
+    weights = {DEFAULT_REGIME: _normalized({a: multiplier(acc) for a, acc in overall.items()})}
+    by_regime: dict[str, dict[str, float]] = {}
+    for r in rows:
+        if r["regime"] == DEFAULT_REGIME:
+            continue
+        accuracy = _shrunk(r["correct"], r["votes"], overall[r["agent_name"]])
+        by_regime.setdefault(r["regime"], {})[r["agent_name"]] = multiplier(accuracy)
+    for regime, multipliers in by_regime.items():
+        # Agents without votes in this regime keep their all-regime skill
+        merged = {a: multiplier(acc) for a, acc in overall.items()} | multipliers
+        weights[regime] = _normalized(merged)
+    return weights
+
+
+class AgentWeights:
+    """Holds the current ``WeightTable`` and recalibrates it from resolved votes."""
+
+    def __init__(self):
+        self._table = WeightTable()
+        self.calibrations = 0
+        self.last_error: str | None = None
+
+    @property
+    def table(self) -> WeightTable:
+        return self._table
+
+    def weight(self, agent_name: str, regime: str | None = None) -> float:
+        return self._table.weight(agent_name, regime)
+
+    def apply(self, rows: list[dict]) -> WeightTable:
+        """Swap in weights built from accuracy rows; the version bumps only on change."""
+        weights = build_weights(rows)
+        current = self._table
+        if weights != current.weights:
+            self._table = WeightTable(version=current.version + 1, weights=weights, calibrated_at=time.time())
+            logger.info(f"AgentWeights v{self._table.version}: {weights[DEFAULT_REGIME]}")
+        return self._table
+
+    async def calibrate(self) -> WeightTable:
+        """Fold newly resolved votes into the accuracy table, then reload weights."""
+        through = datetime.now(timezone.utc) - timedelta(seconds=CLOSE_LAG_SECONDS)
+        try:
+            await db_pool.execute_named("agent_accuracy.accumulate", through=through)
+            rows = await db_pool.fetch_named("agent_accuracy.all")
+        except Exception as e:
+            self.last_error = str(e)
+            logger.error(f"AgentWeights calibration failed: {e}")
+            return self._table
+        self.calibrations += 1
+        self.last_error = None
+        return self.apply([dict(r) for r in rows])
+
+    def get_stats(self) -> dict:
+        table = self._table
+        return {
+            "version": table.version,
+            "calibrated_at": table.calibrated_at,
+            "calibrations": self.calibrations,
+            "last_error": self.last_error,
+            "weights": table.weights,
+        }
+
+
+# Global singleton
+agent_weights = AgentWeights()
@@ -0,0 +1,399 @@
+"""AlertEngine — In-memory evaluation of user_alert rows against prices and indicator snapshots.
+
+Active price alerts live in per-symbol sorted threshold arrays, one per trigger
+condition, so a price update from ``prev`` to ``price`` finds every crossed or
+satisfied threshold with two binary searches — O(log n + hits) per tick, however
+many alerts exist. Indicator alerts are indexed by (symbol, timeframe,
+indicator_type, signal_subtype) and matched against the events of each shared
+candle-close indicator snapshot, so no alert ever recomputes indicators.
+
+State is kept in sync incrementally from ``user_alert.updated_at``; triggers are
+queued and written back in one batched UPDATE per flush.
+
+Condition / frequency semantics follow the .NET ``AlertBackgroundService``:
+``Crossing`` on a price_above/price_below alert means crossing up/down,
+``OnlyOnce`` alerts become ``triggered``, repeating alerts stay active and fire
+at most once per bar (``OncePerBar``, ``OncePerBarClose``) or minute
+(``OncePerMinute``). ``OncePerBarClose`` alerts are only evaluated on candle close.
+"""
+
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+from src.core.indicator_snapshot import IndicatorSnapshot, indicator_snapshots
+from src.core.threshold_index import ThresholdIndex
+from src.services.binance_ws import interval_seconds
+from src.services.db import db_pool
+from src.services.queries import queries
+
+logger = logging.getLogger(__name__)
+
+# Overlap applied to the sync watermark so rows committed late by a long
+# transaction are still picked up (re-applying a row is idempotent)
+SYNC_OVERLAP = timedelta(seconds=5)
+
+# Max triggers written per UPDATE statement
+FLUSH_CHUNK_SIZE = 1000
+
+_ALERT_COLUMNS = """id, user_id, symbol, timeframe, alert_type, target_price, indicator_type,
+                    signal_subtype, status, condition, frequency, expiration_time,
+                    last_triggered_bar_time, name, updated_at"""
+
+queries.register(
+    "alerts.active",
+    f"""SELECT {_ALERT_COLUMNS}
+        FROM user_alert
+        WHERE status = 'active'""",
+)
+queries.register(
+    "alerts.changed_since",
+    f"""SELECT {_ALERT_COLUMNS}
+        FROM user_alert
+        WHERE updated_at > :since
+        ORDER BY updated_at""",
+)
+queries.register(
+    "alerts.trigger_batch",
+    """UPDATE user_alert AS a
+       SET status = CASE WHEN t.once THEN 'triggered' ELSE a.status END,
+           triggered_at = now(),
+           trigger_message = t.message,
+           last_triggered_bar_time = t.bar_time,
+           updated_at = now()
+       FROM unnest(:ids::uuid[], :messages::text[], :bar_times::bigint[], :once::bool[])
+            AS t(id, message, bar_time, once)
+       WHERE a.id = t.id AND a.status = 'active'""",
+)
+queries.register(
+    "alerts.expire_batch",
+    """UPDATE user_alert
+       SET status = 'expired', updated_at = now()
+       WHERE id = ANY(:ids::uuid[]) AND status = 'active'""",
+)
+
+# Threshold index slots. "up"/"down" fire on a cross between two prices,
+# "gt"/"lt" fire whenever the price is beyond the threshold.
+_CROSS_UP = "up"
+_CROSS_DOWN = "down"
+_ABOVE = "gt"
+_BELOW = "lt"
+
+
+@dataclass
+class _Alert:
+    id: str
+    user_id: str
+    symbol: str
+    timeframe: str
+    alert_type: str
+    target_price: float | None
+    indicator_type: str | None
+    signal_subtype: str | None
+    condition: str
+    frequency: str
+    expiration_time: datetime | None
+    last_bar: int | None
+    name: str | None
+
+    @classmethod
+    def from_row(cls, row) -> "_Alert":
+        return cls(
+            id=str(row["id"]),
+            user_id=str(row["user_id"]),
+            symbol=row["symbol"].upper(),
+            timeframe=row["timeframe"] or "1h",
+            alert_type=row["alert_type"],
+            target_price=float(row["target_price"]) if row["target_price"] is not None else None,
+            indicator_type=(row["indicator_type"] or "").lower() or None,
+            signal_subtype=row["signal_subtype"] or None,
+            condition=row["condition"] or "Crossing",
+            frequency=row["frequency"] or "OnlyOnce",
+            expiration_time=row["expiration_time"],
+            last_bar=row["last_triggered_bar_time"],
+            name=row["name"],
+        )
+
+    @property
+    def slot(self) -> str | None:
+        """Threshold index slot for a price alert, None if the condition is unsupported."""
+        condition = self.condition
+        if condition == "Crossing":
+            condition = "CrossingUp" if self.alert_type == "price_above" else "CrossingDown"
+        return {
+            "CrossingUp": _CROSS_UP,
+            "CrossingDown": _CROSS_DOWN,
+            "GreaterThan": _ABOVE,
+            "LessThan": _BELOW,
+        }.get(condition)
+
+    def bar_time(self, ts: float) -> int:
+        """Start of the frequency bucket containing ``ts`` (epoch ms, like candle open times)."""
+        seconds = 60 if self.frequency == "OncePerMinute" else interval_seconds(self.timeframe)
+        return int(ts // seconds * seconds * 1000)
+
+    def is_expired(self, now: datetime) -> bool:
+        return self.expiration_time is not None and now > self.expiration_time
+
+
+@dataclass
+class _PendingTrigger:
+    alert_id: str
+    message: str
+    bar_time: int
+    once: bool
+
+
+class AlertEngine:
+    """Evaluates active user alerts on every price update and indicator snapshot."""
+
+    def __init__(self):
+        self._alerts: dict[str, _Alert] = {}
+        # (symbol, None) → tick-evaluated books; (symbol, timeframe) → close-only books
+        self._books: dict[tuple[str, str | None], dict[str, ThresholdIndex]] = {}
+        # (symbol, timeframe, indicator_type, signal_subtype|None) → alert ids
+        self._indicator_index: dict[tuple[str, str, str, str | None], set[str]] = {}
+        self._last_price: dict[tuple[str, str | None], float] = {}
+        self._pending: dict[str, _PendingTrigger] = {}
+        self._expired: set[str] = set()
+        self._watermark: datetime | None = None
+        self.ticks = 0
+        self.hits = 0
+        self.triggers_written = 0
+        self.eval_seconds = 0.0
+
+    def _book_key(self, alert: _Alert) -> tuple[str, str | None]:
+        return (alert.symbol, alert.timeframe if alert.frequency == "OncePerBarClose" else None)
+
+    def _indicator_key(self, alert: _Alert) -> tuple[str, str, str, str | None]:
+        return (alert.symbol, alert.timeframe, alert.indicator_type, alert.signal_subtype)
+
+    def _add(self, alert: _Alert):
+        if alert.alert_type == "indicator_signal":
+            if not alert.indicator_type:
+                return
+            self._indicator_index.setdefault(self._indicator_key(alert), set()).add(alert.id)
+        else:
+            slot = alert.slot
+            if alert.target_price is None or slot is None:
+                return
+            book = self._books.setdefault(self._book_key(alert), {})
+            book.setdefault(slot, ThresholdIndex()).add(alert.target_price, alert.id)
+        self._alerts[alert.id] = alert
+
+    def _remove(self, alert_id: str):
+        alert = self._alerts.pop(alert_id, None)
+        if alert is None:
+            return
+        if alert.alert_type == "indicator_signal":
+            key = self._indicator_key(alert)
+            ids = self._indicator_index.get(key)
+            if ids:
+                ids.discard(alert_id)
+                if not ids:
+                    del self._indicator_index[key]
+            return
+        book_key = self._book_key(alert)
+        book = self._books.get(book_key, {})
+        index = book.get(alert.slot)
+        if index is not None:
+            index.remove(alert.target_price, alert_id)
+            if not index:
+                del book[alert.slot]
+        if not book:
+            self._books.pop(book_key, None)
+
+    def _apply_row(self, row):
+        alert_id = str(row["id"])
+        self._remove(alert_id)
+        if row["status"] != "active":
+            self._pending.pop(alert_id, None)
+            return
+        pending = self._pending.get(alert_id)
+        if pending and pending.once:
+            # Fired but not flushed yet — don't re-arm it from the stale row
+            return
+        alert = _Alert.from_row(row)
+        if not alert.is_expired(datetime.now(timezone.utc)):
+            self._add(alert)
+
+    async def load(self):
+        """Full load of active alerts. Resets in-memory state."""
+        rows = await db_pool.fetch_named("alerts.active")
+        self._alerts.clear()
+        self._books.clear()
+        self._indicator_index.clear()
+        for row in rows:
+            self._apply_row(row)
+        self._watermark = max((r["updated_at"] for r in rows), default=datetime.now(timezone.utc))
+        logger.info(f"AlertEngine loaded {len(self._alerts)} active alerts")
+
+    async def sync(self) -> int:
+        """Apply alerts created, edited, cancelled or triggered since the last sync."""
+        if self._watermark is None:
+            await self.load()
+            return len(self._alerts)
+        rows = await db_pool.fetch_named("alerts.changed_since", since=self._watermark - SYNC_OVERLAP)
+        for row in rows:
+            self._apply_row(row)
+        if rows:
+            self._watermark = max(self._watermark, rows[-1]["updated_at"])
+        return len(rows)
+
+    def on_price(self, symbol: str, price: float, ts: float | None = None) -> int:
+        """Evaluate tick-driven price alerts for one symbol. Returns the number of hits."""
+        return self._evaluate_book((symbol.upper(), None), price, ts or time.time())
+
+    def on_prices(self, prices: dict[str, float], ts: float | None = None) -> int:
+        """Evaluate a batch of latest prices, visiting only symbols that have alerts."""
+        ts = ts or time.time()
+        fired = 0
+        for key in [k for k in self._books if k[1] is None]:
+            price = prices.get(key[0])
+            if price is not None:
+                fired += self._evaluate_book(key, price, ts)
+        return fired
+
+    def on_candle_close(self, symbol: str, timeframe: str, close: float, open_time_ms: int) -> int:
+        """Evaluate ``OncePerBarClose`` alerts for a closed candle."""
+        return self._evaluate_book((symbol.upper(), timeframe), close, open_time_ms / 1000)
+
+    def _evaluate_book(self, key: tuple[str, str | None], price: float, ts: float) -> int:
+        prev = self._last_price.get(key)
+        self._last_price[key] = price
+        book = self._books.get(key)
+        if not book:
+            return 0
+        start = time.perf_counter()
+        self.ticks += 1
+
+        hits: list[str] = []
+        index = book.get(_ABOVE)
+        if index:
+            hits += index.between(float("-inf"), price, False, False)
+        index = book.get(_BELOW)
+        if index:
+            hits += index.between(price, float("inf"), False, False)
+        if prev is not None and prev != price:
+            if price > prev and (index := book.get(_CROSS_UP)):
+                hits += index.between(prev, price, False, True)
+            elif price < prev and (index := book.get(_CROSS_DOWN)):
+                hits += index.between(price, prev, True, False)
+
+        now = datetime.now(timezone.utc)
+        fired = 0
+        for alert_id in hits:
+            alert = self._alerts.get(alert_id)
+            if alert is None:
+                continue
+            if alert.is_expired(now):
+                self._expire(alert_id)
+                continue
+            direction = "above" if alert.slot in (_CROSS_UP, _ABOVE) else "below"
+            message = f"{alert.symbol}: Price ({price:,.2f}) {alert.condition} {alert.target_price:,.2f} ({direction})"
+            fired += self._fire(alert, message, alert.bar_time(ts))
+
+        self.hits += fired
+        self.eval_seconds += time.perf_counter() - start
+        return fired
+
+    def match_snapshot(self, snapshot: IndicatorSnapshot) -> int:
+        """Trigger indicator alerts for the events of a new candle-close snapshot.
+
+        Registered as an indicator snapshot listener. Cost is one dict lookup per
+        event on the candle, not per alert.
+        """
+        symbol, timeframe = snapshot.symbol, snapshot.timeframe
+        fired = 0
+        now = datetime.now(timezone.utc)
+        for (indicator_type, subtype), message in snapshot.events.items():
+            # An alert without a subtype matches every event of its indicator type
+            for key in ((symbol, timeframe, indicator_type, subtype), (symbol, timeframe, indicator_type, None)):
+                for alert_id in list(self._indicator_index.get(key, ())):
+                    alert = self._alerts.get(alert_id)
+                    if alert is None:
+                        continue
+                    if alert.is_expired(now):
+                        self._expire(alert_id)
+                        continue
+                    fired += self._fire(alert, f"{symbol} {timeframe}: {message}", snapshot.bar_time)
+        self.hits += fired
+        return fired
+
+    def close_targets(self) -> set[tuple[str, str]]:
+        """(symbol, timeframe) pairs that have active ``OncePerBarClose`` price alerts."""
+        return {key for key in self._books if key[1] is not None}
+
+    def indicator_targets(self) -> set[tuple[str, str]]:
+        """(symbol, timeframe) pairs that have active indicator alerts."""
+        return {(symbol, timeframe) for symbol, timeframe, _, _ in self._indicator_index}
+
+    def _fire(self, alert: _Alert, message: str, bar_time: int) -> int:
+        once = alert.frequency == "OnlyOnce"
+        if not once and alert.last_bar == bar_time:
+            return 0
+        if alert.id in self._pending:
+            return 0
+        self._pending[alert.id] = _PendingTrigger(alert.id, message, bar_time, once)
+        if once:
+            self._remove(alert.id)
+        else:
+            alert.last_bar = bar_time
+        return 1
+
+    def _expire(self, alert_id: str):
+        self._remove(alert_id)
+        self._expired.add(alert_id)
+
+    async def flush(self) -> int:
+        """Write queued triggers and expirations back to user_alert in batches."""
+        written = 0
+        if self._pending:
+            pending, self._pending = list(self._pending.values()), {}
+            for i in range(0, len(pending), FLUSH_CHUNK_SIZE):
+                chunk = pending[i:i + FLUSH_CHUNK_SIZE]
+                try:
+                    await db_pool.execute_named(
+                        "alerts.trigger_batch",
+                        ids=[t.alert_id for t in chunk],
+                        messages=[t.message for t in chunk],
+                        bar_times=[t.bar_time for t in chunk],
+                        once=[t.once for t in chunk],
+                    )
+                    written += len(chunk)
+                except Exception as e:
+                    logger.error(f"AlertEngine trigger flush failed ({len(chunk)} alerts): {e}")
+                    for t in chunk:
+                        self._pending.setdefault(t.alert_id, t)
+            self.triggers_written += written
+            if written:
+                logger.info(f"AlertEngine wrote {written} alert triggers")
+        if self._expired:
+            expired, self._expired = list(self._expired), set()
+            try:
+                await db_pool.execute_named("alerts.expire_batch", ids=expired)
+            except Exception as e:
+                logger.error(f"AlertEngine expiry flush failed: {e}")
+                self._expired.update(expired)
+        return written
+
+    def get_stats(self) -> dict:
+        price_alerts = sum(len(ix) for book in self._books.values() for ix in book.values())
+        return {
+            "active_alerts": len(self._alerts),
+            "price_alerts": price_alerts,
+            "indicator_alerts": len(self._alerts) - price_alerts,
+            "symbols": len({key[0] for key in self._books}),
+            "ticks_evaluated": self.ticks,
+            "hits": self.hits,
+            "pending_triggers": len(self._pending),
+            "triggers_written": self.triggers_written,
+            "avg_tick_us": round(self.eval_seconds / self.ticks * 1e6, 2) if self.ticks else None,
+            "watermark": self._watermark.isoformat() if self._watermark else None,
+        }
+
+
+# Global singleton
+alert_engine = AlertEngine()
+indicator_snapshots.on_snapshot(alert_engine.match_snapshot)
@@ -0,0 +1,143 @@
+"""ResponseCache — In-process TTL cache with single-flight loading for hot read endpoints.
+
+Each entry is tagged with the tables it was read from. Writes that go through
+``db_pool`` invalidate every entry tagged with the written table; the TTL bounds
+staleness for writes made outside this process (.NET backend, Go engine).
+
+Separate instances with an infinite TTL serve as single-flight LRU memos
+(e.g. Technical Analyst results keyed by closed candle).
+"""
+
+import asyncio
+import functools
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable
+
+from src.services.db import db_pool
+
+
+@dataclass
+class _Entry:
+    value: Any
+    expires_at: float
+    tags: tuple[str, ...]
+
+
+class ResponseCache:
+    """TTL cache keyed by string with per-table invalidation and request coalescing.
+
+    Concurrent misses for the same key share one loader call (single-flight).
+    A load that overlaps an invalidation of one of its tags is returned to its
+    callers but not stored, so a write can never be masked by an older read.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._inflight: dict[str, asyncio.Future] = {}
+        self._tag_generation: dict[str, int] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.invalidations = 0
+
+    async def get_or_load(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: float,
+        tags: tuple[str, ...] = (),
+    ) -> Any:
+        """Return the cached value for key, or run loader once and cache its result."""
+        entry = self._entries.get(key)
+        if entry and entry.expires_at > time.monotonic():
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return entry.value
+
+        inflight = self._inflight.get(key)
+        if inflight:
+            self.coalesced += 1
+            return await asyncio.shield(inflight)
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        generations = {t: self._tag_generation.get(t, 0) for t in tags}
+        try:
+            value = await loader()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark retrieved so an unobserved failure doesn't log a warning
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+        if all(self._tag_generation.get(t, 0) == g for t, g in generations.items()):
+            self._store(key, _Entry(value, time.monotonic() + ttl, tags))
+        future.set_result(value)
+        return value
+
+    def _store(self, key: str, entry: _Entry):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate_table(self, table: str):
+        """Drop every entry read from ``table``. Registered as a db_pool write hook."""
+        self._tag_generation[table] = self._tag_generation.get(table, 0) + 1
+        stale = [k for k, e in self._entries.items() if table in e.tags]
+        for key in stale:
+            del self._entries[key]
+        if stale:
+            self.invalidations += len(stale)
+
+    def clear(self):
+        self._entries.clear()
+
+    def get_stats(self) -> dict:
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "invalidations": self.invalidations,
+            "hit_rate": round((self.hits + self.coalesced) / lookups, 4) if lookups else 0.0,
+        }
+
+
+# Global singleton
+response_cache = ResponseCache()
+db_pool.on_write(response_cache.invalidate_table)
+
+
+def cached_route(ttl: float, tables: tuple[str, ...] = ()):
+    """Cache an async FastAPI endpoint's result per argument set.
+
+    Args:
+        ttl: Seconds a result stays fresh.
+        tables: Tables the endpoint reads; a write to any of them through
+            ``db_pool`` evicts the cached result immediately.
+    """
+    def decorator(func):
+        prefix = f"{func.__module__}.{func.__qualname__}"
+
+        # functools.wraps keeps __wrapped__, which FastAPI uses to read the signature
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            key = f"{prefix}:{args!r}:{sorted(kwargs.items())!r}"
+            return await response_cache.get_or_load(
+                key, lambda: func(*args, **kwargs), ttl=ttl, tags=tables
+            )
+
+        return wrapper
+
+    return decorator
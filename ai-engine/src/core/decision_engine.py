@@ -1,30 +1,47 @@
-"""DecisionEngine — Consensus voting and final signal approval."""
+"""DecisionEngine — Consensus voting and final signal approval.
+
+Vote weights come from the in-memory ``WeightTable`` in
+``src/core/agent_weights.py`` (calibrated per agent and market regime), read
+once per consensus round; tallying never touches the database.
+"""
 
 import json
 import logging
 
+from src.core.agent_weights import DEFAULT_REGIME, PRIOR_WEIGHTS, agent_weights
 from src.models.signal import ConsensusResult, ConsensusVote, Signal, VoteType
 from src.services.db import db_pool
+from src.services.queries import queries
 
 logger = logging.getLogger(__name__)
 
+queries.register(
+    "consensus.insert_votes",
+    """INSERT INTO ualgo_consensus_vote (signal_id, agent_name, vote, confidence, reasoning, regime)
+       SELECT :signal_id, t.agent_name, t.vote, t.confidence, t.reasoning::jsonb, :regime
+       FROM unnest(:agent_names::text[], :votes::text[], :confidences::numeric[], :reasonings::text[])
+            AS t(agent_name, vote, confidence, reasoning)""",
+)
+
 
 class DecisionEngine:
     """Manages consensus voting among agents for signal approval."""
 
-    # Weight each agent's vote
-    AGENT_WEIGHTS = {
-        "alpha_scout": 0.20,
-        "technical_analyst": 0.35,
-        "risk_sentinel": 0.30,
-        "orchestrator": 0.15,
-    }
+    # Prior weight of each agent's vote; live weights come from agent_weights
+    AGENT_WEIGHTS = PRIOR_WEIGHTS
 
     def __init__(self, min_confidence: float = 0.7):
         self.min_confidence = min_confidence
 
-    async def collect_votes(self, signal: Signal, votes: list[ConsensusVote]) -> ConsensusResult:
-        """Process votes and determine if a signal is approved."""
+    async def collect_votes(
+        self, signal: Signal, votes: list[ConsensusVote], regime: str | None = None
+    ) -> ConsensusResult:
+        """Process votes and determine if a signal is approved.
+
+        ``regime`` selects the calibrated weight set (all-regime weights when None).
+        """
+        regime = regime or DEFAULT_REGIME
+        table = agent_weights.table
         approve_count = sum(1 for v in votes if v.vote == VoteType.APPROVE)
         reject_count = sum(1 for v in votes if v.vote == VoteType.REJECT)
         abstain_count = sum(1 for v in votes if v.vote == VoteType.ABSTAIN)
@@ -35,7 +52,7 @@ class DecisionEngine:
         for vote in votes:
             if vote.vote == VoteType.ABSTAIN:
                 continue
-            w = self.AGENT_WEIGHTS.get(vote.agent_name, 0.1)
+            w = table.weight(vote.agent_name, regime)
             score = vote.confidence if vote.vote == VoteType.APPROVE else (1 - vote.confidence)
             weighted_sum += score * w
             weight_total += w
@@ -61,33 +78,34 @@ class DecisionEngine:
             abstain_count=abstain_count,
             weighted_confidence=round(weighted_confidence, 4),
             votes=votes,
+            regime=regime,
+            weights_version=table.version,
         )
 
         # Persist votes to database
         if signal.id:
-            await self._persist_votes(signal.id, votes)
+            await self._persist_votes(signal.id, votes, regime)
 
         logger.info(
             f"Consensus for {signal.symbol}: "
             f"{'APPROVED' if approved else 'REJECTED'} "
-            f"(confidence={weighted_confidence:.2%}, veto={risk_veto})"
+            f"(confidence={weighted_confidence:.2%}, veto={risk_veto}, "
+            f"regime={regime}, weights=v{table.version})"
         )
 
         return result
 
-    async def _persist_votes(self, signal_id: int, votes: list[ConsensusVote]):
-        """Store individual votes in the database."""
-        for vote in votes:
-            await db_pool.execute(
-                """INSERT INTO ualgo_consensus_vote
-                   (signal_id, agent_name, vote, confidence, reasoning)
-                   VALUES ($1, $2, $3, $4, $5::jsonb)""",
-                signal_id,
-                vote.agent_name,
-                vote.vote.value,
-                vote.confidence,
-                json.dumps(vote.reasoning),
-            )
+    async def _persist_votes(self, signal_id: int, votes: list[ConsensusVote], regime: str):
+        """Store all votes of a round in one statement."""
+        await db_pool.execute_named(
+            "consensus.insert_votes",
+            signal_id=signal_id,
+            regime=regime,
+            agent_names=[v.agent_name for v in votes],
+            votes=[v.vote.value for v in votes],
+            confidences=[v.confidence for v in votes],
+            reasonings=[json.dumps(v.reasoning) for v in votes],
+        )
 
 
 decision_engine = DecisionEngine()
@@ -0,0 +1,290 @@
+"""Exit triggers — stop-loss / take-profit evaluation of open positions on every price batch.
+
+Each symbol keeps two sorted level indexes (``ThresholdIndex``):
+
+- ``below`` — levels that fire when price falls to or through them
+  (LONG stop-loss, SHORT take-profit)
+- ``above`` — levels that fire when price rises to or through them
+  (LONG take-profit, SHORT stop-loss)
+
+A tick at ``price`` fires every ``below`` level >= price and every ``above``
+level <= price: two binary searches plus the hits, O(log n + k) per symbol,
+however many positions are open. Fired positions leave the index at once and
+are closed in one bulk statement on the next flush, which runs right after each
+price batch. The same statement closes the position's ``ualgo_trade`` fill
+(joined on ``signal_id``) with the exit price and PnL net of the entry fee and
+a taker exit fee (``U2ALGO_PAPER_TAKER_FEE_BPS``). Each confirmed close is
+removed from mark-to-market, counted as a loss by RiskSentinel when its net PnL
+is negative, and broadcast on the message bus as ``position.closed``.
+"""
+
+import logging
+import time
+from collections.abc import Mapping
+from dataclasses import dataclass
+
+from src.config import settings
+from src.core.mark_to_market import mark_to_market
+from src.core.message_bus import message_bus
+from src.core.threshold_index import ThresholdIndex
+from src.services.db import db_pool
+from src.services.queries import queries
+
+logger = logging.getLogger(__name__)
+
+queries.register(
+    "positions.open_exits",
+    """SELECT id, symbol, side, entry_price, quantity, leverage, stop_loss, take_profit, strategy_id
+       FROM ualgo_position
+       WHERE status = 'open' AND (stop_loss IS NOT NULL OR take_profit IS NOT NULL)""",
+)
+queries.register(
+    "positions.close_batch",
+    """WITH t AS (
+           SELECT * FROM unnest(
+               :ids::bigint[], :prices::numeric[], :pnls::numeric[], :pnl_pcts::numeric[], :exit_fees::numeric[]
+           ) AS t(id, price, pnl, pnl_pct, exit_fee)
+       ),
+       closed AS (
+           UPDATE ualgo_position AS p
+           SET status = 'closed',
+               closed_at = now(),
+               current_price = t.price,
+               unrealized_pnl = t.pnl,
+               unrealized_pnl_pct = t.pnl_pct
+           FROM t
+           WHERE p.id = t.id AND p.status = 'open'
+           RETURNING p.id, p.signal_id, COALESCE(p.leverage, 1) AS leverage, t.price, t.pnl, t.exit_fee
+       ),
+       trades AS (
+           UPDATE ualgo_trade AS tr
+           SET status = 'closed',
+               closed_at = now(),
+               exit_price = c.price,
+               fee = COALESCE(tr.fee, 0) + c.exit_fee,
+               pnl = c.pnl - COALESCE(tr.fee, 0) - c.exit_fee,
+               pnl_pct = ROUND(
+                   (c.pnl - COALESCE(tr.fee, 0) - c.exit_fee)
+                   / NULLIF(tr.entry_price * tr.quantity, 0) * c.leverage * 100, 4)
+           FROM closed AS c
+           WHERE tr.signal_id = c.signal_id AND tr.status = 'open'
+           RETURNING tr.signal_id, tr.pnl
+       )
+       SELECT c.id, COALESCE(tr.pnl, c.pnl - c.exit_fee) AS net_pnl
+       FROM closed AS c LEFT JOIN trades AS tr ON tr.signal_id = c.signal_id""",
+)
+
+
+@dataclass
+class _Exit:
+    id: int
+    symbol: str
+    side: str
+    entry_price: float
+    quantity: float
+    leverage: float
+    stop_loss: float | None
+    take_profit: float | None
+    strategy_id: str | None = None
+
+    @classmethod
+    def from_row(cls, row: Mapping) -> "_Exit":
+        return cls(
+            id=int(row["id"]),
+            symbol=row["symbol"].upper(),
+            side=row["side"],
+            entry_price=float(row["entry_price"]),
+            quantity=float(row["quantity"]),
+            leverage=float(row.get("leverage") or 1.0),
+            stop_loss=float(row["stop_loss"]) if row.get("stop_loss") is not None else None,
+            take_profit=float(row["take_profit"]) if row.get("take_profit") is not None else None,
+            strategy_id=row.get("strategy_id"),
+        )
+
+    def levels(self) -> list[tuple[str, str, float]]:
+        """(reason, book, level) for each configured exit."""
+        stop_book, target_book = ("below", "above") if self.side == "LONG" else ("above", "below")
+        out = []
+        if self.stop_loss is not None:
+            out.append(("stop_loss", stop_book, self.stop_loss))
+        if self.take_profit is not None:
+            out.append(("take_profit", target_book, self.take_profit))
+        return out
+
+    def pnl(self, price: float) -> tuple[float, float]:
+        move = (price - self.entry_price) * (1 if self.side == "LONG" else -1)
+        pct = move / self.entry_price * self.leverage * 100 if self.entry_price > 0 else 0.0
+        return move * self.quantity, pct
+
+
+@dataclass
+class _PendingClose:
+    exit: _Exit
+    reason: str
+    price: float
+    fired_at: float
+
+    def exit_fee(self) -> float:
+        """Taker fee on the exit notional."""
+        return self.price * self.exit.quantity * settings.paper_taker_fee_bps / 10_000
+
+
+class ExitTriggerEngine:
+    """Watches SL/TP levels of open positions and closes them when crossed."""
+
+    def __init__(self):
+        self._exits: dict[int, _Exit] = {}
+        self._books: dict[str, dict[str, ThresholdIndex]] = {}
+        self._pending: dict[int, _PendingClose] = {}
+        self.loaded_at: float | None = None
+        self.ticks = 0
+        self.eval_seconds = 0.0
+        self.closed = 0
+        self.stop_losses = 0
+        self.take_profits = 0
+
+    def _index(self, exit_: _Exit):
+        book = self._books.setdefault(exit_.symbol, {"below": ThresholdIndex(), "above": ThresholdIndex()})
+        for _, side, level in exit_.levels():
+            book[side].add(level, exit_.id)
+        self._exits[exit_.id] = exit_
+
+    def _unindex(self, position_id: int) -> _Exit | None:
+        exit_ = self._exits.pop(position_id, None)
+        if exit_ is None:
+            return None
+        book = self._books.get(exit_.symbol, {})
+        for _, side, level in exit_.levels():
+            if side in book:
+                book[side].remove(level, position_id)
+        return exit_
+
+    async def load(self):
+        """Full reload of open positions with SL/TP. Pending closes are kept."""
+        rows = await db_pool.fetch_named("positions.open_exits")
+        self._exits.clear()
+        self._books.clear()
+        for row in rows:
+            if int(row["id"]) not in self._pending:
+                self._index(_Exit.from_row(row))
+        self.loaded_at = time.time()
+        logger.info(f"ExitTriggerEngine loaded {len(self._exits)} positions with exits")
+
+    def add(self, row: Mapping):
+        """Watch a position opened in-process (a ``ualgo_position`` row mapping)."""
+        exit_ = _Exit.from_row(row)
+        self._unindex(exit_.id)
+        if exit_.levels():
+            self._index(exit_)
+
+    def remove(self, position_id: int):
+        """Stop watching a position closed by some other path."""
+        self._unindex(position_id)
+
+    def on_prices(self, prices: Mapping[str, float], ts: float | None = None) -> int:
+        """Fire every SL/TP crossed by the batch. Returns the number of positions fired."""
+        started = time.perf_counter()
+        ts = ts or time.time()
+        fired = 0
+        for symbol, book in self._books.items():
+            price = prices.get(symbol)
+            if price is None:
+                continue
+            hits = [
+                *book["below"].between(price, float("inf"), True, True),
+                *book["above"].between(float("-inf"), price, True, True),
+            ]
+            for position_id in hits:
+                exit_ = self._exits.get(position_id)
+                if exit_ is None:
+                    continue  # already fired by its other level this tick
+                # The stop wins if a gap crosses both levels
+                reason = next(
+                    r for r, side, level in exit_.levels()
+                    if (side == "below" and level >= price) or (side == "above" and level <= price)
+                )
+                self._unindex(position_id)
+                self._pending[position_id] = _PendingClose(exit_, reason, price, ts)
+                fired += 1
+        self.ticks += 1
+        self.eval_seconds += time.perf_counter() - started
+        return fired
+
+    async def flush(self) -> int:
+        """Close fired positions and their trades in one statement, then record and broadcast the exits."""
+        if not self._pending:
+            return 0
+        pending, self._pending = list(self._pending.values()), {}
+        marks = [p.exit.pnl(p.price) for p in pending]
+        try:
+            rows = await db_pool.fetch_named(
+                "positions.close_batch",
+                ids=[p.exit.id for p in pending],
+                prices=[round(p.price, 8) for p in pending],
+                pnls=[round(pnl, 8) for pnl, _ in marks],
+                pnl_pcts=[round(pct, 4) for _, pct in marks],
+                exit_fees=[round(p.exit_fee(), 8) for p in pending],
+            )
+        except Exception as e:
+            logger.error(f"ExitTriggerEngine close failed ({len(pending)} positions): {e}")
+            for p in pending:
+                self._pending.setdefault(p.exit.id, p)
+            return 0
+
+        from src.agents.risk_sentinel import risk_sentinel
+
+        net_pnls = {int(r["id"]): float(r["net_pnl"]) for r in rows}
+        mark_to_market.remove(list(net_pnls))
+        for p, (pnl, pnl_pct) in zip(pending, marks):
+            if p.exit.id not in net_pnls:
+                continue  # closed elsewhere in the meantime
+            net_pnl = net_pnls[p.exit.id]
+            notional = p.exit.entry_price * p.exit.quantity
+            net_pct = net_pnl / notional * p.exit.leverage * 100 if notional > 0 else pnl_pct
+            if net_pnl < 0:
+                risk_sentinel.record_loss()
+            if p.reason == "stop_loss":
+                self.stop_losses += 1
+            else:
+                self.take_profits += 1
+            logger.info(
+                f"{p.reason.upper()} hit: position {p.exit.id} {p.exit.symbol} {p.exit.side} "
+                f"@ {p.price} (PnL {net_pnl:.4f} net of fees)"
+            )
+            await message_bus.broadcast(
+                sender="exit_triggers",
+                topic="position.closed",
+                payload={
+                    "position_id": p.exit.id,
+                    "symbol": p.exit.symbol,
+                    "side": p.exit.side,
+                    "reason": p.reason,
+                    "exit_price": p.price,
+                    "entry_price": p.exit.entry_price,
+                    "quantity": p.exit.quantity,
+                    "pnl": round(net_pnl, 8),
+                    "pnl_pct": round(net_pct, 4),
+                    "gross_pnl": round(pnl, 8),
+                    "strategy_id": p.exit.strategy_id,
+                    "latency_ms": round((time.time() - p.fired_at) * 1000, 2),
+                },
+            )
+        self.closed += len(net_pnls)
+        return len(net_pnls)
+
+    def get_stats(self) -> dict:
+        return {
+            "watched_positions": len(self._exits),
+            "levels": sum(len(ix) for book in self._books.values() for ix in book.values()),
+            "symbols": len(self._books),
+            "pending_closes": len(self._pending),
+            "ticks_evaluated": self.ticks,
+            "avg_tick_us": round(self.eval_seconds / self.ticks * 1e6, 2) if self.ticks else None,
+            "closed": self.closed,
+            "stop_losses": self.stop_losses,
+            "take_profits": self.take_profits,
+        }
+
+
+# Global singleton
+exit_triggers = ExitTriggerEngine()
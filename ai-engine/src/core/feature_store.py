@@ -0,0 +1,410 @@
+"""FeatureStore — indicator features computed once per candle close, shared by strategies.
+
+A feature is one indicator with its parameters on one (symbol, timeframe)
+series, e.g. ``rsi(period=21)`` on BTCUSDT 1h. Strategies subscribe to the
+features their ``ualgo_strategy.config`` lists; subscriptions that resolve to
+the same feature (same indicator and parameters once defaults are filled in)
+share one ``FeatureSeries``, so the work per candle close grows with the
+number of unique features, not with the number of strategies or users.
+
+Registered as an ``indicator_snapshots`` listener: every new closed candle
+evaluates each subscribed feature of that pair once, from the snapshot's
+arrays, and appends it under the candle's open time. Features whose
+parameters are the snapshot's own (RSI 14, Bollinger 20/2, ATR 14, volume)
+are copied from the snapshot instead of recomputed.
+
+Series keep the last ``feature_store_history_bars`` values in memory and are
+persisted as one ``.npy`` matrix per feature (``bar_time`` followed by the
+value columns, float64) under ``feature_store_dir``. ``flush`` rewrites only
+the series that changed since the previous flush; a series is read back from
+disk when first subscribed, so a restart keeps its history.
+
+``apply`` takes the active ``ualgo_strategy`` rows (loaded by the scan
+planner) and reconciles each strategy's subscriptions with its config; the
+planner records each strategy's feature values (``get``) with its signals:
+
+    {"features": ["rsi", {"indicator": "ema", "params": {"period": 50}}]}
+"""
+
+import json
+import logging
+import math
+import os
+import time
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+
+from src.config import settings
+from src.core.indicator_snapshot import IndicatorSnapshot, indicator_snapshots
+from src.indicators.atr import compute_atr
+from src.indicators.bollinger import compute_bollinger
+from src.indicators.rsi import compute_rsi
+
+logger = logging.getLogger(__name__)
+
+
+def _ema(closes: np.ndarray, period: int) -> float:
+    """EMA of the window, seeded with the SMA of its first ``period`` closes."""
+    if len(closes) < period:
+        return math.nan
+    alpha = 2.0 / (period + 1)
+    value = float(closes[:period].mean())
+    for close in closes[period:].tolist():
+        value += alpha * (close - value)
+    return value
+
+
+def _sma(closes: np.ndarray, period: int) -> float:
+    return float(closes[-period:].mean()) if len(closes) >= period else math.nan
+
+
+BOLLINGER_FIELDS = ("upper", "middle", "lower", "bandwidth", "percent_b")
+VOLUME_FIELDS = ("vwap", "poc", "obv_slope", "relative_volume")
+
+
+def _bollinger(bands: dict) -> tuple:
+    return tuple(bands[f] for f in BOLLINGER_FIELDS)
+
+
+def _volume(snap: IndicatorSnapshot) -> tuple:
+    return tuple(snap.volume.get(f) for f in VOLUME_FIELDS)
+
+
+@dataclass(frozen=True)
+class FeatureDef:
+    """An indicator the store can serve: value columns, default parameters, evaluators."""
+    name: str
+    fields: tuple[str, ...]
+    defaults: dict
+    compute: Callable[..., tuple]
+    # Reads the value off the snapshot when the parameters equal ``defaults``
+    from_snapshot: Callable[[IndicatorSnapshot], tuple] | None = None
+
+
+FEATURES: dict[str, FeatureDef] = {
+    d.name: d for d in (
+        FeatureDef(
+            "rsi", ("value",), {"period": 14},
+            lambda s, period: (compute_rsi(s.closes, period)["current"],),
+            lambda s: (s.rsi["current"],),
+        ),
+        FeatureDef(
+            "bollinger", BOLLINGER_FIELDS, {"period": 20, "std_dev": 2.0},
+            lambda s, period, std_dev: _bollinger(compute_bollinger(s.closes, period, std_dev)),
+            lambda s: _bollinger(s.bollinger),
+        ),
+        FeatureDef(
+            "atr", ("value",), {"period": 14},
+            lambda s, period: (compute_atr(s.highs, s.lows, s.closes, period),),
+            lambda s: (s.atr,),
+        ),
+        FeatureDef("sma", ("value",), {"period": 20}, lambda s, period: (_sma(s.closes, period),)),
+        FeatureDef("ema", ("value",), {"period": 20}, lambda s, period: (_ema(s.closes, period),)),
+        FeatureDef("volume", VOLUME_FIELDS, {}, _volume, _volume),
+    )
+}
+
+
+@dataclass(frozen=True)
+class FeatureSpec:
+    """An indicator with its full parameter set — the unit of deduplication."""
+    indicator: str
+    params: tuple[tuple[str, float | int], ...] = ()
+
+    @classmethod
+    def parse(cls, indicator: str, params: dict | None = None) -> "FeatureSpec":
+        """Normalize against the indicator's defaults; raises ValueError on unknown names."""
+        definition = FEATURES.get(indicator)
+        if definition is None:
+            raise ValueError(f"Unknown feature indicator: {indicator}")
+        unknown = set(params or {}) - set(definition.defaults)
+        if unknown:
+            raise ValueError(f"Unknown {indicator} parameter(s): {', '.join(sorted(unknown))}")
+        merged = {
+            name: type(default)((params or {}).get(name, default))
+            for name, default in definition.defaults.items()
+        }
+        return cls(indicator, tuple(sorted(merged.items())))
+
+    @property
+    def definition(self) -> FeatureDef:
+        return FEATURES[self.indicator]
+
+    @property
+    def is_default(self) -> bool:
+        return dict(self.params) == self.definition.defaults
+
+    @property
+    def label(self) -> str:
+        return f"{self.indicator}({', '.join(f'{k}={v}' for k, v in self.params)})"
+
+    @property
+    def slug(self) -> str:
+        """File-name form, e.g. ``bollinger_period-20_std_dev-2.0``."""
+        return "_".join([self.indicator, *(f"{k}-{v}" for k, v in self.params)])
+
+
+def parse_features(config: dict | str | None) -> list[FeatureSpec]:
+    """Feature specs listed under ``features`` in a strategy config (invalid entries skipped)."""
+    if isinstance(config, str):
+        config = json.loads(config)
+    specs: list[FeatureSpec] = []
+    for entry in (config or {}).get("features", []):
+        try:
+            if isinstance(entry, str):
+                spec = FeatureSpec.parse(entry)
+            else:
+                spec = FeatureSpec.parse(entry["indicator"], entry.get("params"))
+        except (KeyError, TypeError, ValueError) as e:
+            logger.warning(f"FeatureStore: skipping feature {entry!r}: {e}")
+            continue
+        if spec not in specs:
+            specs.append(spec)
+    return specs
+
+
+class FeatureSeries:
+    """Recent values of one feature on one (symbol, timeframe), keyed by bar open time."""
+
+    def __init__(self, fields: tuple[str, ...], max_bars: int):
+        self.fields = fields
+        self.times: deque[int] = deque(maxlen=max_bars)
+        self.values: deque[tuple] = deque(maxlen=max_bars)
+        self.dirty = False
+
+    @property
+    def bar_time(self) -> int | None:
+        return self.times[-1] if self.times else None
+
+    def append(self, bar_time: int, values: tuple):
+        self.times.append(bar_time)
+        self.values.append(tuple(math.nan if v is None else float(v) for v in values))
+        self.dirty = True
+
+    def at(self, bar_time: int | None = None) -> dict | None:
+        """Values at ``bar_time`` (default: the latest bar), or None if not stored."""
+        if not self.times:
+            return None
+        if bar_time is None or bar_time == self.times[-1]:
+            i = len(self.times) - 1
+        else:
+            times = np.fromiter(self.times, dtype=np.int64, count=len(self.times))
+            i = int(np.searchsorted(times, bar_time))
+            if i == len(times) or times[i] != bar_time:
+                return None
+        values = {f: (None if math.isnan(v) else v) for f, v in zip(self.fields, self.values[i])}
+        return {"bar_time": self.times[i], **values}
+
+    def matrix(self) -> np.ndarray:
+        """``[bar_time, *fields]`` rows, oldest first."""
+        rows = [(t, *v) for t, v in zip(self.times, self.values)]
+        return np.array(rows, dtype=np.float64).reshape(-1, len(self.fields) + 1)
+
+    def load(self, matrix: np.ndarray):
+        for row in matrix[-self.times.maxlen:].tolist():
+            self.times.append(int(row[0]))
+            self.values.append(tuple(row[1:]))
+
+
+class FeatureStore:
+    """Feature series and their subscribers per (symbol, timeframe, feature)."""
+
+    def __init__(self, root: str | Path, history_bars: int = 500):
+        self.root = Path(root)
+        self.history_bars = history_bars
+        self._series: dict[tuple[str, str, FeatureSpec], FeatureSeries] = {}
+        self._subscribers: dict[tuple[str, str, FeatureSpec], set[str]] = {}
+        self._owned: dict[str, set[tuple[str, str, FeatureSpec]]] = {}
+        self._by_pair: dict[tuple[str, str], set[FeatureSpec]] = {}
+        self.computed = 0
+        self.copied = 0
+        self.compute_seconds = 0.0
+        self.loaded = 0
+        self.written = 0
+        self.syncs = 0
+
+    # --- Subscriptions ---
+
+    def subscribe(
+        self, subscriber: str, symbol: str, timeframe: str, indicator: str, params: dict | None = None
+    ) -> FeatureSpec:
+        """Subscribe to a feature; raises ValueError for an unknown indicator or parameter."""
+        spec = FeatureSpec.parse(indicator, params)
+        self._add(subscriber, (symbol.upper(), timeframe, spec))
+        return spec
+
+    def unsubscribe(self, subscriber: str):
+        """Drop all of a subscriber's features; series nobody else reads are released."""
+        for key in self._owned.pop(subscriber, set()):
+            self._drop(subscriber, key)
+
+    def set_subscriptions(self, subscriber: str, keys: set[tuple[str, str, FeatureSpec]]):
+        """Replace a subscriber's features with ``keys`` ((SYMBOL, timeframe, spec) tuples)."""
+        current = self._owned.get(subscriber, set())
+        for key in current - keys:
+            self._drop(subscriber, key)
+        for key in keys - current:
+            self._add(subscriber, key)
+        if not keys:
+            self._owned.pop(subscriber, None)
+
+    def _add(self, subscriber: str, key: tuple[str, str, FeatureSpec]):
+        self._owned.setdefault(subscriber, set()).add(key)
+        subscribers = self._subscribers.setdefault(key, set())
+        subscribers.add(subscriber)
+        if key in self._series:
+            return
+        symbol, timeframe, spec = key
+        series = FeatureSeries(spec.definition.fields, self.history_bars)
+        path = self.path(symbol, timeframe, spec)
+        if path.exists():
+            try:
+                series.load(np.load(path))
+                self.loaded += 1
+            except Exception as e:
+                logger.warning(f"FeatureStore: could not read {path.name}: {e}")
+        self._series[key] = series
+        self._by_pair.setdefault((symbol, timeframe), set()).add(spec)
+
+        # A pair that already has a snapshot gets the feature without waiting for the next close
+        snapshot = indicator_snapshots.get(symbol, timeframe)
+        if snapshot is not None:
+            self._evaluate(snapshot, spec, series)
+
+    def _drop(self, subscriber: str, key: tuple[str, str, FeatureSpec]):
+        owned = self._owned.get(subscriber)
+        if owned is not None:
+            owned.discard(key)
+        subscribers = self._subscribers.get(key)
+        if subscribers is None:
+            return
+        subscribers.discard(subscriber)
+        if subscribers:
+            return
+        del self._subscribers[key]
+        series = self._series.pop(key)
+        symbol, timeframe, spec = key
+        if series.dirty:
+            try:
+                self._write(key, series)
+            except Exception as e:
+                logger.error(f"FeatureStore: write of released {symbol} {timeframe} {spec.label} failed: {e}")
+        specs = self._by_pair.get((symbol, timeframe), set())
+        specs.discard(spec)
+        if not specs:
+            self._by_pair.pop((symbol, timeframe), None)
+
+    def targets(self) -> set[tuple[str, str]]:
+        """(symbol, timeframe) pairs with at least one subscribed feature."""
+        return set(self._by_pair)
+
+    # --- Reads ---
+
+    def get(
+        self,
+        symbol: str,
+        timeframe: str,
+        indicator: str,
+        params: dict | None = None,
+        bar_time: int | None = None,
+    ) -> dict | None:
+        """Feature values at ``bar_time`` (default: latest), or None if not subscribed / stored."""
+        series = self._series.get((symbol.upper(), timeframe, FeatureSpec.parse(indicator, params)))
+        return series.at(bar_time) if series is not None else None
+
+    def history(self, symbol: str, timeframe: str, indicator: str, params: dict | None = None) -> np.ndarray | None:
+        """``[bar_time, *fields]`` matrix of a subscribed feature, oldest first."""
+        series = self._series.get((symbol.upper(), timeframe, FeatureSpec.parse(indicator, params)))
+        return series.matrix() if series is not None else None
+
+    # --- Candle close ---
+
+    def on_snapshot(self, snapshot: IndicatorSnapshot):
+        for spec in self._by_pair.get((snapshot.symbol, snapshot.timeframe), ()):
+            self._evaluate(snapshot, spec, self._series[(snapshot.symbol, snapshot.timeframe, spec)])
+
+    def _evaluate(self, snapshot: IndicatorSnapshot, spec: FeatureSpec, series: FeatureSeries):
+        if series.bar_time is not None and snapshot.bar_time <= series.bar_time:
+            return
+        definition = spec.definition
+        if definition.from_snapshot is not None and spec.is_default:
+            series.append(snapshot.bar_time, definition.from_snapshot(snapshot))
+            self.copied += 1
+            return
+        start = time.perf_counter()
+        try:
+            values = definition.compute(snapshot, **dict(spec.params))
+        except Exception as e:
+            logger.error(f"FeatureStore: {spec.label} failed for {snapshot.symbol} {snapshot.timeframe}: {e}")
+            return
+        series.append(snapshot.bar_time, values)
+        self.compute_seconds += time.perf_counter() - start
+        self.computed += 1
+
+    # --- Persistence ---
+
+    def path(self, symbol: str, timeframe: str, spec: FeatureSpec) -> Path:
+        return self.root / f"{symbol.upper()}_{timeframe}_{spec.slug}.npy"
+
+    def _write(self, key: tuple[str, str, FeatureSpec], series: FeatureSeries):
+        self.root.mkdir(parents=True, exist_ok=True)
+        path = self.path(*key)
+        tmp = path.with_suffix(".tmp.npy")
+        np.save(tmp, series.matrix())
+        os.replace(tmp, path)
+        series.dirty = False
+        self.written += 1
+
+    def flush(self) -> int:
+        """Persist series changed since the last flush. Returns the number of files written."""
+        written = 0
+        for key, series in list(self._series.items()):
+            if not series.dirty:
+                continue
+            try:
+                self._write(key, series)
+                written += 1
+            except Exception as e:
+                logger.error(f"FeatureStore: flush of {key[0]} {key[1]} {key[2].label} failed: {e}")
+        return written
+
+    def apply(self, rows: list) -> int:
+        """Subscribe each active strategy row to its features; drop strategies not in ``rows``."""
+        active: set[str] = set()
+        for row in rows:
+            subscriber = f"strategy:{row['id']}"
+            active.add(subscriber)
+            specs = parse_features(row["config"])
+            self.set_subscriptions(subscriber, {
+                (symbol.upper(), timeframe, spec)
+                for symbol in row["symbols"] for timeframe in row["timeframes"] for spec in specs
+            })
+        for subscriber in [s for s in self._owned if s.startswith("strategy:") and s not in active]:
+            self.unsubscribe(subscriber)
+        self.syncs += 1
+        return len(rows)
+
+    def get_stats(self) -> dict:
+        subscriptions = sum(len(s) for s in self._subscribers.values())
+        return {
+            "features": len(self._series),
+            "pairs": len(self._by_pair),
+            "subscribers": len(self._owned),
+            "subscriptions": subscriptions,
+            "shared_ratio": round(subscriptions / len(self._series), 2) if self._series else None,
+            "computed": self.computed,
+            "copied_from_snapshot": self.copied,
+            "avg_compute_ms": round(self.compute_seconds / self.computed * 1000, 3) if self.computed else None,
+            "loaded": self.loaded,
+            "written": self.written,
+            "syncs": self.syncs,
+        }
+
+
+# Global singleton
+feature_store = FeatureStore(settings.feature_store_dir, history_bars=settings.feature_store_history_bars)
+indicator_snapshots.on_snapshot(feature_store.on_snapshot)
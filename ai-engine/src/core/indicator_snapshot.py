@@ -0,0 +1,421 @@
+"""IndicatorSnapshot — Indicator results computed once per (symbol, timeframe) candle close.
+
+Every consumer of indicator output — the Technical Analyst, indicator-signal
+user alerts, API reads — asks the store for the snapshot of the last closed
+candle. The indicator stack runs only when a new candle has closed, so cost
+scales with the number of (symbol, timeframe) pairs, not with the number of
+agents or alerts reading them.
+
+Each snapshot also carries the alert events that fired on its candle
+(``support-resistance``/``sr_bounce``, ``market-structure``/``order_block_touch``,
+``elliott-wave``/``wave_5_complete``, ...), derived once from the shared results.
+Listeners registered with ``on_snapshot`` are called for every new snapshot.
+
+Stateful indicators (volume, Elliott wave tracker, order block / FVG zone
+book) move from a snapshot to the next one and are advanced only by the bars
+that closed in between; they are rebuilt when the new window does not
+continue the previous one.
+"""
+
+import logging
+import time
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Callable
+
+import numpy as np
+
+from src.core.zone_registry import ZoneBook
+from src.indicators.atr import compute_atr
+from src.indicators.batch import batch_atr, batch_bollinger, batch_pivots, batch_rsi
+from src.indicators.bollinger import compute_bollinger
+from src.indicators.elliott_wave import WaveTracker
+from src.indicators.rsi import compute_rsi
+from src.indicators.support_resistance import detect_support_resistance, summarize_levels
+from src.indicators.volume import VolumeState
+
+logger = logging.getLogger(__name__)
+
+# Minimum closed candles for a meaningful snapshot
+MIN_CANDLES = 50
+
+# Proximity to a level counted as "in the zone" for sr_bounce
+SR_ZONE_PCT = 0.005
+
+# (indicator_type, signal_subtype) values as stored in user_alert. Subtypes
+# listed together are aliases for the same event.
+EVENT_ALIASES: dict[tuple[str, str], tuple[str, ...]] = {
+    ("elliott-wave", "wave_5_complete"): ("wave_5_complete", "elliott_wave_5"),
+    ("elliott-wave", "corrective_end"): ("corrective_end", "elliott_corrective_end"),
+}
+
+
+@dataclass
+class IndicatorSnapshot:
+    """All indicator outputs for one closed candle of one (symbol, timeframe)."""
+    symbol: str
+    timeframe: str
+    bar_time: int                 # open time (ms) of the last closed candle
+    candles: list[dict]
+    closes: np.ndarray
+    highs: np.ndarray
+    lows: np.ndarray
+    volumes: np.ndarray
+    rsi: dict
+    bollinger: dict
+    support_resistance: dict
+    order_blocks: dict
+    fvg: dict
+    elliott_wave: dict
+    atr: float
+    volume: dict
+    events: dict[tuple[str, str], str] = field(default_factory=dict)
+    volume_state: VolumeState | None = field(default=None, repr=False)
+    wave_tracker: WaveTracker | None = field(default=None, repr=False)
+    zones: ZoneBook | None = field(default=None, repr=False)
+    computed_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+
+    @property
+    def current_price(self) -> float:
+        return float(self.closes[-1])
+
+
+class IndicatorSnapshotStore:
+    """Latest snapshot per (symbol, timeframe), recomputed only on a new closed candle."""
+
+    def __init__(self, max_entries: int = 2048):
+        self.max_entries = max_entries
+        self._snapshots: OrderedDict[tuple[str, str], IndicatorSnapshot] = OrderedDict()
+        self._listeners: list[Callable[[IndicatorSnapshot], None]] = []
+        self.computed = 0
+        self.reused = 0
+        self.batches = 0
+        self.compute_seconds = 0.0
+
+    def on_snapshot(self, listener: Callable[[IndicatorSnapshot], None]):
+        """Register a callback invoked with every newly computed snapshot."""
+        self._listeners.append(listener)
+
+    def get(self, symbol: str, timeframe: str) -> IndicatorSnapshot | None:
+        return self._snapshots.get((symbol.upper(), timeframe))
+
+    def compute(self, symbol: str, timeframe: str, candles: list[dict]) -> IndicatorSnapshot:
+        """Return the snapshot for the last closed candle in ``candles``.
+
+        A trailing candle whose ``close_time`` is still in the future is the
+        forming bar and is ignored. If the last closed candle is the one the
+        cached snapshot was built from, the cached snapshot is returned as is.
+        """
+        key = (symbol.upper(), timeframe)
+        closed = closed_candles(candles)
+        bar_time = _bar_time(closed)
+
+        cached = self._snapshots.get(key)
+        if cached is not None and cached.bar_time == bar_time:
+            self.reused += 1
+            self._snapshots.move_to_end(key)
+            return cached
+
+        start = time.perf_counter()
+        snapshot = _build_snapshot(key[0], timeframe, bar_time, closed, previous=cached)
+        self.compute_seconds += time.perf_counter() - start
+        self.computed += 1
+        self._store(key, snapshot, cached)
+        return snapshot
+
+    def compute_batch(
+        self, timeframe: str, candles_by_symbol: dict[str, list[dict]]
+    ) -> dict[str, IndicatorSnapshot]:
+        """Snapshots for many symbols of one timeframe, stale ones computed together.
+
+        Symbols whose last closed candle is already cached are reused. The rest
+        are grouped by window length and each group runs RSI, Bollinger, ATR and
+        pivot detection as single (symbols × time) matrix operations.
+        """
+        results: dict[str, IndicatorSnapshot] = {}
+        groups: dict[int, list[tuple[str, list[dict]]]] = defaultdict(list)
+        for symbol, candles in candles_by_symbol.items():
+            key = (symbol.upper(), timeframe)
+            closed = closed_candles(candles)
+            cached = self._snapshots.get(key)
+            if cached is not None and cached.bar_time == _bar_time(closed):
+                self.reused += 1
+                self._snapshots.move_to_end(key)
+                results[symbol] = cached
+            else:
+                groups[len(closed)].append((symbol, closed))
+
+        for length, members in groups.items():
+            if length < 2:
+                for symbol, closed in members:
+                    results[symbol] = self.compute(symbol, timeframe, closed)
+                continue
+            start = time.perf_counter()
+            previous = [self._snapshots.get((symbol.upper(), timeframe)) for symbol, _ in members]
+            built = _build_batch(timeframe, members, previous)
+            self.compute_seconds += time.perf_counter() - start
+            self.computed += len(built)
+            self.batches += 1
+            for (symbol, _), snapshot, cached in zip(members, built, previous):
+                self._store((snapshot.symbol, timeframe), snapshot, cached)
+                results[symbol] = snapshot
+        return results
+
+    def _store(self, key: tuple[str, str], snapshot: IndicatorSnapshot, cached: IndicatorSnapshot | None):
+        self._snapshots[key] = snapshot
+        self._snapshots.move_to_end(key)
+        while len(self._snapshots) > self.max_entries:
+            self._snapshots.popitem(last=False)
+
+        # Only a newer bar is a candle close; a re-fetch of an older window is not
+        if cached is None or snapshot.bar_time > cached.bar_time:
+            for listener in self._listeners:
+                try:
+                    listener(snapshot)
+                except Exception as e:
+                    logger.error(f"Snapshot listener error for {key}: {e}")
+
+    def get_stats(self) -> dict:
+        lookups = self.computed + self.reused
+        return {
+            "snapshots": len(self._snapshots),
+            "computed": self.computed,
+            "reused": self.reused,
+            "batches": self.batches,
+            "reuse_rate": round(self.reused / lookups, 4) if lookups else 0.0,
+            "avg_compute_ms": round(self.compute_seconds / self.computed * 1000, 3) if self.computed else None,
+        }
+
+
+def closed_candles(candles: list[dict]) -> list[dict]:
+    """Drop a trailing candle that is still forming (``close_time`` in the future)."""
+    now_ms = time.time() * 1000
+    if candles and candles[-1].get("close_time") and candles[-1]["close_time"] > now_ms:
+        return candles[:-1]
+    return candles
+
+
+def _bar_time(candles: list[dict]) -> int:
+    if not candles:
+        return 0
+    # Candles without open_time (ad-hoc lists) are keyed by their length
+    return int(candles[-1].get("open_time", len(candles)))
+
+
+def _carry_from(candles: list[dict], state_bar_time: int | None) -> int | None:
+    """Index of the first bar after ``state_bar_time``, or None if the window does not continue it."""
+    if state_bar_time is None or not candles:
+        return None
+    first, last = candles[0].get("open_time"), candles[-1].get("open_time")
+    if first is None or last is None or not first <= state_bar_time < last:
+        return None
+    times = np.array([c["open_time"] for c in candles])
+    return int(np.searchsorted(times, state_bar_time, side="right"))
+
+
+def _volume_state(
+    candles: list[dict],
+    highs: np.ndarray,
+    lows: np.ndarray,
+    closes: np.ndarray,
+    volumes: np.ndarray,
+    previous: IndicatorSnapshot | None,
+) -> VolumeState:
+    """Advance the previous snapshot's volume state by the new bars, or rebuild it."""
+    state = previous.volume_state if previous is not None else None
+    start = _carry_from(candles, state.bar_time) if state is not None else None
+    if start is None:
+        bar_time = candles[-1].get("open_time") if candles else None
+        return VolumeState.from_arrays(highs, lows, closes, volumes, bar_time=bar_time)
+    # The state moves to the new snapshot; the previous one keeps its values
+    previous.volume_state = None
+    for j in range(start, len(candles)):
+        state.update(highs[j], lows[j], closes[j], volumes[j], candles[j]["open_time"])
+    return state
+
+
+def _wave_tracker(
+    candles: list[dict], highs: np.ndarray, lows: np.ndarray, previous: IndicatorSnapshot | None
+) -> WaveTracker:
+    """Advance the previous snapshot's wave tracker by the new bars, or rebuild it."""
+    tracker = previous.wave_tracker if previous is not None else None
+    start = _carry_from(candles, tracker.bar_time) if tracker is not None else None
+    if start is None:
+        return WaveTracker.from_series(highs, lows, [c.get("open_time") for c in candles])
+    previous.wave_tracker = None
+    for j in range(start, len(candles)):
+        tracker.update(highs[j], lows[j], candles[j]["open_time"])
+    return tracker
+
+
+def _zone_book(candles: list[dict], previous: IndicatorSnapshot | None) -> ZoneBook:
+    """Advance the previous snapshot's zone book by the new bars, or rebuild it."""
+    book = previous.zones if previous is not None else None
+    start = _carry_from(candles, book.bar_time) if book is not None else None
+    if start is None:
+        return ZoneBook.from_candles(candles)
+    previous.zones = None
+    for candle in candles[start:]:
+        book.update(candle)
+    return book
+
+
+def _build_snapshot(
+    symbol: str,
+    timeframe: str,
+    bar_time: int,
+    candles: list[dict],
+    previous: IndicatorSnapshot | None,
+) -> IndicatorSnapshot:
+    closes = np.array([c["close"] for c in candles], dtype=float)
+    highs = np.array([c["high"] for c in candles], dtype=float)
+    lows = np.array([c["low"] for c in candles], dtype=float)
+    volumes = np.array([c.get("volume", 0.0) for c in candles], dtype=float)
+    volume_state = _volume_state(candles, highs, lows, closes, volumes, previous)
+    wave_tracker = _wave_tracker(candles, highs, lows, previous)
+    zones = _zone_book(candles, previous)
+
+    snapshot = IndicatorSnapshot(
+        symbol=symbol,
+        timeframe=timeframe,
+        bar_time=bar_time,
+        candles=candles,
+        closes=closes,
+        highs=highs,
+        lows=lows,
+        volumes=volumes,
+        rsi=compute_rsi(closes),
+        bollinger=compute_bollinger(closes),
+        support_resistance=detect_support_resistance(highs, lows, closes),
+        order_blocks=zones.summary("order_block"),
+        fvg=zones.summary("fvg"),
+        elliott_wave=wave_tracker.result(),
+        atr=compute_atr(highs, lows, closes) if len(candles) else 0.0,
+        volume=volume_state.values(),
+        volume_state=volume_state,
+        wave_tracker=wave_tracker,
+        zones=zones,
+    )
+    if len(candles) >= MIN_CANDLES:
+        snapshot.events = _detect_events(snapshot, previous)
+    return snapshot
+
+
+def _build_batch(
+    timeframe: str,
+    members: list[tuple[str, list[dict]]],
+    previous: list[IndicatorSnapshot | None],
+) -> list[IndicatorSnapshot]:
+    """Build snapshots for equal-length candle windows with batched indicators."""
+    closes = np.array([[c["close"] for c in candles] for _, candles in members], dtype=float)
+    highs = np.array([[c["high"] for c in candles] for _, candles in members], dtype=float)
+    lows = np.array([[c["low"] for c in candles] for _, candles in members], dtype=float)
+    volumes = np.array([[c.get("volume", 0.0) for c in candles] for _, candles in members], dtype=float)
+
+    rsi = batch_rsi(closes)
+    bollinger = batch_bollinger(closes)
+    atr = batch_atr(highs, lows, closes)
+    _, support_mask = batch_pivots(lows)
+    resistance_mask, _ = batch_pivots(highs)
+
+    snapshots = []
+    for i, (symbol, candles) in enumerate(members):
+        volume_state = _volume_state(candles, highs[i], lows[i], closes[i], volumes[i], previous[i])
+        wave_tracker = _wave_tracker(candles, highs[i], lows[i], previous[i])
+        zones = _zone_book(candles, previous[i])
+        snapshot = IndicatorSnapshot(
+            symbol=symbol.upper(),
+            timeframe=timeframe,
+            bar_time=_bar_time(candles),
+            candles=candles,
+            closes=closes[i],
+            highs=highs[i],
+            lows=lows[i],
+            volumes=volumes[i],
+            rsi=rsi[i],
+            bollinger=bollinger[i],
+            support_resistance=summarize_levels(
+                lows[i][support_mask[i]].tolist(),
+                highs[i][resistance_mask[i]].tolist(),
+                float(closes[i, -1]),
+            ),
+            order_blocks=zones.summary("order_block"),
+            fvg=zones.summary("fvg"),
+            elliott_wave=wave_tracker.result(),
+            atr=float(atr[i]),
+            volume=volume_state.values(),
+            volume_state=volume_state,
+            wave_tracker=wave_tracker,
+            zones=zones,
+        )
+        if len(candles) >= MIN_CANDLES:
+            snapshot.events = _detect_events(snapshot, previous[i])
+        snapshots.append(snapshot)
+    return snapshots
+
+
+def _detect_events(
+    snap: IndicatorSnapshot, previous: IndicatorSnapshot | None
+) -> dict[tuple[str, str], str]:
+    """Derive alert events for the snapshot's closing candle.
+
+    Events fire on the candle where the condition starts (price enters a zone,
+    crosses a level, the wave count reaches 5), not on every candle it holds.
+    """
+    events: dict[tuple[str, str], str] = {}
+    price, prev = float(snap.closes[-1]), float(snap.closes[-2])
+
+    # --- Support / Resistance ---
+    sr = snap.support_resistance
+    for level, label in ((sr.get("nearest_support"), "support"), (sr.get("nearest_resistance"), "resistance")):
+        if level and abs(price - level) <= price * SR_ZONE_PCT and abs(prev - level) > prev * SR_ZONE_PCT:
+            events[("support-resistance", "sr_bounce")] = f"Price entered {label} zone ({price:,.2f} ~ {level:,.2f})"
+            break
+    for level in sr.get("resistances", []):
+        if prev <= level < price:
+            events[("support-resistance", "sr_breakout")] = f"Resistance breakout! Price {price:,.2f} > {level:,.2f}"
+    for level in sr.get("supports", []):
+        if prev >= level > price:
+            events[("support-resistance", "sr_breakout")] = f"Support breakdown! Price {price:,.2f} < {level:,.2f}"
+
+    # --- Order Blocks / Breaker Blocks: zones price entered on this candle ---
+    for zone in snap.zones.entered if snap.zones else []:
+        if zone.kind == "breaker":
+            events[("market-structure", "breaker_block_touch")] = (
+                f"Price entered {zone.side} breaker block ({zone.low:,.2f} - {zone.high:,.2f})"
+            )
+        elif zone.kind == "order_block":
+            events[("market-structure", "order_block_touch")] = (
+                f"Price entered {zone.side} order block zone ({zone.low:,.2f} - {zone.high:,.2f})"
+            )
+
+    # --- Market Structure Break: close through the latest swing pivot ---
+    pivots = snap.elliott_wave.get("pivots", [])
+    last_high = next((p for p in reversed(pivots) if p["type"] == "high"), None)
+    last_low = next((p for p in reversed(pivots) if p["type"] == "low"), None)
+    if last_high and prev <= last_high["price"] < price:
+        events[("market-structure", "msb")] = f"Bullish structure break above {last_high['price']:,.2f}"
+    elif last_low and prev >= last_low["price"] > price:
+        events[("market-structure", "msb")] = f"Bearish structure break below {last_low['price']:,.2f}"
+
+    # --- Elliott Wave: a newly completed wave of the lead degree ---
+    wave = snap.elliott_wave.get("wave_label")
+    prev_wave = previous.elliott_wave.get("wave_label") if previous else None
+    trend = snap.elliott_wave.get("trend", "unknown")
+    if wave != prev_wave:
+        if wave == "5":
+            events[("elliott-wave", "wave_5_complete")] = f"Elliott Wave ({trend}) wave 5 completed"
+        elif wave in ("2", "4", "C"):
+            events[("elliott-wave", "corrective_end")] = f"Elliott Wave ({trend}) corrective wave {wave} ending"
+
+    # Expand aliases so alerts match whichever subtype name they were created with
+    for key, aliases in EVENT_ALIASES.items():
+        if key in events:
+            for alias in aliases:
+                events[(key[0], alias)] = events[key]
+    return events
+
+
+# Global singleton
+indicator_snapshots = IndicatorSnapshotStore()
@@ -0,0 +1,111 @@
+"""IntervalIndex — closed price intervals with ids, queried by overlap.
+
+The interval counterpart of ``ThresholdIndex``: intervals are kept sorted by
+their low edge with a max-of-high segment tree on top, so "which intervals
+contain price p" (or overlap a candle's range) descends only into subtrees
+that can match — O(log n + k). Removal blanks the leaf in O(log n); additions
+mark the index for a rebuild on the next query. No I/O or service imports.
+"""
+
+import bisect
+import math
+
+
+class IntervalIndex:
+    """Closed intervals ``[low, high]`` keyed by id."""
+
+    __slots__ = ("_items", "_dirty", "_stale", "_lows", "_by_low", "_highs", "_by_high", "_pos", "_size", "_max")
+
+    def __init__(self):
+        self._items: dict = {}
+        self._dirty = False
+        self._stale = 0
+        self._lows: list[float] = []
+        self._by_low: list = []
+        self._highs: list[float] = []
+        self._by_high: list = []
+        self._pos: dict = {}
+        self._size = 1
+        self._max: list[float] = [-math.inf, -math.inf]
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, item_id) -> bool:
+        return item_id in self._items
+
+    def add(self, item_id, low: float, high: float):
+        self._items[item_id] = (low, high)
+        self._dirty = True
+
+    def remove(self, item_id) -> bool:
+        if self._items.pop(item_id, None) is None:
+            return False
+        if not self._dirty:
+            node = self._pos.pop(item_id) + self._size
+            self._max[node] = -math.inf
+            node //= 2
+            while node:
+                self._max[node] = max(self._max[2 * node], self._max[2 * node + 1])
+                node //= 2
+            self._stale += 1
+        return True
+
+    def _build(self):
+        by_low = sorted(self._items.items(), key=lambda item: item[1][0])
+        by_high = sorted(self._items.items(), key=lambda item: item[1][1])
+        self._by_low = [item_id for item_id, _ in by_low]
+        self._lows = [low for _, (low, _) in by_low]
+        self._by_high = [item_id for item_id, _ in by_high]
+        self._highs = [high for _, (_, high) in by_high]
+        self._pos = {item_id: i for i, item_id in enumerate(self._by_low)}
+
+        size = 1
+        while size < len(by_low):
+            size *= 2
+        tree = [-math.inf] * (2 * size)
+        for i, (_, (_, high)) in enumerate(by_low):
+            tree[size + i] = high
+        for node in range(size - 1, 0, -1):
+            tree[node] = max(tree[2 * node], tree[2 * node + 1])
+        self._size, self._max = size, tree
+        self._dirty = False
+        self._stale = 0
+
+    def _ensure_built(self):
+        # Removed ids linger in the sorted lists; rebuild once they outnumber live ones
+        if self._dirty or self._stale > len(self._items):
+            self._build()
+
+    def overlapping(self, low: float, high: float) -> list:
+        """Ids of intervals intersecting ``[low, high]``, in order of their low edge."""
+        self._ensure_built()
+        end = bisect.bisect_right(self._lows, high)
+        found = []
+        stack = [(1, 0, self._size)]
+        while stack:
+            node, lo, hi = stack.pop()
+            if lo >= end or self._max[node] < low:
+                continue
+            if hi - lo == 1:
+                found.append(self._by_low[lo])
+                continue
+            mid = (lo + hi) // 2
+            stack.append((2 * node + 1, mid, hi))
+            stack.append((2 * node, lo, mid))
+        return found
+
+    def containing(self, price: float) -> list:
+        return self.overlapping(price, price)
+
+    def above(self, price: float) -> list:
+        """Ids of intervals lying entirely above ``price``."""
+        self._ensure_built()
+        start = bisect.bisect_right(self._lows, price)
+        return [item_id for item_id in self._by_low[start:] if item_id in self._items]
+
+    def below(self, price: float) -> list:
+        """Ids of intervals lying entirely below ``price``."""
+        self._ensure_built()
+        end = bisect.bisect_left(self._highs, price)
+        return [item_id for item_id in self._by_high[:end] if item_id in self._items]
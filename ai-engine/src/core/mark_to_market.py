@@ -0,0 +1,239 @@
+"""Mark-to-market — keeps open positions' current price and unrealized PnL fresh.
+
+Open ``ualgo_position`` rows are held in columnar NumPy arrays (one element per
+position). Each price batch from the shared price snapshot reprices every
+position in one vectorized pass:
+
+    pnl     = side × (price − entry) × quantity
+    pnl_pct = side × (price − entry) / entry × leverage × 100
+
+Rows whose price moved since they were last written are flushed back in one
+bulk ``UPDATE ... FROM unnest(...)`` per chunk on a fixed interval, instead of
+one UPDATE per position per tick. Open positions are reloaded periodically to
+pick up rows opened or closed elsewhere; in-process writers (executor, trigger
+engine) call ``add`` / ``remove`` so they do not wait for the reload.
+"""
+
+import logging
+import time
+from collections.abc import Mapping
+from datetime import datetime, timezone
+
+import numpy as np
+
+from src.services.db import db_pool
+from src.services.queries import queries
+
+logger = logging.getLogger(__name__)
+
+# Rows per bulk UPDATE statement
+FLUSH_CHUNK_SIZE = 1000
+
+queries.register(
+    "positions.open",
+    """SELECT id, symbol, side, entry_price, quantity, leverage, current_price
+       FROM ualgo_position
+       WHERE status = 'open'""",
+)
+queries.register(
+    "positions.mark_batch",
+    """UPDATE ualgo_position AS p
+       SET current_price = t.price,
+           unrealized_pnl = t.pnl,
+           unrealized_pnl_pct = t.pnl_pct
+       FROM unnest(:ids::bigint[], :prices::numeric[], :pnls::numeric[], :pnl_pcts::numeric[])
+            AS t(id, price, pnl, pnl_pct)
+       WHERE p.id = t.id AND p.status = 'open'""",
+)
+
+_FLOAT_COLUMNS = ("side", "entry", "quantity", "leverage", "price", "pnl", "pnl_pct", "written_price")
+
+
+class MarkToMarket:
+    """Columnar store of open positions, repriced in bulk."""
+
+    def __init__(self):
+        self.ids = np.empty(0, dtype=np.int64)
+        self.codes = np.empty(0, dtype=np.int32)     # index into self._symbols
+        self.side = np.empty(0)                      # +1 LONG, -1 SHORT
+        self.entry = np.empty(0)
+        self.quantity = np.empty(0)
+        self.leverage = np.empty(0)
+        self.price = np.empty(0)                     # NaN until first mark
+        self.pnl = np.empty(0)
+        self.pnl_pct = np.empty(0)
+        self.written_price = np.empty(0)             # price last persisted (NaN if never)
+        self._symbols: list[str] = []
+        self._symbol_codes: dict[str, int] = {}
+        self._last_prices: Mapping[str, float] = {}
+        self.loaded_at: float | None = None
+        self.marks = 0
+        self.mark_seconds = 0.0
+        self.rows_written = 0
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def _code(self, symbol: str) -> int:
+        code = self._symbol_codes.get(symbol)
+        if code is None:
+            code = self._symbol_codes[symbol] = len(self._symbols)
+            self._symbols.append(symbol)
+        return code
+
+    def _columns(self, rows: list[Mapping]) -> dict[str, np.ndarray]:
+        return {
+            "ids": np.array([int(r["id"]) for r in rows], dtype=np.int64),
+            "codes": np.array([self._code(r["symbol"].upper()) for r in rows], dtype=np.int32),
+            "side": np.array([1.0 if r["side"] == "LONG" else -1.0 for r in rows]),
+            "entry": np.array([float(r["entry_price"]) for r in rows]),
+            "quantity": np.array([float(r["quantity"]) for r in rows]),
+            "leverage": np.array([float(r.get("leverage") or 1.0) for r in rows]),
+            "price": np.array([
+                float(r["current_price"]) if r.get("current_price") is not None else np.nan for r in rows
+            ]),
+            "pnl": np.zeros(len(rows)),
+            "pnl_pct": np.zeros(len(rows)),
+            "written_price": np.array([
+                float(r["current_price"]) if r.get("current_price") is not None else np.nan for r in rows
+            ]),
+        }
+
+    async def load(self):
+        """Full reload of open positions, keeping in-memory marks of known rows."""
+        rows = [dict(r) for r in await db_pool.fetch_named("positions.open")]
+        known = dict(zip(self.ids.tolist(), zip(self.price.tolist(), self.written_price.tolist())))
+        columns = self._columns(rows)
+        for i, position_id in enumerate(columns["ids"].tolist()):
+            if position_id in known:
+                columns["price"][i], columns["written_price"][i] = known[position_id]
+        for name, values in columns.items():
+            setattr(self, name, values)
+        self._reprice(np.ones(len(self.ids), dtype=bool))
+        self.loaded_at = time.time()
+        if self._last_prices:
+            self.on_prices(self._last_prices)
+        logger.info(f"MarkToMarket loaded {len(self.ids)} open positions")
+
+    def add(self, row: Mapping):
+        """Track a position opened in-process (a ``ualgo_position`` row mapping)."""
+        if int(row["id"]) in set(self.ids.tolist()):
+            return
+        columns = self._columns([row])
+        for name, values in columns.items():
+            setattr(self, name, np.concatenate([getattr(self, name), values]))
+        self._reprice(np.arange(len(self.ids)) == len(self.ids) - 1)
+
+    def remove(self, position_ids: list[int]):
+        """Stop tracking positions closed in-process."""
+        keep = ~np.isin(self.ids, np.asarray(position_ids, dtype=np.int64))
+        for name in ("ids", "codes", *_FLOAT_COLUMNS):
+            setattr(self, name, getattr(self, name)[keep])
+
+    def on_prices(self, prices: Mapping[str, float]) -> int:
+        """Reprice every position whose symbol is in ``prices``. Returns rows changed."""
+        started = time.perf_counter()
+        self._last_prices = prices
+        if not len(self.ids):
+            return 0
+        # One lookup per distinct symbol, then gather per position
+        by_symbol = np.array([prices.get(s, np.nan) for s in self._symbols], dtype=float)
+        new_price = by_symbol[self.codes]
+        changed = ~np.isnan(new_price) & (new_price != self.price)
+        if changed.any():
+            self.price[changed] = new_price[changed]
+            self._reprice(changed)
+        self.marks += 1
+        self.mark_seconds += time.perf_counter() - started
+        return int(changed.sum())
+
+    def _reprice(self, mask: np.ndarray):
+        marked = mask & ~np.isnan(self.price)
+        move = self.side[marked] * (self.price[marked] - self.entry[marked])
+        self.pnl[marked] = move * self.quantity[marked]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            pct = np.where(self.entry[marked] > 0, move / self.entry[marked] * self.leverage[marked] * 100, 0.0)
+        self.pnl_pct[marked] = pct
+
+    def unrealized_pnl(self, symbol: str | None = None) -> float:
+        """Total unrealized PnL across open positions (optionally for one symbol)."""
+        if symbol is None:
+            return float(self.pnl.sum())
+        code = self._symbol_codes.get(symbol.upper())
+        return float(self.pnl[self.codes == code].sum()) if code is not None else 0.0
+
+    def exposure_by_symbol(self, signed: bool = False) -> dict[str, float]:
+        """Open notional per symbol, at the latest mark (entry if unmarked).
+
+        Absolute by default; ``signed=True`` nets longs against shorts.
+        """
+        if not len(self.ids):
+            return {}
+        price = np.where(np.isnan(self.price), self.entry, self.price)
+        notional = self.quantity * price
+        weights = notional * self.side if signed else np.abs(notional)
+        totals = np.bincount(self.codes, weights=weights, minlength=len(self._symbols))
+        return {self._symbols[c]: float(totals[c]) for c in np.flatnonzero(totals)}
+
+    def position(self, position_id: int) -> dict | None:
+        """Current mark of one position."""
+        idx = np.flatnonzero(self.ids == position_id)
+        if not len(idx):
+            return None
+        i = int(idx[0])
+        return {
+            "id": position_id,
+            "symbol": self._symbols[self.codes[i]],
+            "side": "LONG" if self.side[i] > 0 else "SHORT",
+            "entry_price": float(self.entry[i]),
+            "quantity": float(self.quantity[i]),
+            "current_price": None if np.isnan(self.price[i]) else float(self.price[i]),
+            "unrealized_pnl": float(self.pnl[i]),
+            "unrealized_pnl_pct": float(self.pnl_pct[i]),
+        }
+
+    async def flush(self) -> int:
+        """Write rows whose price moved since their last write, in bulk."""
+        dirty = np.flatnonzero(~np.isnan(self.price) & (self.price != self.written_price))
+        written = 0
+        for i in range(0, len(dirty), FLUSH_CHUNK_SIZE):
+            chunk = dirty[i:i + FLUSH_CHUNK_SIZE]
+            ids, prices = self.ids[chunk].tolist(), self.price[chunk].tolist()
+            try:
+                await db_pool.execute_named(
+                    "positions.mark_batch",
+                    ids=ids,
+                    prices=np.round(self.price[chunk], 8).tolist(),
+                    pnls=np.round(self.pnl[chunk], 8).tolist(),
+                    pnl_pcts=np.round(self.pnl_pct[chunk], 4).tolist(),
+                )
+            except Exception as e:
+                logger.error(f"MarkToMarket flush failed ({len(chunk)} positions): {e}")
+                continue
+            # Arrays may have changed while awaiting; match rows by id
+            written_at = dict(zip(ids, prices))
+            rows = np.flatnonzero(np.isin(self.ids, ids))
+            self.written_price[rows] = [written_at[i] for i in self.ids[rows].tolist()]
+            written += len(chunk)
+        self.rows_written += written
+        return written
+
+    def get_stats(self) -> dict:
+        return {
+            "open_positions": len(self.ids),
+            "symbols": len(set(self.codes.tolist())),
+            "unmarked": int(np.isnan(self.price).sum()),
+            "dirty": int((~np.isnan(self.price) & (self.price != self.written_price)).sum()),
+            "unrealized_pnl": round(self.unrealized_pnl(), 8),
+            "marks": self.marks,
+            "avg_mark_us": round(self.mark_seconds / self.marks * 1e6, 2) if self.marks else None,
+            "rows_written": self.rows_written,
+            "loaded_at": (
+                datetime.fromtimestamp(self.loaded_at, tz=timezone.utc).isoformat()
+                if self.loaded_at else None
+            ),
+        }
+
+
+# Global singleton
+mark_to_market = MarkToMarket()
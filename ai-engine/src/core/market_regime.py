@@ -0,0 +1,194 @@
+"""MarketRegime — price-based trend / volatility regime per (symbol, timeframe).
+
+Registered as an ``indicator_snapshots`` listener: every new closed candle is
+folded into that pair's ``RegimeState`` (ADX, realized volatility, Hurst
+estimate) and the regime is re-classified. Only bars newer than the state's
+last bar are fed, so a candle close costs one incremental update; the state is
+rebuilt from the snapshot's candles only on first sight or after a gap.
+
+Readers — the Orchestrator, Risk Sentinel, consensus weight selection — call
+``get(symbol, timeframe)``, a dict lookup.
+
+Classification:
+
+- trend: ``trend_up`` / ``trend_down`` when ADX ≥ ``ADX_TREND`` and the Hurst
+  estimate is not mean-reverting (direction from +DI vs −DI); ``range`` when
+  ADX < ``ADX_RANGE`` and the Hurst estimate is not persistent; otherwise
+  ``transition``
+- volatility: ``high`` / ``low`` when realized volatility is above / below
+  ``HIGH_VOL_RATIO`` / ``LOW_VOL_RATIO`` × its long-run baseline, else ``normal``
+"""
+
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from src.core.indicator_snapshot import IndicatorSnapshot, indicator_snapshots
+from src.indicators.regime import RegimeState
+
+logger = logging.getLogger(__name__)
+
+ADX_TREND = 25.0
+ADX_RANGE = 20.0
+HURST_TREND = 0.55
+HURST_RANGE = 0.45
+HIGH_VOL_RATIO = 1.5
+LOW_VOL_RATIO = 0.67
+
+
+@dataclass(frozen=True)
+class Regime:
+    """Classified regime at one closed candle."""
+    symbol: str
+    timeframe: str
+    bar_time: int
+    trend: str                    # trend_up | trend_down | range | transition
+    volatility: str               # high | normal | low
+    adx: float
+    plus_di: float
+    minus_di: float
+    hurst: float | None
+    realized_vol: float | None
+    vol_ratio: float | None
+
+    @property
+    def label(self) -> str:
+        """Combined label, e.g. ``trend_up_high_vol`` — the consensus weight regime key."""
+        return f"{self.trend}_{self.volatility}_vol"
+
+    def as_dict(self) -> dict:
+        return {
+            "label": self.label,
+            "trend": self.trend,
+            "volatility": self.volatility,
+            "bar_time": self.bar_time,
+            "adx": round(self.adx, 2),
+            "plus_di": round(self.plus_di, 2),
+            "minus_di": round(self.minus_di, 2),
+            "hurst": round(self.hurst, 4) if self.hurst is not None else None,
+            "realized_vol": round(self.realized_vol, 6) if self.realized_vol is not None else None,
+            "vol_ratio": round(self.vol_ratio, 4) if self.vol_ratio is not None else None,
+        }
+
+
+def classify(symbol: str, timeframe: str, state: RegimeState) -> Regime | None:
+    """Regime of a warmed-up state (None while ADX or the Hurst window is filling)."""
+    if not state.ready:
+        return None
+    v = state.values()
+    adx, hurst, vol_ratio = v["adx"], v["hurst"], v["vol_ratio"]
+
+    if adx >= ADX_TREND and (hurst is None or hurst > HURST_RANGE):
+        trend = "trend_up" if v["plus_di"] >= v["minus_di"] else "trend_down"
+    elif adx < ADX_RANGE and (hurst is None or hurst < HURST_TREND):
+        trend = "range"
+    else:
+        trend = "transition"
+
+    if vol_ratio is None:
+        volatility = "normal"
+    elif vol_ratio >= HIGH_VOL_RATIO:
+        volatility = "high"
+    elif vol_ratio <= LOW_VOL_RATIO:
+        volatility = "low"
+    else:
+        volatility = "normal"
+
+    return Regime(
+        symbol=symbol,
+        timeframe=timeframe,
+        bar_time=state.bar_time,
+        trend=trend,
+        volatility=volatility,
+        adx=adx,
+        plus_di=v["plus_di"],
+        minus_di=v["minus_di"],
+        hurst=hurst,
+        realized_vol=v["realized_vol"],
+        vol_ratio=vol_ratio,
+    )
+
+
+class MarketRegimeStore:
+    """Regime state and latest classification per (symbol, timeframe)."""
+
+    def __init__(self, max_entries: int = 2048):
+        self.max_entries = max_entries
+        self._states: OrderedDict[tuple[str, str], RegimeState] = OrderedDict()
+        self._regimes: dict[tuple[str, str], Regime] = {}
+        self.incremental_bars = 0
+        self.rebuilds = 0
+        self.update_seconds = 0.0
+        self.updates = 0
+
+    def get(self, symbol: str, timeframe: str) -> Regime | None:
+        return self._regimes.get((symbol.upper(), timeframe))
+
+    def on_snapshot(self, snapshot: IndicatorSnapshot):
+        self.update(snapshot.symbol, snapshot.timeframe, snapshot.candles)
+
+    def update(self, symbol: str, timeframe: str, candles: list[dict]) -> Regime | None:
+        """Fold closed ``candles`` (oldest first) newer than the state's last bar."""
+        if not candles:
+            return self.get(symbol, timeframe)
+        start = time.perf_counter()
+        key = (symbol.upper(), timeframe)
+        state = self._states.get(key)
+
+        # Incremental only when the window overlaps the state's last bar
+        if (
+            state is not None
+            and state.bar_time is not None
+            and "open_time" in candles[0]
+            and candles[0]["open_time"] <= state.bar_time
+        ):
+            new = [c for c in candles if c["open_time"] > state.bar_time]
+            self.incremental_bars += len(new)
+        else:
+            state = RegimeState()
+            new = candles
+            self.rebuilds += 1
+
+        for c in new:
+            state.update(float(c["high"]), float(c["low"]), float(c["close"]), c.get("open_time"))
+        if state.bar_time is None:
+            # Ad-hoc lists without open_time are keyed by length, as in the snapshot store
+            state.bar_time = len(candles)
+
+        self._states[key] = state
+        self._states.move_to_end(key)
+        while len(self._states) > self.max_entries:
+            evicted, _ = self._states.popitem(last=False)
+            self._regimes.pop(evicted, None)
+
+        regime = classify(key[0], timeframe, state)
+        previous = self._regimes.get(key)
+        if regime is None:
+            self._regimes.pop(key, None)
+        else:
+            self._regimes[key] = regime
+            if previous is not None and previous.label != regime.label:
+                logger.info(f"MarketRegime {key[0]} {timeframe}: {previous.label} → {regime.label}")
+        self.updates += 1
+        self.update_seconds += time.perf_counter() - start
+        return regime
+
+    def get_stats(self) -> dict:
+        labels: dict[str, int] = {}
+        for regime in self._regimes.values():
+            labels[regime.label] = labels.get(regime.label, 0) + 1
+        return {
+            "tracked": len(self._states),
+            "classified": len(self._regimes),
+            "updates": self.updates,
+            "rebuilds": self.rebuilds,
+            "incremental_bars": self.incremental_bars,
+            "avg_update_ms": round(self.update_seconds / self.updates * 1000, 3) if self.updates else None,
+            "labels": labels,
+        }
+
+
+# Global singleton
+market_regime = MarketRegimeStore()
+indicator_snapshots.on_snapshot(market_regime.on_snapshot)
@@ -4,6 +4,22 @@ import json
 from datetime import datetime, timezone
 
 from src.services.db import db_pool
+from src.services.queries import queries
+
+queries.register(
+    "memory.recall",
+    """SELECT id, memory_type, symbol, content, importance, created_at
+       FROM ualgo_agent_memory
+       WHERE agent_name = :agent_name
+         AND (expires_at IS NULL OR expires_at > NOW())
+         {filters}
+       ORDER BY importance DESC, created_at DESC
+       LIMIT :limit""",
+    optional={
+        "memory_type": "AND memory_type = :memory_type",
+        "symbol": "AND symbol = :symbol",
+    },
+)
 
 
 class MemoryCore:
@@ -45,29 +61,13 @@ class MemoryCore:
         limit: int = 10,
     ) -> list[dict]:
         """Recall recent memories, optionally filtered by type and symbol."""
-        query = """
-            SELECT id, memory_type, symbol, content, importance, created_at
-            FROM ualgo_agent_memory
-            WHERE agent_name = $1
-              AND (expires_at IS NULL OR expires_at > NOW())
-        """
-        params: list = [self.agent_name]
-        idx = 2
-
-        if memory_type:
-            query += f" AND memory_type = ${idx}"
-            params.append(memory_type)
-            idx += 1
-
-        if symbol:
-            query += f" AND symbol = ${idx}"
-            params.append(symbol)
-            idx += 1
-
-        query += f" ORDER BY importance DESC, created_at DESC LIMIT ${idx}"
-        params.append(limit)
-
-        rows = await db_pool.fetch(query, *params)
+        rows = await db_pool.fetch_named(
+            "memory.recall",
+            agent_name=self.agent_name,
+            memory_type=memory_type or None,
+            symbol=symbol or None,
+            limit=limit,
+        )
         return [
             {
                 "id": r["id"],
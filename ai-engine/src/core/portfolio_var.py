@@ -0,0 +1,193 @@
+"""Portfolio VaR — loss distribution of the open positions, in milliseconds.
+
+A return matrix (bars × symbols, simple returns of ``U2ALGO_VAR_TIMEFRAME``
+closes) is built once per closed bar for the symbols with open exposure.
+Everything that depends only on that matrix is precomputed with it:
+
+- ``historical`` — overlapping compounded returns over ``var_horizon_bars``
+- ``monte_carlo`` — mean and covariance scaled to the horizon, its Cholesky
+  factor, and ``var_simulations`` correlated return scenarios
+
+Evaluating a book is then one matrix-vector product,
+``losses = −scenarios @ exposure``, plus a partial sort for the quantile, so it
+runs inside the 5-second risk loop. VaR is the ``var_confidence`` loss quantile;
+CVaR (expected shortfall) is the mean loss at or beyond it.
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import Iterable, Mapping
+
+import numpy as np
+
+from src.config import settings
+from src.core.indicator_snapshot import closed_candles
+from src.services.binance_ws import bar_open_time, get_recent_candles
+
+logger = logging.getLogger(__name__)
+
+VAR_METHODS = ("monte_carlo", "historical")
+
+# Horizon returns a symbol needs beyond the horizon itself to be covered
+MIN_SCENARIOS = 100
+
+
+def _factor(cov: np.ndarray) -> np.ndarray:
+    """Cholesky factor of ``cov``; eigen-decomposition when it is not positive definite."""
+    try:
+        return np.linalg.cholesky(cov)
+    except np.linalg.LinAlgError:
+        values, vectors = np.linalg.eigh(cov)
+        return vectors * np.sqrt(np.clip(values, 0.0, None))
+
+
+def _tail(losses: np.ndarray, confidence: float) -> tuple[float, float]:
+    """(VaR, CVaR) of a loss sample at ``confidence``."""
+    k = min(max(int(np.ceil(confidence * len(losses))) - 1, 0), len(losses) - 1)
+    var = float(np.partition(losses, k)[k])
+    return var, float(losses[losses >= var].mean())
+
+
+class PortfolioVaR:
+    """Precomputed return scenarios, evaluated against the live book."""
+
+    def __init__(self, seed: int | None = None):
+        self.symbols: list[str] = []
+        self._index: dict[str, int] = {}
+        self._missing: set[str] = set()      # symbols without enough history this bar
+        self._scenarios: dict[str, np.ndarray] = {}
+        self._rng = np.random.default_rng(seed)
+        self.built_bar: int | None = None
+        self.built_at: float | None = None
+        self.horizon_bars = 0
+        self.builds = 0
+        self.build_seconds = 0.0
+        self.evaluations = 0
+        self.eval_seconds = 0.0
+
+    def needs_build(self, symbols: Iterable[str]) -> bool:
+        """True on a new bar, or when a symbol is neither covered nor known to lack history."""
+        if self.built_bar != bar_open_time(time.time(), settings.var_timeframe):
+            return True
+        return any(s not in self._index and s not in self._missing for s in symbols)
+
+    async def refresh(self, symbols: Iterable[str]) -> bool:
+        """Rebuild the scenarios for ``symbols`` when due. Returns True if rebuilt."""
+        symbols = sorted({s.upper() for s in symbols})
+        if not symbols or not self.needs_build(symbols):
+            return False
+        candles = await asyncio.gather(*(
+            get_recent_candles(s, settings.var_timeframe, limit=settings.var_lookback_bars)
+            for s in symbols
+        ))
+        self.build(dict(zip(symbols, candles)))
+        return True
+
+    def build(self, candles_by_symbol: Mapping[str, list[dict]]):
+        """Align closes on open time and precompute both scenario sets."""
+        started = time.perf_counter()
+        horizon = max(settings.var_horizon_bars, 1)
+        need = horizon + MIN_SCENARIOS
+
+        series = {
+            symbol: {c["open_time"]: c["close"] for c in closed_candles(candles)}
+            for symbol, candles in candles_by_symbol.items()
+        }
+        series = {s: closes for s, closes in series.items() if len(closes) > need}
+        times: list = []
+        while series:
+            times = sorted(set.intersection(*(set(closes) for closes in series.values())))
+            if len(times) > need:
+                break
+            # A late listing shortens the common window — drop the shortest series
+            del series[min(series, key=lambda s: len(series[s]))]
+
+        self.symbols = sorted(series)
+        self._index = {s: i for i, s in enumerate(self.symbols)}
+        self._missing = set(candles_by_symbol) - series.keys()
+        self.built_bar = bar_open_time(time.time(), settings.var_timeframe)
+        self.built_at = time.time()
+        self.horizon_bars = horizon
+        self._scenarios = {}
+        if self.symbols:
+            closes = np.array([[series[s][t] for s in self.symbols] for t in times], dtype=float)
+            returns = closes[1:] / closes[:-1] - 1.0
+
+            # --- Historical: overlapping compounded horizon returns ---
+            growth = np.vstack([np.zeros(len(self.symbols)), np.cumsum(np.log1p(returns), axis=0)])
+            self._scenarios["historical"] = np.expm1(growth[horizon:] - growth[:-horizon])
+
+            # --- Monte Carlo: correlated normal draws scaled to the horizon ---
+            mean = returns.mean(axis=0) * horizon
+            cov = np.atleast_2d(np.cov(returns, rowvar=False)) * horizon
+            draws = self._rng.standard_normal((settings.var_simulations, len(self.symbols)))
+            self._scenarios["monte_carlo"] = mean + draws @ _factor(cov).T
+
+        self.builds += 1
+        self.build_seconds += time.perf_counter() - started
+        if self._missing:
+            logger.warning(f"PortfolioVaR: insufficient history for {sorted(self._missing)}")
+        logger.info(f"PortfolioVaR built {len(self.symbols)} symbols × {len(times)} bars")
+
+    def evaluate(
+        self,
+        exposure: Mapping[str, float],
+        equity: float,
+        method: str | None = None,
+    ) -> dict:
+        """VaR / CVaR of a book given signed notional per symbol (long > 0)."""
+        method = method or settings.var_method
+        if method not in VAR_METHODS:
+            raise ValueError(f"Unknown VaR method '{method}' (expected one of {VAR_METHODS})")
+        started = time.perf_counter()
+
+        weights = np.zeros(len(self.symbols))
+        uncovered: list[str] = []
+        for symbol, notional in exposure.items():
+            i = self._index.get(symbol)
+            if i is None:
+                if notional:
+                    uncovered.append(symbol)
+            else:
+                weights[i] += notional
+
+        scenarios = self._scenarios.get(method)
+        var = cvar = 0.0
+        if scenarios is not None and weights.any():
+            var, cvar = _tail(-(scenarios @ weights), settings.var_confidence)
+            var, cvar = max(var, 0.0), max(cvar, 0.0)
+
+        elapsed = time.perf_counter() - started
+        self.evaluations += 1
+        self.eval_seconds += elapsed
+        return {
+            "method": method,
+            "confidence": settings.var_confidence,
+            "timeframe": settings.var_timeframe,
+            "horizon_bars": self.horizon_bars,
+            "scenarios": len(scenarios) if scenarios is not None else 0,
+            "var": round(var, 2),
+            "cvar": round(cvar, 2),
+            "var_pct": var / equity if equity > 0 else 0.0,
+            "cvar_pct": cvar / equity if equity > 0 else 0.0,
+            "gross_exposure": round(float(sum(abs(v) for v in exposure.values())), 2),
+            "uncovered_symbols": sorted(uncovered),
+            "eval_ms": round(elapsed * 1000, 3),
+        }
+
+    def get_stats(self) -> dict:
+        return {
+            "method": settings.var_method,
+            "symbols": len(self.symbols),
+            "missing_history": sorted(self._missing),
+            "built_at": self.built_at,
+            "builds": self.builds,
+            "avg_build_ms": round(self.build_seconds / self.builds * 1000, 3) if self.builds else 0.0,
+            "evaluations": self.evaluations,
+            "avg_eval_ms": round(self.eval_seconds / self.evaluations * 1000, 3) if self.evaluations else 0.0,
+        }
+
+
+# Global singleton
+portfolio_var = PortfolioVaR()
@@ -0,0 +1,180 @@
+"""Position sizing — vectorized quantities for every candidate signal of a cycle.
+
+All candidates are sized in one pass over NumPy arrays (entry, stop, ATR),
+with one of three methods:
+
+- ``fixed_fractional`` — risk ``max_risk_per_trade`` of equity between entry
+  and stop (per candidate: a strategy's own limit, else the setting): ``qty = equity × risk / |entry − stop|``
+- ``volatility_target`` — one ATR move costs ``sizing_vol_target`` of equity:
+  ``qty = equity × vol_target / ATR``
+- ``risk_parity`` — ``sizing_cycle_allocation`` of equity split across the
+  cycle's candidates in inverse proportion to their ATR/price volatility, so
+  each contributes the same volatility
+
+Every method is then capped, in order, by per-trade risk (``max_risk_per_trade``
+to the stop), per-symbol concentration (existing + new notional <=
+``max_single_asset_ratio`` of equity, applied cumulatively when several
+candidates share a symbol) and gross exposure (``sizing_gross_exposure`` ×
+equity across open and new positions).
+"""
+
+from collections.abc import Mapping
+
+import numpy as np
+
+from src.config import settings
+
+SIZING_METHODS = ("fixed_fractional", "volatility_target", "risk_parity")
+
+# Stop distance (in ATRs) assumed when a candidate has no stop — matches the
+# Technical Analyst's ATR_MULTIPLIER_SL
+DEFAULT_STOP_ATRS = 1.5
+
+
+def size_positions(
+    symbols: list[str],
+    entry: np.ndarray,
+    stop: np.ndarray,
+    atr: np.ndarray,
+    equity: float,
+    method: str = "fixed_fractional",
+    exposure: Mapping[str, float] | None = None,
+    risk_per_trade: float | np.ndarray = 0.02,
+    vol_target: float = 0.005,
+    cycle_allocation: float = 0.10,
+    max_asset_ratio: float = 0.25,
+    gross_exposure: float = 1.0,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Quantities for N candidates. Missing values are NaN.
+
+    Args:
+        symbols: Symbol per candidate.
+        entry, stop, atr: Float arrays of length N (``stop`` NaN → ``DEFAULT_STOP_ATRS`` × ATR).
+        equity: Portfolio value.
+        method: One of ``SIZING_METHODS``.
+        exposure: Open notional per symbol (absolute).
+        risk_per_trade: Fraction of equity risked to the stop — a scalar, or one
+            value per candidate.
+
+    Returns:
+        (quantity, cap_code) — ``cap_code`` 0 uncapped, 1 per-trade risk,
+        2 concentration, 3 gross exposure, 4 unsizeable (no price / volatility).
+    """
+    if method not in SIZING_METHODS:
+        raise ValueError(f"Unknown sizing method '{method}' (expected one of {SIZING_METHODS})")
+    n = len(symbols)
+    if n == 0:
+        return np.zeros(0), np.zeros(0, dtype=np.int8)
+    exposure = exposure or {}
+    with np.errstate(divide="ignore", invalid="ignore"):
+        stop_dist = np.abs(entry - stop)
+        stop_dist = np.where(np.isnan(stop_dist) | (stop_dist <= 0), DEFAULT_STOP_ATRS * atr, stop_dist)
+
+        if method == "fixed_fractional":
+            qty = equity * risk_per_trade / stop_dist
+        elif method == "volatility_target":
+            qty = equity * vol_target / atr
+        else:
+            inv_vol = entry / atr                      # 1 / (ATR / price)
+            valid = np.isfinite(inv_vol) & (inv_vol > 0)
+            weights = np.where(valid, inv_vol, 0.0)
+            total = weights.sum()
+            notional = equity * cycle_allocation * weights / total if total > 0 else np.zeros(n)
+            qty = notional / entry
+
+    cap = np.zeros(n, dtype=np.int8)
+    unsizeable = ~np.isfinite(qty) | (qty <= 0) | ~(entry > 0)
+    qty = np.where(unsizeable, 0.0, qty)
+    cap[unsizeable] = 4
+
+    # Per-trade risk to the stop
+    with np.errstate(divide="ignore", invalid="ignore"):
+        risk_cap = np.where(stop_dist > 0, equity * risk_per_trade / stop_dist, np.inf)
+    capped = qty > risk_cap
+    qty = np.where(capped, risk_cap, qty)
+    cap[capped] = 1
+
+    # Concentration: cumulative notional per symbol, in candidate order
+    notional = qty * entry
+    codes, inverse = np.unique(np.asarray(symbols), return_inverse=True)
+    prior = np.zeros(n)                              # new notional of earlier same-symbol candidates
+    for code in np.flatnonzero(np.bincount(inverse) > 1):
+        idx = np.flatnonzero(inverse == code)
+        prior[idx] = np.cumsum(notional[idx]) - notional[idx]
+    existing = np.array([exposure.get(s, 0.0) for s in codes])[inverse]
+    room = np.maximum(equity * max_asset_ratio - existing - prior, 0.0)
+    capped = notional > room
+    notional = np.where(capped, room, notional)
+    cap[capped & (cap == 0)] = 2
+
+    # Gross exposure across open + new positions: scale all new notional down
+    gross_room = max(equity * gross_exposure - sum(exposure.values()), 0.0)
+    total_new = notional.sum()
+    if total_new > gross_room:
+        notional = notional * (gross_room / total_new)
+        cap[(cap == 0) & (notional > 0)] = 3
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        qty = np.where(entry > 0, notional / entry, 0.0)
+    return np.round(qty, 8), cap
+
+
+_CAP_NAMES = {0: None, 1: "per_trade_risk", 2: "concentration", 3: "gross_exposure", 4: "unsizeable"}
+
+
+class PositionSizer:
+    """Settings-driven wrapper around ``size_positions`` for signal dicts."""
+
+    def size(
+        self,
+        candidates: list[dict],
+        equity: float,
+        exposure: Mapping[str, float] | None = None,
+        method: str | None = None,
+    ) -> list[dict]:
+        """Size candidates carrying ``symbol``, ``entry_price``, ``stop_loss`` and ``atr``.
+
+        A candidate may carry its strategy's ``max_risk_per_trade``; the
+        ``U2ALGO_MAX_RISK_PER_TRADE`` setting applies otherwise.
+
+        Returns one dict per candidate: quantity, notional, risk_amount,
+        max_risk_per_trade, method, capped_by.
+        """
+        if not candidates:
+            return []
+        method = method or settings.sizing_method
+
+        def column(key: str) -> np.ndarray:
+            return np.array([c.get(key) if c.get(key) is not None else np.nan for c in candidates], dtype=float)
+
+        symbols = [c["symbol"].upper() for c in candidates]
+        entry, stop, atr = column("entry_price"), column("stop_loss"), column("atr")
+        risk_limit = column("max_risk_per_trade")
+        risk_limit = np.where(np.isnan(risk_limit), settings.max_risk_per_trade, risk_limit)
+        qty, cap = size_positions(
+            symbols, entry, stop, atr, equity,
+            method=method,
+            exposure=exposure,
+            risk_per_trade=risk_limit,
+            vol_target=settings.sizing_vol_target,
+            cycle_allocation=settings.sizing_cycle_allocation,
+            max_asset_ratio=settings.max_single_asset_ratio,
+            gross_exposure=settings.sizing_gross_exposure,
+        )
+        stop_dist = np.where(np.isnan(stop), DEFAULT_STOP_ATRS * atr, np.abs(entry - stop))
+        return [
+            {
+                "symbol": symbols[i],
+                "quantity": float(qty[i]),
+                "notional": round(float(np.nan_to_num(qty[i] * entry[i])), 8),
+                "risk_amount": round(float(np.nan_to_num(qty[i] * stop_dist[i])), 8),
+                "max_risk_per_trade": float(risk_limit[i]),
+                "method": method,
+                "capped_by": _CAP_NAMES[int(cap[i])],
+            }
+            for i in range(len(candidates))
+        ]
+
+
+# Global singleton
+position_sizer = PositionSizer()
@@ -0,0 +1,42 @@
+"""ThresholdIndex — sorted price levels with a parallel list of ids.
+
+Shared by the engines that must find every level crossed by a price move in
+O(log n + hits): user price alerts, SL/TP exits and resting paper orders.
+No I/O or service imports, so it can be used offline (replays, CI).
+"""
+
+import bisect
+
+
+class ThresholdIndex:
+    """Sorted price levels with a parallel list of ids (alerts, positions, orders)."""
+
+    __slots__ = ("prices", "ids")
+
+    def __init__(self):
+        self.prices: list[float] = []
+        self.ids: list = []
+
+    def __len__(self) -> int:
+        return len(self.prices)
+
+    def add(self, price: float, item_id):
+        i = bisect.bisect_right(self.prices, price)
+        self.prices.insert(i, price)
+        self.ids.insert(i, item_id)
+
+    def remove(self, price: float, item_id) -> bool:
+        i = bisect.bisect_left(self.prices, price)
+        while i < len(self.prices) and self.prices[i] == price:
+            if self.ids[i] == item_id:
+                del self.prices[i]
+                del self.ids[i]
+                return True
+            i += 1
+        return False
+
+    def between(self, low: float, high: float, low_inclusive: bool, high_inclusive: bool) -> list:
+        """Ids whose price lies between low and high."""
+        lo = (bisect.bisect_left if low_inclusive else bisect.bisect_right)(self.prices, low)
+        hi = (bisect.bisect_right if high_inclusive else bisect.bisect_left)(self.prices, high)
+        return self.ids[lo:hi] if hi > lo else []
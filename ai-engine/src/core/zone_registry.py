@@ -0,0 +1,190 @@
+"""ZoneBook — order block and fair value gap lifecycle per (symbol, timeframe).
+
+Zones are detected as candles close (``order_block_at`` / ``fvg_at``) and then
+followed for as long as they matter:
+
+- created: the confirming candle closed
+- touched: a later candle's range entered the zone
+- mitigated: an order block traded to its midpoint, or a gap filled completely
+- invalidated: a close beyond the far edge (below a bullish zone, above a
+  bearish one)
+
+Mitigated gaps and invalidated zones leave the book. An invalidated order block
+flips into a breaker on the opposite side, which is itself retired when price
+closes back through it.
+
+Live zones sit in one ``IntervalIndex`` per side, so each candle costs
+O(log n + k) — the zones its range touches and the ones its close
+invalidates — and ``containing(price)`` / ``near(price, pct)`` serve the
+Technical Analyst and ``order_block_touch`` alerts without rescanning
+history. A book is carried from one indicator snapshot to the next and only
+advanced by the new bars.
+"""
+
+from collections import OrderedDict, deque
+from dataclasses import asdict, dataclass
+
+from src.core.interval_index import IntervalIndex
+from src.indicators.smc import fvg_at, order_block_at
+
+# Live zones per book; the oldest are expired beyond this
+MAX_ACTIVE_ZONES = 300
+
+# Retired zones kept for inspection
+HISTORY_SIZE = 200
+
+# Live zones reported per (kind, side) in the snapshot summary
+SUMMARY_ZONES = 5
+
+FLIPPED = {"bullish": "bearish", "bearish": "bullish"}
+
+
+@dataclass(slots=True)
+class Zone:
+    id: int
+    kind: str                       # order_block | fvg | breaker
+    side: str                       # bullish (support) | bearish (resistance)
+    low: float
+    high: float
+    created_at: int | None          # open time of the confirming candle
+    strength: float = 0.0           # OB body ratio, or gap size for an FVG
+    status: str = "active"          # active | touched | mitigated | invalidated | expired
+    touches: int = 0                # separate visits into the zone
+    touched_at: int | None = None
+    mitigated_at: int | None = None
+    retired_at: int | None = None
+
+    @property
+    def midpoint(self) -> float:
+        return (self.low + self.high) / 2
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+class ZoneBook:
+    """Live and recently retired zones of one (symbol, timeframe)."""
+
+    def __init__(self):
+        self.bar_time: int | None = None
+        self.bars = 0
+        self._next_id = 1
+        self._zones: OrderedDict[int, Zone] = OrderedDict()
+        self._index = {"bullish": IntervalIndex(), "bearish": IntervalIndex()}
+        self._inside: set[int] = set()
+        self._recent: deque[dict] = deque(maxlen=3)
+        self.history: deque[Zone] = deque(maxlen=HISTORY_SIZE)
+        self.entered: list[Zone] = []     # zones price entered on the last bar
+        self.counts = {"created": 0, "touched": 0, "mitigated": 0, "invalidated": 0, "expired": 0}
+
+    @classmethod
+    def from_candles(cls, candles: list[dict]) -> "ZoneBook":
+        book = cls()
+        for candle in candles:
+            book.update(candle)
+        return book
+
+    def update(self, candle: dict):
+        """Fold one closed candle: touches, mitigation, invalidation, then new zones."""
+        self.bars += 1
+        bar_time = candle.get("open_time")
+        self.bar_time = bar_time
+        high, low, close = candle["high"], candle["low"], candle["close"]
+
+        # --- Touches and mitigation ---
+        inside: set[int] = set()
+        self.entered = []
+        for side, index in self._index.items():
+            for zone_id in index.overlapping(low, high):
+                zone = self._zones[zone_id]
+                inside.add(zone_id)
+                if zone_id not in self._inside:
+                    # A revisit counts once, however many bars it stays inside
+                    self.entered.append(zone)
+                    zone.touches += 1
+                if zone.touched_at is None:
+                    zone.touched_at = bar_time
+                    zone.status = "touched"
+                    self.counts["touched"] += 1
+                if zone.mitigated_at is None and self._mitigated(zone, high, low):
+                    zone.mitigated_at = bar_time
+                    zone.status = "mitigated"
+                    self.counts["mitigated"] += 1
+                    if zone.kind == "fvg":
+                        self._retire(zone, bar_time)
+        self._inside = inside
+
+        # --- Invalidation: close beyond the far edge ---
+        for zone_id in self._index["bullish"].above(close) + self._index["bearish"].below(close):
+            zone = self._zones.get(zone_id)
+            if zone is None:
+                continue
+            zone.status = "invalidated"
+            self.counts["invalidated"] += 1
+            self._retire(zone, bar_time)
+            if zone.kind == "order_block":
+                self._add("breaker", FLIPPED[zone.side], zone.low, zone.high, bar_time, zone.strength)
+
+        # --- New zones confirmed by this candle ---
+        self._recent.append(candle)
+        if len(self._recent) >= 2:
+            ob = order_block_at(self._recent[-2], candle)
+            if ob:
+                self._add("order_block", ob["side"], ob["low"], ob["high"], bar_time, ob["strength"])
+        if len(self._recent) == 3:
+            gap = fvg_at(self._recent[0], candle)
+            if gap:
+                self._add("fvg", gap["side"], gap["bottom"], gap["top"], bar_time, gap["gap_size"])
+
+        while len(self._zones) > MAX_ACTIVE_ZONES:
+            oldest = next(iter(self._zones.values()))
+            oldest.status = "expired"
+            self.counts["expired"] += 1
+            self._retire(oldest, bar_time)
+
+    @staticmethod
+    def _mitigated(zone: Zone, high: float, low: float) -> bool:
+        if zone.kind == "fvg":
+            return low <= zone.low if zone.side == "bullish" else high >= zone.high
+        return low <= zone.midpoint if zone.side == "bullish" else high >= zone.midpoint
+
+    def _add(self, kind: str, side: str, low: float, high: float, bar_time: int | None, strength: float):
+        zone = Zone(self._next_id, kind, side, low, high, bar_time, strength)
+        self._next_id += 1
+        self._zones[zone.id] = zone
+        self._index[side].add(zone.id, low, high)
+        self.counts["created"] += 1
+
+    def _retire(self, zone: Zone, bar_time: int | None):
+        self._zones.pop(zone.id, None)
+        self._index[zone.side].remove(zone.id)
+        self._inside.discard(zone.id)
+        zone.retired_at = bar_time
+        self.history.append(zone)
+
+    def zones(self, kind: str | None = None, side: str | None = None) -> list[Zone]:
+        """Live zones, oldest first."""
+        return [
+            z for z in self._zones.values()
+            if (kind is None or z.kind == kind) and (side is None or z.side == side)
+        ]
+
+    def containing(self, price: float) -> list[Zone]:
+        """Live zones whose range contains ``price``."""
+        return [self._zones[i] for index in self._index.values() for i in index.containing(price)]
+
+    def near(self, price: float, pct: float) -> list[Zone]:
+        """Live zones within ``pct`` of ``price``."""
+        low, high = price * (1 - pct), price * (1 + pct)
+        return [self._zones[i] for index in self._index.values() for i in index.overlapping(low, high)]
+
+    def summary(self, kind: str) -> dict:
+        """Newest live zones of ``kind`` per side, as dicts (oldest first)."""
+        result: dict[str, list[dict]] = {"bullish": [], "bearish": []}
+        for zone in reversed(self._zones.values()):
+            if zone.kind == kind and len(result[zone.side]) < SUMMARY_ZONES:
+                result[zone.side].append(zone.as_dict())
+        return {side: zones[::-1] for side, zones in result.items()}
+
+    def get_stats(self) -> dict:
+        return {"live": len(self._zones), "bars": self.bars, **self.counts}
@@ -0,0 +1,275 @@
+"""Matching core — local order book simulator for paper trading and replays.
+
+Orders are matched against a last-trade price stream, one symbol book at a
+time. Resting orders live in four sorted level indexes per symbol, so a price
+update finds every order it fills or triggers in O(log n + k):
+
+| Index          | Fires when         |
+|----------------|--------------------|
+| ``buy_limit``  | price <= limit     |
+| ``sell_limit`` | price >= limit     |
+| ``buy_stop``   | price >= stop      |
+| ``sell_stop``  | price <= stop      |
+
+Fill rules:
+
+- MARKET orders (and STOP orders once triggered) take liquidity at the
+  reference price moved against them by ``SlippageModel``; taker fee.
+- LIMIT orders that are marketable on submit fill like a market order, capped
+  at the limit. Resting LIMIT orders fill at their limit price; maker fee.
+
+The module is pure Python with no I/O or service imports, so replays and CI
+runs need neither a database nor network access.
+"""
+
+import itertools
+import time
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass, field
+from enum import Enum
+
+from src.core.threshold_index import ThresholdIndex
+
+
+class OrderSide(str, Enum):
+    BUY = "BUY"
+    SELL = "SELL"
+
+
+class OrderType(str, Enum):
+    MARKET = "MARKET"
+    LIMIT = "LIMIT"
+    STOP = "STOP"
+
+
+class OrderStatus(str, Enum):
+    OPEN = "open"
+    FILLED = "filled"
+    CANCELED = "canceled"
+
+
+@dataclass
+class Order:
+    symbol: str
+    side: OrderSide
+    type: OrderType
+    quantity: float
+    limit_price: float | None = None
+    stop_price: float | None = None
+    tag: dict = field(default_factory=dict)
+    id: int = 0
+    status: OrderStatus = OrderStatus.OPEN
+    created_at: float = 0.0
+
+
+@dataclass
+class Fill:
+    order: Order
+    price: float
+    quantity: float
+    fee: float
+    slippage: float        # fraction of the reference price paid over it (>= 0)
+    liquidity: str         # "maker" | "taker"
+    ts: float
+
+    @property
+    def notional(self) -> float:
+        return self.price * self.quantity
+
+
+@dataclass(frozen=True)
+class SlippageModel:
+    """Half-spread plus linear market impact, both in basis points.
+
+    ``impact_bps`` is charged per ``impact_notional`` of order notional, so a
+    larger order moves its own fill price further.
+    """
+    half_spread_bps: float = 1.0
+    impact_bps: float = 0.0
+    impact_notional: float = 100_000.0
+
+    def fill_price(self, side: OrderSide, reference: float, quantity: float) -> float:
+        bps = self.half_spread_bps + self.impact_bps * (reference * quantity) / self.impact_notional
+        sign = 1 if side == OrderSide.BUY else -1
+        return reference * (1 + sign * bps / 10_000)
+
+
+@dataclass(frozen=True)
+class FeeModel:
+    """Maker / taker fees in basis points of fill notional."""
+    maker_bps: float = 10.0
+    taker_bps: float = 10.0
+
+    def fee(self, notional: float, liquidity: str) -> float:
+        return notional * (self.maker_bps if liquidity == "maker" else self.taker_bps) / 10_000
+
+
+class _Book:
+    __slots__ = ("buy_limit", "sell_limit", "buy_stop", "sell_stop", "pending_market", "last_price")
+
+    def __init__(self):
+        self.buy_limit = ThresholdIndex()
+        self.sell_limit = ThresholdIndex()
+        self.buy_stop = ThresholdIndex()
+        self.sell_stop = ThresholdIndex()
+        self.pending_market: list[int] = []     # market orders waiting for a first price
+        self.last_price: float | None = None
+
+
+class MatchingEngine:
+    """Per-symbol order books matched against last-trade prices."""
+
+    def __init__(self, slippage: SlippageModel | None = None, fees: FeeModel | None = None):
+        self.slippage = slippage or SlippageModel()
+        self.fees = fees or FeeModel()
+        self._books: dict[str, _Book] = {}
+        self._orders: dict[int, Order] = {}
+        self._ids = itertools.count(1)
+        self.orders_submitted = 0
+        self.fills = 0
+
+    def _book(self, symbol: str) -> _Book:
+        book = self._books.get(symbol)
+        if book is None:
+            book = self._books[symbol] = _Book()
+        return book
+
+    @staticmethod
+    def _index_for(book: _Book, order: Order) -> tuple[ThresholdIndex, float]:
+        if order.type == OrderType.LIMIT:
+            return (book.buy_limit if order.side == OrderSide.BUY else book.sell_limit), order.limit_price
+        return (book.buy_stop if order.side == OrderSide.BUY else book.sell_stop), order.stop_price
+
+    def last_price(self, symbol: str) -> float | None:
+        book = self._books.get(symbol.upper())
+        return book.last_price if book else None
+
+    def open_orders(self, symbol: str | None = None) -> list[Order]:
+        return [o for o in self._orders.values() if symbol is None or o.symbol == symbol.upper()]
+
+    def submit(self, order: Order, ts: float | None = None) -> list[Fill]:
+        """Accept an order; returns its fill if it executes immediately."""
+        ts = ts if ts is not None else time.time()
+        order.symbol = order.symbol.upper()
+        order.id = order.id or next(self._ids)
+        order.created_at = order.created_at or ts
+        if order.quantity <= 0:
+            raise ValueError(f"Order quantity must be positive, got {order.quantity}")
+        if order.type == OrderType.LIMIT and order.limit_price is None:
+            raise ValueError("LIMIT order requires limit_price")
+        if order.type == OrderType.STOP and order.stop_price is None:
+            raise ValueError("STOP order requires stop_price")
+        self.orders_submitted += 1
+
+        book = self._book(order.symbol)
+        price = book.last_price
+        if price is not None and self._executable(order, price):
+            return [self._take(order, price, ts)]
+        if order.type == OrderType.MARKET:
+            book.pending_market.append(order.id)
+        else:
+            index, level = self._index_for(book, order)
+            index.add(level, order.id)
+        self._orders[order.id] = order
+        return []
+
+    @staticmethod
+    def _executable(order: Order, price: float) -> bool:
+        if order.type == OrderType.MARKET:
+            return True
+        if order.type == OrderType.LIMIT:
+            return price <= order.limit_price if order.side == OrderSide.BUY else price >= order.limit_price
+        return price >= order.stop_price if order.side == OrderSide.BUY else price <= order.stop_price
+
+    def cancel(self, order_id: int) -> bool:
+        order = self._orders.pop(order_id, None)
+        if order is None:
+            return False
+        book = self._books[order.symbol]
+        if order.type == OrderType.MARKET:
+            book.pending_market.remove(order.id)
+        else:
+            index, level = self._index_for(book, order)
+            index.remove(level, order.id)
+        order.status = OrderStatus.CANCELED
+        return True
+
+    def on_price(self, symbol: str, price: float, ts: float | None = None) -> list[Fill]:
+        """Advance one symbol's book to ``price``; returns the fills it caused."""
+        ts = ts if ts is not None else time.time()
+        book = self._book(symbol.upper())
+        book.last_price = price
+        fills: list[Fill] = []
+        if not self._orders:
+            return fills
+
+        if book.pending_market:
+            pending, book.pending_market = book.pending_market, []
+            fills += [self._take(self._orders[order_id], price, ts) for order_id in pending]
+
+        triggered = (
+            ("maker", book.buy_limit, book.buy_limit.between(price, float("inf"), True, True)),
+            ("maker", book.sell_limit, book.sell_limit.between(float("-inf"), price, True, True)),
+            ("taker", book.buy_stop, book.buy_stop.between(float("-inf"), price, True, True)),
+            ("taker", book.sell_stop, book.sell_stop.between(price, float("inf"), True, True)),
+        )
+        for liquidity, index, order_ids in triggered:
+            for order_id in order_ids:
+                order = self._orders[order_id]
+                index.remove(order.limit_price if order.type == OrderType.LIMIT else order.stop_price, order_id)
+                if liquidity == "maker":
+                    fills.append(self._make(order, ts))
+                else:
+                    fills.append(self._take(order, price, ts))
+        return fills
+
+    def on_prices(self, prices: Mapping[str, float], ts: float | None = None) -> list[Fill]:
+        """Advance every book in ``prices``. Only symbols with resting orders do work."""
+        ts = ts if ts is not None else time.time()
+        prices = {symbol.upper(): price for symbol, price in prices.items()}
+        fills: list[Fill] = []
+        for symbol, book in self._books.items():
+            price = prices.get(symbol)
+            if price is not None:
+                fills += self.on_price(symbol, price, ts)
+        for symbol in prices.keys() - self._books.keys():
+            self._book(symbol).last_price = prices[symbol]
+        return fills
+
+    def replay(self, ticks: Iterable[tuple[float, str, float]]) -> list[Fill]:
+        """Feed ``(ts, symbol, price)`` ticks in order; returns every fill."""
+        fills: list[Fill] = []
+        for ts, symbol, price in ticks:
+            fills += self.on_price(symbol, price, ts)
+        return fills
+
+    def _take(self, order: Order, reference: float, ts: float) -> Fill:
+        price = self.slippage.fill_price(order.side, reference, order.quantity)
+        if order.type == OrderType.LIMIT:
+            price = min(price, order.limit_price) if order.side == OrderSide.BUY else max(price, order.limit_price)
+        return self._fill(order, price, reference, "taker", ts)
+
+    def _make(self, order: Order, ts: float) -> Fill:
+        return self._fill(order, order.limit_price, order.limit_price, "maker", ts)
+
+    def _fill(self, order: Order, price: float, reference: float, liquidity: str, ts: float) -> Fill:
+        order.status = OrderStatus.FILLED
+        self._orders.pop(order.id, None)
+        self.fills += 1
+        return Fill(
+            order=order,
+            price=price,
+            quantity=order.quantity,
+            fee=self.fees.fee(price * order.quantity, liquidity),
+            slippage=abs(price - reference) / reference if reference else 0.0,
+            liquidity=liquidity,
+            ts=ts,
+        )
+
+    def get_stats(self) -> dict:
+        return {
+            "books": len(self._books),
+            "open_orders": len(self._orders),
+            "orders_submitted": self.orders_submitted,
+            "fills": self.fills,
+        }
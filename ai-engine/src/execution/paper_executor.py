@@ -0,0 +1,201 @@
+"""Paper executor — turns approved signals into simulated fills and open positions.
+
+Each approved signal becomes one entry order on the local ``MatchingEngine``
+(MARKET by default, or LIMIT at the signal's entry price with
+``U2ALGO_PAPER_ENTRY_ORDER_TYPE=limit``). Books are advanced by the shared price
+snapshot on every price refresh. Fills are persisted in bulk — one statement
+per flush inserts the ``ualgo_trade`` fill records, the ``ualgo_position`` rows
+(carrying the signal's SL/TP) and marks the signals ``executed`` — and new
+positions are handed to mark-to-market and the exit trigger engine.
+
+Unfilled LIMIT entries are cancelled after ``U2ALGO_PAPER_ORDER_TTL_SECONDS``
+and their signals marked ``expired``.
+"""
+
+import logging
+import time
+
+from src.config import settings
+from src.core.exit_triggers import exit_triggers
+from src.core.mark_to_market import mark_to_market
+from src.core.message_bus import message_bus
+from src.execution.matching import (
+    FeeModel,
+    Fill,
+    MatchingEngine,
+    Order,
+    OrderSide,
+    OrderType,
+    SlippageModel,
+)
+from src.models.signal import Signal, SignalDirection
+from src.services.db import db_pool
+from src.services.prices import price_service
+from src.services.queries import queries
+
+logger = logging.getLogger(__name__)
+
+queries.register(
+    "paper.open_positions",
+    """WITH fills AS (
+           SELECT * FROM unnest(
+               :signal_ids::bigint[], :symbols::text[], :sides::text[], :prices::numeric[],
+               :quantities::numeric[], :slippages::numeric[], :fees::numeric[],
+               :stop_losses::numeric[], :take_profits::numeric[], :strategy_ids::text[]
+           ) AS t(signal_id, symbol, side, price, quantity, slippage, fee, stop_loss, take_profit, strategy_id)
+       ),
+       trades AS (
+           INSERT INTO ualgo_trade (signal_id, symbol, side, entry_price, quantity, slippage, fee)
+           SELECT signal_id, symbol, CASE WHEN side = 'LONG' THEN 'BUY' ELSE 'SELL' END,
+                  price, quantity, slippage, fee
+           FROM fills
+       ),
+       executed AS (
+           UPDATE ualgo_signal SET status = 'executed'
+           WHERE id IN (SELECT signal_id FROM fills)
+       )
+       INSERT INTO ualgo_position
+           (symbol, side, entry_price, current_price, quantity, stop_loss, take_profit, strategy_id, signal_id)
+       SELECT symbol, side, price, price, quantity, stop_loss, take_profit, strategy_id, signal_id
+       FROM fills
+       RETURNING id, symbol, side, entry_price, quantity, leverage, current_price,
+                 stop_loss, take_profit, strategy_id, signal_id""",
+)
+queries.register(
+    "paper.expire_signals",
+    """UPDATE ualgo_signal SET status = 'expired'
+       WHERE id = ANY(:ids::bigint[]) AND status = 'approved'""",
+)
+
+
+class PaperExecutor:
+    """Simulated execution of approved signals against the live price snapshot."""
+
+    def __init__(self):
+        self.engine = MatchingEngine(
+            slippage=SlippageModel(
+                half_spread_bps=settings.paper_half_spread_bps,
+                impact_bps=settings.paper_impact_bps,
+            ),
+            fees=FeeModel(
+                maker_bps=settings.paper_maker_fee_bps,
+                taker_bps=settings.paper_taker_fee_bps,
+            ),
+        )
+        self._fills: list[Fill] = []
+        self._expired: list[int] = []     # signal ids of cancelled entries
+        self.positions_opened = 0
+        self.orders_expired = 0
+        self.fees_paid = 0.0
+
+    async def submit_signal(self, signal: Signal, quantity: float) -> Order | None:
+        """Place the entry order for an approved signal; fills are persisted immediately."""
+        if signal.direction == SignalDirection.NEUTRAL or quantity <= 0:
+            return None
+        symbol = signal.symbol.upper()
+        if self.engine.last_price(symbol) is None:
+            # Seed the book so a market entry can fill without waiting a refresh
+            seed = price_service.get(symbol) or signal.entry_price
+            if seed:
+                self.engine.on_price(symbol, seed)
+
+        use_limit = settings.paper_entry_order_type == "limit" and signal.entry_price
+        order = Order(
+            symbol=symbol,
+            side=OrderSide.BUY if signal.direction == SignalDirection.LONG else OrderSide.SELL,
+            type=OrderType.LIMIT if use_limit else OrderType.MARKET,
+            quantity=quantity,
+            limit_price=signal.entry_price if use_limit else None,
+            tag={
+                "signal_id": signal.id,
+                "stop_loss": signal.stop_loss,
+                "take_profit": signal.take_profit,
+                "strategy_id": signal.strategy_id,
+            },
+        )
+        self._fills += self.engine.submit(order)
+        await self.flush()
+        return order
+
+    def on_prices(self, prices) -> int:
+        """Advance every book to the latest prices and expire stale entries."""
+        fills = self.engine.on_prices(prices)
+        self._fills += fills
+
+        cutoff = time.time() - settings.paper_order_ttl_seconds
+        for order in self.engine.open_orders():
+            if order.created_at < cutoff and self.engine.cancel(order.id):
+                self._expired.append(order.tag.get("signal_id"))
+        return len(fills)
+
+    async def flush(self) -> int:
+        """Persist queued fills as trades + positions in one statement."""
+        if self._expired:
+            expired, self._expired = [i for i in self._expired if i], []
+            self.orders_expired += len(expired)
+            if expired:
+                try:
+                    await db_pool.execute_named("paper.expire_signals", ids=expired)
+                except Exception as e:
+                    logger.error(f"PaperExecutor expiry failed: {e}")
+
+        if not self._fills:
+            return 0
+        fills, self._fills = self._fills, []
+        try:
+            rows = await db_pool.fetch_named(
+                "paper.open_positions",
+                signal_ids=[f.order.tag.get("signal_id") for f in fills],
+                symbols=[f.order.symbol for f in fills],
+                sides=["LONG" if f.order.side == OrderSide.BUY else "SHORT" for f in fills],
+                prices=[round(f.price, 8) for f in fills],
+                quantities=[f.quantity for f in fills],
+                slippages=[round(f.slippage, 8) for f in fills],
+                fees=[round(f.fee, 8) for f in fills],
+                stop_losses=[f.order.tag.get("stop_loss") for f in fills],
+                take_profits=[f.order.tag.get("take_profit") for f in fills],
+                strategy_ids=[f.order.tag.get("strategy_id") or "default" for f in fills],
+            )
+        except Exception as e:
+            logger.error(f"PaperExecutor fill persist failed ({len(fills)} fills): {e}")
+            self._fills = fills + self._fills
+            return 0
+
+        fill_by_signal = {f.order.tag.get("signal_id"): f for f in fills}
+        for row in rows:
+            fill = fill_by_signal[row["signal_id"]]
+            mark_to_market.add(row)
+            exit_triggers.add(row)
+            self.fees_paid += fill.fee
+            await message_bus.broadcast(
+                sender="paper_executor",
+                topic="position.opened",
+                payload={
+                    "position_id": row["id"],
+                    "signal_id": row["signal_id"],
+                    "symbol": row["symbol"],
+                    "side": row["side"],
+                    "entry_price": float(row["entry_price"]),
+                    "quantity": float(row["quantity"]),
+                    "fee": round(fill.fee, 8),
+                    "slippage": round(fill.slippage, 8),
+                    "liquidity": fill.liquidity,
+                },
+            )
+        self.positions_opened += len(rows)
+        logger.info(f"PaperExecutor opened {len(rows)} positions")
+        return len(rows)
+
+    def get_stats(self) -> dict:
+        return {
+            **self.engine.get_stats(),
+            "entry_order_type": settings.paper_entry_order_type,
+            "queued_fills": len(self._fills),
+            "positions_opened": self.positions_opened,
+            "orders_expired": self.orders_expired,
+            "fees_paid": round(self.fees_paid, 8),
+        }
+
+
+# Global singleton
+paper_executor = PaperExecutor()
@@ -0,0 +1,23 @@
+"""ATR (Average True Range) indicator."""
+
+import numpy as np
+
+
+def compute_atr(
+    highs: np.ndarray, lows: np.ndarray, closes: np.ndarray, period: int = 14
+) -> float:
+    """Compute Average True Range over the last ``period`` candles.
+
+    Falls back to the mean high-low range when there is not enough history.
+    """
+    if len(highs) < period + 1:
+        return float(np.mean(highs - lows))
+
+    tr = np.maximum(
+        highs[1:] - lows[1:],
+        np.maximum(
+            np.abs(highs[1:] - closes[:-1]),
+            np.abs(lows[1:] - closes[:-1]),
+        ),
+    )
+    return float(np.mean(tr[-period:]))
@@ -1,84 +1,236 @@
-"""Elliott Wave detection — simplified wave counting."""
+"""Elliott Wave — incremental multi-degree wave tracking.
 
-import numpy as np
+Each degree is a zigzag with its own reversal threshold (``DEGREES``): a swing
+high is confirmed once price falls ``threshold`` below it, a swing low once
+price rises ``threshold`` above it. Confirmed pivots feed that degree's wave
+count, validated as each wave completes:
+
+- wave 2 never retraces beyond the start of wave 1
+- wave 3 travels beyond the end of wave 1
+- wave 4 never enters wave 1's price territory
+- wave 3 is never the shortest of waves 1, 3 and 5
+- wave B never exceeds the end of wave 5; wave C travels beyond the end of A
+
+A broken rule restarts the count with the latest move as a new wave 1. After
+C, the next count starts from C's end.
 
+``WaveTracker.update`` costs O(1) per candle for every degree and keeps the
+labelled structure precomputed, so reads are O(1) however long the history.
+Degrees are nested: a lower-degree impulse is ``aligned`` when it runs in the
+direction of the higher-degree wave in progress.
+"""
+
+from collections import deque
+
+import numpy as np
 
-def detect_elliott_wave(closes: np.ndarray, min_wave_pct: float = 0.02) -> dict:
-    """Detect Elliott Wave patterns using pivot-based wave counting.
-
-    A simplified approach:
-    1. Find local pivots (swing highs and lows)
-    2. Count alternating waves
-    3. Determine current wave position
-
-    Returns:
-        dict with 'wave_count', 'pivots', 'trend', 'current_wave_type'
-    """
-    if len(closes) < 20:
-        return {"wave_count": 0, "pivots": [], "trend": "unknown", "current_wave_type": None}
-
-    # Find pivots with a lookback window
-    pivots = _find_pivots(closes, lookback=5)
-
-    if len(pivots) < 3:
-        return {"wave_count": 0, "pivots": pivots, "trend": "unknown", "current_wave_type": None}
-
-    # Count waves: alternating higher/lower pivots
-    waves = []
-    for i in range(1, len(pivots)):
-        prev = pivots[i - 1]
-        curr = pivots[i]
-        move_pct = abs(curr["price"] - prev["price"]) / prev["price"]
-
-        if move_pct >= min_wave_pct:
-            wave_type = "impulse" if curr["type"] != prev["type"] else "correction"
-            waves.append({
-                "from_price": prev["price"],
-                "to_price": curr["price"],
-                "type": wave_type,
-                "move_pct": round(move_pct, 4),
-            })
-
-    # Current wave count (1-5 for impulse, A-B-C for correction)
-    wave_count = len(waves) % 8  # Simplified: 5 impulse + 3 correction = 8
-    if wave_count > 5:
-        wave_count = wave_count - 5  # Correction phase (1=A, 2=B, 3=C)
-
-    # Determine trend
-    if len(pivots) >= 2:
-        trend = "bullish" if pivots[-1]["price"] > pivots[-2]["price"] else "bearish"
-    else:
-        trend = "unknown"
-
-    return {
-        "wave_count": wave_count,
-        "total_waves_detected": len(waves),
-        "pivots": pivots[-10:],
-        "trend": trend,
-        "current_wave_type": "impulse" if wave_count <= 5 else "correction",
-    }
-
-
-def _find_pivots(closes: np.ndarray, lookback: int = 5) -> list[dict]:
-    """Find swing highs and lows in the price series."""
-    pivots = []
-
-    for i in range(lookback, len(closes) - lookback):
-        window = closes[i - lookback : i + lookback + 1]
-
-        # Swing high
-        if closes[i] == np.max(window):
-            pivots.append({
-                "index": i,
-                "price": float(closes[i]),
-                "type": "high",
-            })
-        # Swing low
-        elif closes[i] == np.min(window):
-            pivots.append({
-                "index": i,
-                "price": float(closes[i]),
-                "type": "low",
-            })
-
-    return pivots
+# (name, reversal threshold) from the finest degree to the coarsest
+DEGREES: tuple[tuple[str, float], ...] = (
+    ("minor", 0.02),
+    ("intermediate", 0.05),
+    ("primary", 0.12),
+)
+
+IMPULSE_WAVES = ("1", "2", "3", "4", "5")
+CORRECTIVE_WAVES = ("A", "B", "C")
+WAVE_SEQUENCE = IMPULSE_WAVES + CORRECTIVE_WAVES
+
+# Waves that move with the count's trend; the others move against it
+WITH_TREND = ("1", "3", "5", "B")
+
+# Confirmed pivots kept per degree
+MAX_PIVOTS = 1000
+
+# Pivots included in the flat result
+RECENT_PIVOTS = 10
+
+
+class _Degree:
+    """Zigzag pivots and the wave count at one reversal threshold."""
+
+    def __init__(self, name: str, threshold: float):
+        self.name = name
+        self.threshold = threshold
+        self.pivots: deque[dict] = deque(maxlen=MAX_PIVOTS)
+        self.direction = 0                 # +1 up-leg, −1 down-leg, 0 before the first swing
+        self.extreme: dict | None = None   # unconfirmed pivot of the current leg
+        self._high: dict | None = None     # range seen before the first swing
+        self._low: dict | None = None
+        self.count: list[dict] = []        # count origin followed by the end of each wave
+        self.trend = 0                     # +1 bullish count, −1 bearish
+        self.cycles = 0
+        self.invalidations = 0
+        self.structure = self._structure()
+
+    def update(self, high: float, low: float, bar_time: int | None):
+        if self.direction == 0:
+            new_high = self._high is None or high > self._high["price"]
+            if new_high:
+                self._high = {"price": high, "type": "high", "bar_time": bar_time}
+            if self._low is None or low < self._low["price"]:
+                self._low = {"price": low, "type": "low", "bar_time": bar_time}
+            if self._high["price"] >= self._low["price"] * (1 + self.threshold):
+                # The extreme set on this bar is the unconfirmed one; the other is the first pivot
+                if new_high:
+                    self.direction, self.extreme = 1, self._high
+                    self._confirm(self._low)
+                else:
+                    self.direction, self.extreme = -1, self._low
+                    self._confirm(self._high)
+            return
+
+        if self.direction > 0:
+            if high > self.extreme["price"]:
+                self.extreme = {"price": high, "type": "high", "bar_time": bar_time}
+            elif low <= self.extreme["price"] * (1 - self.threshold):
+                self._confirm(self.extreme)
+                self.direction, self.extreme = -1, {"price": low, "type": "low", "bar_time": bar_time}
+        else:
+            if low < self.extreme["price"]:
+                self.extreme = {"price": low, "type": "low", "bar_time": bar_time}
+            elif high >= self.extreme["price"] * (1 + self.threshold):
+                self._confirm(self.extreme)
+                self.direction, self.extreme = 1, {"price": high, "type": "high", "bar_time": bar_time}
+
+    def _confirm(self, pivot: dict):
+        self.pivots.append(pivot)
+        if len(self.count) == len(WAVE_SEQUENCE) + 1:
+            # A-B-C complete: the next count starts at the end of C
+            self.count = [self.count[-1]]
+        self.count.append(pivot)
+        if len(self.count) == 2:
+            self.trend = 1 if pivot["price"] > self.count[0]["price"] else -1
+        elif len(self.count) > 2 and not self._valid():
+            self.invalidations += 1
+            self.count = self.count[-2:]
+            self.trend = 1 if pivot["price"] > self.count[0]["price"] else -1
+        elif len(self.count) == len(WAVE_SEQUENCE) + 1:
+            self.cycles += 1
+        self.structure = self._structure()
+
+    def _valid(self) -> bool:
+        """Check the rule for the wave that just completed."""
+        # Prices signed so that the count's trend is always upward
+        p = [c["price"] * self.trend for c in self.count]
+        wave = WAVE_SEQUENCE[len(p) - 2]
+        if wave == "2":
+            return p[2] > p[0]
+        if wave == "3":
+            return p[3] > p[1]
+        if wave == "4":
+            return p[4] > p[1]
+        if wave == "5":
+            w1, w3, w5 = p[1] - p[0], p[3] - p[2], p[5] - p[4]
+            return not (w3 < w1 and w3 < w5)
+        if wave == "B":
+            return p[7] < p[5]
+        if wave == "C":
+            return p[8] < p[6]
+        return True
+
+    @property
+    def completed(self) -> str | None:
+        """Label of the last completed wave of the current count."""
+        return WAVE_SEQUENCE[len(self.count) - 2] if len(self.count) >= 2 else None
+
+    @property
+    def in_progress(self) -> str | None:
+        n = len(self.count) - 1
+        if n < 0:
+            return None
+        return WAVE_SEQUENCE[n] if n < len(WAVE_SEQUENCE) else WAVE_SEQUENCE[0]
+
+    @property
+    def leg_direction(self) -> int:
+        """Direction of the wave in progress (0 when the count has no trend yet)."""
+        if not self.trend or len(self.count) == len(WAVE_SEQUENCE) + 1:
+            return 0
+        return self.trend if self.in_progress in WITH_TREND else -self.trend
+
+    def _structure(self) -> dict:
+        completed = self.completed
+        waves = [
+            {
+                "label": WAVE_SEQUENCE[i],
+                "from_price": start["price"],
+                "to_price": end["price"],
+                "from_time": start["bar_time"],
+                "to_time": end["bar_time"],
+            }
+            for i, (start, end) in enumerate(zip(self.count, self.count[1:]))
+        ]
+        return {
+            "degree": self.name,
+            "threshold": self.threshold,
+            "trend": {1: "bullish", -1: "bearish"}.get(self.trend, "unknown"),
+            "completed_wave": completed,
+            "in_progress": self.in_progress,
+            "phase": "correction" if completed in CORRECTIVE_WAVES else "impulse" if completed else None,
+            "waves": waves,
+            "pivots_confirmed": len(self.pivots),
+            "cycles": self.cycles,
+            "invalidations": self.invalidations,
+        }
+
+
+class WaveTracker:
+    """Wave structure of one (symbol, timeframe) across all degrees."""
+
+    def __init__(self, degrees: tuple[tuple[str, float], ...] = DEGREES):
+        self.degrees = [_Degree(name, threshold) for name, threshold in degrees]
+        self.bar_time: int | None = None
+        self.bars = 0
+        self._result: dict | None = None
+
+    @classmethod
+    def from_series(
+        cls, highs: np.ndarray, lows: np.ndarray, bar_times: list[int | None] | None = None
+    ) -> "WaveTracker":
+        tracker = cls()
+        times = bar_times if bar_times is not None else range(len(highs))
+        for high, low, bar_time in zip(highs.tolist(), lows.tolist(), times):
+            tracker.update(high, low, bar_time)
+        return tracker
+
+    def update(self, high: float, low: float, bar_time: int | None = None):
+        """Fold one closed candle into every degree."""
+        self.bars += 1
+        self.bar_time = bar_time
+        for degree in self.degrees:
+            before = degree.structure
+            degree.update(high, low, bar_time)
+            if degree.structure is not before:
+                self._result = None
+
+    def result(self) -> dict:
+        """Labelled structure, led by the finest degree with a count."""
+        if self._result is None:
+            self._result = self._build_result()
+        return self._result
+
+    def _build_result(self) -> dict:
+        lead = next((d for d in self.degrees if d.count), self.degrees[0])
+        completed = lead.completed
+
+        # Nested waves: the lead count should run with the next degree's wave in progress
+        higher = next((d for d in self.degrees[self.degrees.index(lead) + 1:] if d.leg_direction), None)
+        aligned = None
+        if higher is not None and lead.trend:
+            aligned = lead.trend == higher.leg_direction
+
+        return {
+            "wave_count": int(completed) if completed in IMPULSE_WAVES else 0,
+            "wave_label": completed,
+            "trend": lead.structure["trend"],
+            "current_wave_type": lead.structure["phase"],
+            "degree": lead.name,
+            "aligned": aligned,
+            "total_waves_detected": max(len(lead.pivots) - 1, 0),
+            "pivots": list(lead.pivots)[-RECENT_PIVOTS:],
+            "degrees": {d.name: d.structure for d in self.degrees},
+        }
+
+
+def detect_elliott_wave(highs: np.ndarray, lows: np.ndarray | None = None) -> dict:
+    """One-off wave structure of a series (pass ``highs`` alone for a close series)."""
+    return WaveTracker.from_series(highs, highs if lows is None else lows).result()
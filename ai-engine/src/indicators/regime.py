@@ -0,0 +1,138 @@
+"""Regime statistics — ADX, realized volatility and a variance-ratio Hurst estimate.
+
+``RegimeState`` is fed one closed candle at a time. Wilder's ADX and the
+long-run volatility baseline are recursive, so they are carried forward in
+O(1) per bar; realized volatility and the Hurst estimate are computed with
+NumPy over the rolling window of log closes when the state is read.
+
+The Hurst estimate comes from the variance ratio of ``HURST_LAG``-bar to 1-bar
+log returns, ``VR ≈ q^(2H − 1)``: H > 0.5 means returns persist (trending),
+H < 0.5 means they revert (ranging).
+"""
+
+import math
+from collections import deque
+
+import numpy as np
+
+ADX_PERIOD = 14
+
+# Bars of returns in the realized-volatility window
+VOL_WINDOW = 24
+
+# Span (bars) of the EWMA variance used as the volatility baseline
+VOL_BASELINE_SPAN = 240
+
+# Returns in the Hurst window, and the long-return lag of the variance ratio
+HURST_WINDOW = 100
+HURST_LAG = 4
+
+
+def hurst_exponent(log_closes: np.ndarray, lag: int = HURST_LAG) -> float | None:
+    """Variance-ratio Hurst estimate of a log-price series (None if too short or flat)."""
+    if len(log_closes) < 4 * lag:
+        return None
+    short = np.diff(log_closes)
+    long = log_closes[lag:] - log_closes[:-lag]
+    short_var = short.var()
+    if short_var <= 0:
+        return None
+    ratio = long.var() / (lag * short_var)
+    if ratio <= 0:
+        return 0.0
+    return float(np.clip(0.5 + 0.5 * math.log(ratio) / math.log(lag), 0.0, 1.0))
+
+
+def realized_volatility(log_closes: np.ndarray, window: int = VOL_WINDOW) -> float | None:
+    """Standard deviation of the last ``window`` one-bar log returns."""
+    returns = np.diff(log_closes[-(window + 1):])
+    return float(returns.std()) if len(returns) >= 2 else None
+
+
+class RegimeState:
+    """Incremental regime statistics for one (symbol, timeframe)."""
+
+    def __init__(self, period: int = ADX_PERIOD):
+        self.period = period
+        self.bars = 0
+        self.bar_time: int | None = None
+        self.log_closes: deque[float] = deque(maxlen=HURST_WINDOW + 1)
+        self._prev: tuple[float, float, float] | None = None   # high, low, close
+        self._tr = self._plus_dm = self._minus_dm = 0.0
+        self._dx_seed: list[float] = []
+        self.adx: float | None = None
+        self.plus_di = self.minus_di = 0.0
+        self._returns = 0
+        self._baseline_var = 0.0
+
+    def update(self, high: float, low: float, close: float, bar_time: int | None = None):
+        """Fold one closed candle into the state."""
+        self.bars += 1
+        self.bar_time = bar_time
+        if close > 0:
+            log_close = math.log(close)
+            if self.log_closes:
+                ret = log_close - self.log_closes[-1]
+                self._returns += 1
+                # Running mean until the span is filled, EWMA after
+                alpha = max(2.0 / (VOL_BASELINE_SPAN + 1), 1.0 / self._returns)
+                self._baseline_var += alpha * (ret * ret - self._baseline_var)
+            self.log_closes.append(log_close)
+
+        if self._prev is None:
+            self._prev = (high, low, close)
+            return
+        prev_high, prev_low, prev_close = self._prev
+        self._prev = (high, low, close)
+
+        tr = max(high - low, abs(high - prev_close), abs(low - prev_close))
+        up, down = high - prev_high, prev_low - low
+        plus_dm = up if up > down and up > 0 else 0.0
+        minus_dm = down if down > up and down > 0 else 0.0
+
+        n = self.period
+        moves = self.bars - 1
+        if moves <= n:
+            # Seed: plain sums over the first ``period`` moves
+            self._tr += tr
+            self._plus_dm += plus_dm
+            self._minus_dm += minus_dm
+            if moves < n:
+                return
+        else:
+            self._tr += tr - self._tr / n
+            self._plus_dm += plus_dm - self._plus_dm / n
+            self._minus_dm += minus_dm - self._minus_dm / n
+
+        if self._tr <= 0:
+            return
+        self.plus_di = 100.0 * self._plus_dm / self._tr
+        self.minus_di = 100.0 * self._minus_dm / self._tr
+        di_sum = self.plus_di + self.minus_di
+        dx = 100.0 * abs(self.plus_di - self.minus_di) / di_sum if di_sum > 0 else 0.0
+        if self.adx is not None:
+            self.adx = (self.adx * (n - 1) + dx) / n
+        else:
+            self._dx_seed.append(dx)
+            if len(self._dx_seed) == n:
+                self.adx = sum(self._dx_seed) / n
+                self._dx_seed.clear()
+
+    @property
+    def ready(self) -> bool:
+        return self.adx is not None and len(self.log_closes) == self.log_closes.maxlen
+
+    def values(self) -> dict:
+        """Current ADX / DI, realized and baseline volatility, and Hurst estimate."""
+        log_closes = np.fromiter(self.log_closes, dtype=np.float64, count=len(self.log_closes))
+        realized = realized_volatility(log_closes)
+        baseline = math.sqrt(self._baseline_var) if self._baseline_var else None
+        return {
+            "adx": self.adx,
+            "plus_di": self.plus_di,
+            "minus_di": self.minus_di,
+            "realized_vol": realized,
+            "baseline_vol": baseline,
+            "vol_ratio": realized / baseline if realized is not None and baseline else None,
+            "hurst": hurst_exponent(log_closes),
+        }
@@ -1,4 +1,45 @@
-"""Smart Money Concepts — Order Blocks and Fair Value Gaps (FVG)."""
+"""Smart Money Concepts — Order Blocks and Fair Value Gaps (FVG).
+
+``order_block_at`` and ``fvg_at`` test a single candle position, so the zone
+registry (``src/core/zone_registry.py``) can detect zones as candles close;
+``detect_order_blocks`` / ``detect_fvg`` scan a whole window.
+"""
+
+# Body of the confirming candle relative to the order-block candle
+OB_BODY_RATIO = 1.5
+
+
+def order_block_at(curr: dict, nxt: dict) -> dict | None:
+    """Order block formed by ``curr`` and confirmed by ``nxt``, or None.
+
+    - Bullish OB: bearish candle followed by a bullish one with a body ``OB_BODY_RATIO``× larger
+    - Bearish OB: bullish candle followed by a bearish one with a body ``OB_BODY_RATIO``× larger
+    """
+    curr_body = curr["close"] - curr["open"]
+    nxt_body = nxt["close"] - nxt["open"]
+    if abs(nxt_body) <= abs(curr_body) * OB_BODY_RATIO:
+        return None
+    if curr_body < 0 < nxt_body:
+        side = "bullish"
+    elif curr_body > 0 > nxt_body:
+        side = "bearish"
+    else:
+        return None
+    return {
+        "side": side,
+        "high": curr["high"],
+        "low": curr["low"],
+        "strength": abs(nxt_body) / abs(curr_body) if abs(curr_body) > 0 else 0,
+    }
+
+
+def fvg_at(c1: dict, c3: dict) -> dict | None:
+    """Fair value gap between candles 1 and 3 of a three-candle sequence, or None."""
+    if c3["low"] > c1["high"]:
+        return {"side": "bullish", "top": c3["low"], "bottom": c1["high"], "gap_size": c3["low"] - c1["high"]}
+    if c3["high"] < c1["low"]:
+        return {"side": "bearish", "top": c1["low"], "bottom": c3["high"], "gap_size": c1["low"] - c3["high"]}
+    return None
 
 
 def detect_order_blocks(candles: list[dict], lookback: int = 50) -> dict:
@@ -19,31 +60,10 @@ def detect_order_blocks(candles: list[dict], lookback: int = 50) -> dict:
     recent = candles[-lookback:] if len(candles) > lookback else candles
 
     for i in range(1, len(recent) - 1):
-        prev = recent[i - 1]
-        curr = recent[i]
-        nxt = recent[i + 1]
-
-        prev_body = prev["close"] - prev["open"]
-        curr_body = curr["close"] - curr["open"]
-        nxt_body = nxt["close"] - nxt["open"]
-
-        # Bullish OB: bearish candle followed by strong bullish move
-        if curr_body < 0 and nxt_body > 0 and abs(nxt_body) > abs(curr_body) * 1.5:
-            bullish_obs.append({
-                "high": curr["high"],
-                "low": curr["low"],
-                "index": i,
-                "strength": abs(nxt_body) / abs(curr_body) if abs(curr_body) > 0 else 0,
-            })
-
-        # Bearish OB: bullish candle followed by strong bearish move
-        if curr_body > 0 and nxt_body < 0 and abs(nxt_body) > abs(curr_body) * 1.5:
-            bearish_obs.append({
-                "high": curr["high"],
-                "low": curr["low"],
-                "index": i,
-                "strength": abs(nxt_body) / abs(curr_body) if abs(curr_body) > 0 else 0,
-            })
+        ob = order_block_at(recent[i], recent[i + 1])
+        if ob:
+            zones = bullish_obs if ob.pop("side") == "bullish" else bearish_obs
+            zones.append({**ob, "index": i})
 
     return {
         "bullish": bullish_obs[-5:],
@@ -68,27 +88,11 @@ def detect_fvg(candles: list[dict], lookback: int = 50) -> dict:
     recent = candles[-lookback:] if len(candles) > lookback else candles
 
     for i in range(2, len(recent)):
-        c1 = recent[i - 2]
-        c2 = recent[i - 1]
-        c3 = recent[i]
-
-        # Bullish FVG: gap up — candle 3 low > candle 1 high
-        if c3["low"] > c1["high"]:
-            bullish_fvgs.append({
-                "top": c3["low"],
-                "bottom": c1["high"],
-                "gap_size": c3["low"] - c1["high"],
-                "index": i,
-            })
-
-        # Bearish FVG: gap down — candle 3 high < candle 1 low
-        if c3["high"] < c1["low"]:
-            bearish_fvgs.append({
-                "top": c1["low"],
-                "bottom": c3["high"],
-                "gap_size": c1["low"] - c3["high"],
-                "index": i,
-            })
+        # Bullish: candle 3 low > candle 1 high; bearish: candle 3 high < candle 1 low
+        gap = fvg_at(recent[i - 2], recent[i])
+        if gap:
+            zones = bullish_fvgs if gap.pop("side") == "bullish" else bearish_fvgs
+            zones.append({**gap, "index": i})
 
     return {
         "bullish": bullish_fvgs[-5:],
@@ -34,8 +34,11 @@ def detect_support_resistance(
         if highs[i] == np.max(highs[i - lookback : i + lookback + 1]):
             resistances.append(float(highs[i]))
 
-    current_price = float(closes[-1])
+    return summarize_levels(supports, resistances, float(closes[-1]))
 
+
+def summarize_levels(supports: list[float], resistances: list[float], current_price: float) -> dict:
+    """Build the support/resistance result from pivot levels in chronological order."""
     # Find nearest levels
     supports_below = [s for s in supports if s < current_price]
     resistances_above = [r for r in resistances if r > current_price]
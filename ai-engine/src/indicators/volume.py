@@ -0,0 +1,167 @@
+"""Volume indicators — volume profile, VWAP bands, OBV and relative volume.
+
+All four read a rolling window of typical prices ``(high + low + close) / 3``
+and volumes:
+
+- Volume profile: volume histogram over ``PROFILE_BINS`` price bins of the
+  last ``VWAP_WINDOW`` bars; point of control (POC) is the fullest bin, the
+  value area the fullest bins holding ``VALUE_AREA`` of the volume
+- VWAP over the same window, with ±2σ volume-weighted bands
+- OBV: running on-balance volume (its level depends on where the state
+  started), and its change over ``OBV_SLOPE_BARS`` as a share of the volume
+  traded in those bars (−1 … +1)
+- Relative volume: last bar over the mean of the previous ``RVOL_WINDOW``
+
+``VolumeState.from_arrays`` builds the state in one vectorized pass;
+``update`` then folds in each closed candle in O(1) — running VWAP sums are
+adjusted for the bar entering and the bar leaving the window. ``values`` reads
+the indicators; only the profile histogram touches the whole window.
+"""
+
+import math
+from collections import deque
+
+import numpy as np
+
+VWAP_WINDOW = 96
+PROFILE_BINS = 24
+VALUE_AREA = 0.70
+OBV_SLOPE_BARS = 20
+RVOL_WINDOW = 20
+
+# Relative volume at or above which a bar counts as a spike
+RVOL_SPIKE = 2.0
+
+
+def typical_prices(highs: np.ndarray, lows: np.ndarray, closes: np.ndarray) -> np.ndarray:
+    return (highs + lows + closes) / 3.0
+
+
+def volume_profile(
+    prices: np.ndarray, volumes: np.ndarray, bins: int = PROFILE_BINS, value_area: float = VALUE_AREA
+) -> dict:
+    """Point of control and value area of a volume-by-price histogram."""
+    total = float(volumes.sum()) if len(volumes) else 0.0
+    if total <= 0 or prices.max() <= prices.min():
+        return {"poc": None, "value_area_high": None, "value_area_low": None}
+    hist, edges = np.histogram(prices, bins=bins, weights=volumes)
+    order = np.argsort(-hist, kind="stable")
+    filled = np.searchsorted(np.cumsum(hist[order]), value_area * total) + 1
+    area = order[:filled]
+    poc = int(order[0])
+    return {
+        "poc": float((edges[poc] + edges[poc + 1]) / 2),
+        "value_area_high": float(edges[area.max() + 1]),
+        "value_area_low": float(edges[area.min()]),
+    }
+
+
+def obv_series(closes: np.ndarray, volumes: np.ndarray) -> np.ndarray:
+    """On-balance volume, starting at 0 on the first bar."""
+    signs = np.sign(np.diff(closes))
+    return np.concatenate([[0.0], np.cumsum(signs * volumes[1:])])
+
+
+def relative_volume(volumes: np.ndarray, window: int = RVOL_WINDOW) -> float | None:
+    """Last bar's volume over the mean of the ``window`` bars before it."""
+    if len(volumes) < 2:
+        return None
+    baseline = float(volumes[-(window + 1):-1].mean())
+    return float(volumes[-1]) / baseline if baseline > 0 else None
+
+
+class VolumeState:
+    """Rolling volume indicator state for one (symbol, timeframe)."""
+
+    def __init__(self):
+        self.bar_time: int | None = None
+        self.last_close: float | None = None
+        self.window: deque[tuple[float, float]] = deque(maxlen=VWAP_WINDOW)   # (typical price, volume)
+        self.obv = 0.0
+        self.obv_history: deque[float] = deque(maxlen=OBV_SLOPE_BARS + 1)
+        self.volumes: deque[float] = deque(maxlen=max(RVOL_WINDOW, OBV_SLOPE_BARS) + 1)
+        # Running window sums, anchored at the first price to keep the variance well conditioned
+        self._anchor: float | None = None
+        self._sum_v = self._sum_dv = self._sum_d2v = 0.0
+
+    @classmethod
+    def from_arrays(
+        cls,
+        highs: np.ndarray,
+        lows: np.ndarray,
+        closes: np.ndarray,
+        volumes: np.ndarray,
+        bar_time: int | None = None,
+    ) -> "VolumeState":
+        """State after the given bars, computed in one vectorized pass."""
+        state = cls()
+        if not len(closes):
+            return state
+        prices = typical_prices(highs, lows, closes)
+        obv = obv_series(closes, volumes)
+        state.bar_time = bar_time
+        state.last_close = float(closes[-1])
+        state.obv = float(obv[-1])
+        state.obv_history.extend(obv[-(OBV_SLOPE_BARS + 1):].tolist())
+        state.volumes.extend(volumes[-state.volumes.maxlen:].tolist())
+
+        tail_p, tail_v = prices[-VWAP_WINDOW:], volumes[-VWAP_WINDOW:]
+        state.window.extend(zip(tail_p.tolist(), tail_v.tolist()))
+        state._anchor = float(tail_p[0])
+        d = tail_p - state._anchor
+        state._sum_v = float(tail_v.sum())
+        state._sum_dv = float(np.dot(d, tail_v))
+        state._sum_d2v = float(np.dot(d * d, tail_v))
+        return state
+
+    def update(self, high: float, low: float, close: float, volume: float, bar_time: int | None = None):
+        """Fold one closed candle into the state."""
+        price = (high + low + close) / 3.0
+        if self._anchor is None:
+            self._anchor = price
+        if len(self.window) == self.window.maxlen:
+            old_price, old_volume = self.window[0]
+            d = old_price - self._anchor
+            self._sum_v -= old_volume
+            self._sum_dv -= d * old_volume
+            self._sum_d2v -= d * d * old_volume
+        self.window.append((price, volume))
+        d = price - self._anchor
+        self._sum_v += volume
+        self._sum_dv += d * volume
+        self._sum_d2v += d * d * volume
+
+        if self.last_close is not None:
+            self.obv += math.copysign(volume, close - self.last_close) if close != self.last_close else 0.0
+        self.obv_history.append(self.obv)
+        self.volumes.append(volume)
+        self.last_close = close
+        self.bar_time = bar_time
+
+    def values(self) -> dict:
+        """VWAP bands, profile POC / value area, OBV slope and relative volume."""
+        vwap = vwap_std = None
+        if self._sum_v > 0:
+            mean_d = self._sum_dv / self._sum_v
+            vwap = self._anchor + mean_d
+            vwap_std = math.sqrt(max(self._sum_d2v / self._sum_v - mean_d * mean_d, 0.0))
+
+        window = np.array(self.window, dtype=np.float64).reshape(-1, 2)
+        profile = volume_profile(window[:, 0], window[:, 1])
+
+        volumes = np.fromiter(self.volumes, dtype=np.float64, count=len(self.volumes))
+        rvol = relative_volume(volumes)
+        slope_volume = float(volumes[-(len(self.obv_history) - 1):].sum()) if len(self.obv_history) > 1 else 0.0
+        obv_slope = (self.obv_history[-1] - self.obv_history[0]) / slope_volume if slope_volume > 0 else 0.0
+
+        return {
+            "vwap": vwap,
+            "vwap_std": vwap_std,
+            "vwap_upper": vwap + 2 * vwap_std if vwap is not None else None,
+            "vwap_lower": vwap - 2 * vwap_std if vwap is not None else None,
+            **profile,
+            "obv": self.obv,
+            "obv_slope": obv_slope,
+            "relative_volume": rvol,
+            "volume_spike": rvol is not None and rvol >= RVOL_SPIKE,
+        }
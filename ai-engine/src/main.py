@@ -13,7 +13,10 @@ from src.tasks.scheduler import start_scheduler, stop_scheduler
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Startup and shutdown hooks."""
-    await db_pool.connect(settings.database_url)
+    await db_pool.connect(
+        settings.database_url,
+        statement_cache_size=settings.db_statement_cache_size,
+    )
     start_scheduler()
     yield
     stop_scheduler()
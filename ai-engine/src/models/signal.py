@@ -60,3 +60,5 @@ class ConsensusResult(BaseModel):
     abstain_count: int
     weighted_confidence: float
     votes: list[ConsensusVote] = []
+    regime: str | None = None
+    weights_version: int = 0
@@ -3,6 +3,7 @@
 import asyncio
 import json
 import logging
+import time
 from collections import defaultdict
 
 import httpx
@@ -15,14 +16,58 @@ logger = logging.getLogger(__name__)
 _candle_cache: dict[str, list[dict]] = defaultdict(list)
 _MAX_CANDLES = 500
 
+# Kline interval lengths in seconds
+INTERVAL_SECONDS: dict[str, int] = {
+    "1m": 60, "3m": 180, "5m": 300, "15m": 900, "30m": 1800,
+    "1h": 3600, "2h": 7200, "4h": 14400, "6h": 21600, "8h": 28800, "12h": 43200,
+    "1d": 86400, "3d": 259200, "1w": 604800,
+}
+
+
+# Weekly klines open on Monday 00:00 UTC; the epoch was a Thursday
+_WEEK_OFFSET_SECONDS = 4 * 86400
+
+
+def interval_seconds(interval: str) -> int:
+    """Length of a kline interval in seconds (unknown intervals default to 1h)."""
+    return INTERVAL_SECONDS.get(interval, 3600)
+
+
+def bar_open_time(ts: float, interval: str) -> int:
+    """Open time (epoch seconds) of the kline containing ``ts``."""
+    seconds = interval_seconds(interval)
+    offset = _WEEK_OFFSET_SECONDS if interval == "1w" else 0
+    return int((ts - offset) // seconds * seconds + offset)
+
+
+def closed_intervals(boundary: int, intervals: list[str] | None = None) -> list[str]:
+    """Intervals whose candle closes exactly at ``boundary`` (epoch seconds)."""
+    return [
+        interval for interval in (intervals or INTERVAL_SECONDS)
+        if bar_open_time(boundary, interval) == boundary
+    ]
+
+
+def _to_candle(kline: list) -> dict:
+    return {
+        "open_time": kline[0],
+        "open": float(kline[1]),
+        "high": float(kline[2]),
+        "low": float(kline[3]),
+        "close": float(kline[4]),
+        "volume": float(kline[5]),
+        "close_time": kline[6],
+    }
+
 
 async def get_recent_candles(symbol: str, interval: str = "1h", limit: int = 100) -> list[dict]:
     """Fetch recent candles from Binance REST API.
 
-    Falls back to cache if available.
+    Served from cache while the cached forming candle is still open — the
+    closed candles cannot have changed yet. Falls back to cache on errors.
     """
     cached = _candle_cache.get(f"{symbol}_{interval}", [])
-    if cached and len(cached) >= limit:
+    if cached and len(cached) >= limit and cached[-1]["close_time"] >= time.time() * 1000:
         return cached[-limit:]
 
     try:
@@ -34,17 +79,7 @@ async def get_recent_candles(symbol: str, interval: str = "1h", limit: int = 100
             resp.raise_for_status()
             data = resp.json()
 
-        candles = []
-        for k in data:
-            candles.append({
-                "open_time": k[0],
-                "open": float(k[1]),
-                "high": float(k[2]),
-                "low": float(k[3]),
-                "close": float(k[4]),
-                "volume": float(k[5]),
-                "close_time": k[6],
-            })
+        candles = [_to_candle(k) for k in data]
 
         # Update cache
         cache_key = f"{symbol}_{interval}"
@@ -57,6 +92,29 @@ async def get_recent_candles(symbol: str, interval: str = "1h", limit: int = 100
         return cached[-limit:] if cached else []
 
 
+async def get_candle_history(symbol: str, interval: str = "1h", bars: int = 1000) -> list[dict]:
+    """Fetch the last ``bars`` candles, paging back 1000 per request (not cached)."""
+    url = "https://api.binance.com/api/v3/klines"
+    candles: list[dict] = []
+    end_time: int | None = None
+    try:
+        async with httpx.AsyncClient(timeout=10.0) as client:
+            while len(candles) < bars:
+                params = {"symbol": symbol, "interval": interval, "limit": min(1000, bars - len(candles))}
+                if end_time is not None:
+                    params["endTime"] = end_time
+                resp = await client.get(url, params=params)
+                resp.raise_for_status()
+                page = [_to_candle(k) for k in resp.json()]
+                candles = page + candles
+                if len(page) < params["limit"]:
+                    break  # reached the listing date
+                end_time = page[0]["open_time"] - 1
+    except Exception as e:
+        logger.error(f"Failed to fetch candle history for {symbol}: {e}")
+    return candles
+
+
 async def get_current_price(symbol: str) -> float | None:
     """Get current price from Binance."""
     try:
@@ -68,3 +126,16 @@ async def get_current_price(symbol: str) -> float | None:
     except Exception as e:
         logger.error(f"Failed to get price for {symbol}: {e}")
         return None
+
+
+async def get_all_prices() -> dict[str, float]:
+    """Get latest prices for every symbol in one request."""
+    try:
+        url = "https://api.binance.com/api/v3/ticker/price"
+        async with httpx.AsyncClient(timeout=5.0) as client:
+            resp = await client.get(url)
+            resp.raise_for_status()
+            return {t["symbol"]: float(t["price"]) for t in resp.json()}
+    except Exception as e:
+        logger.error(f"Failed to get bulk prices: {e}")
+        return {}
@@ -1,37 +1,145 @@
 """Async PostgreSQL connection pool using asyncpg."""
 
+import functools
+import logging
+import re
+import time
+from typing import AsyncIterator, Callable
+
 import asyncpg
 
+from src.services.queries import queries
+
+logger = logging.getLogger(__name__)
+
+# INSERT/UPDATE/DELETE targets anywhere in a statement, including data-modifying
+# CTEs — used to fire write hooks by table name. Quoted text and the UPDATE of
+# row locks / ON CONFLICT clauses are matched without a target so they're skipped.
+_WRITE_TARGET = re.compile(
+    r"'(?:[^']|'')*'"
+    r"|\b(?:FOR|KEY|DO)\s+UPDATE\b"
+    r"|\b(?:INSERT\s+INTO|UPDATE|DELETE\s+FROM)\s+(?:ONLY\s+)?([A-Za-z_][A-Za-z0-9_]*)",
+    re.IGNORECASE,
+)
+
+
+@functools.lru_cache(maxsize=1024)
+def _write_targets(query: str) -> tuple[str, ...]:
+    """Tables written by ``query``, in order of appearance (empty for reads)."""
+    tables = (m.group(1).lower() for m in _WRITE_TARGET.finditer(query) if m.group(1))
+    return tuple(dict.fromkeys(tables))
+
 
 class DatabasePool:
-    """Manages an asyncpg connection pool."""
+    """Manages an asyncpg connection pool.
+
+    Writes issued through the pool notify registered write listeners with the
+    target table name, so in-process caches can invalidate dependent reads.
+
+    The ``*_named`` methods run queries from the named query registry
+    (``src/services/queries.py``): canonical SQL per filter variant, so each is
+    prepared once per connection by asyncpg's statement cache, plus latency
+    histograms and slow-query logging per query name.
+    """
 
     def __init__(self):
         self.pool: asyncpg.Pool | None = None
+        self._write_listeners: list[Callable[[str], None]] = []
 
-    async def connect(self, dsn: str, min_size: int = 2, max_size: int = 10):
-        self.pool = await asyncpg.create_pool(dsn, min_size=min_size, max_size=max_size)
+    async def connect(
+        self,
+        dsn: str,
+        min_size: int = 2,
+        max_size: int = 10,
+        statement_cache_size: int = 256,
+    ):
+        self.pool = await asyncpg.create_pool(
+            dsn,
+            min_size=min_size,
+            max_size=max_size,
+            statement_cache_size=statement_cache_size,
+        )
 
     async def disconnect(self):
         if self.pool:
             await self.pool.close()
             self.pool = None
 
+    def on_write(self, listener: Callable[[str], None]):
+        """Register a callback invoked with the table name after each write.
+
+        A statement that writes several tables (data-modifying CTEs) notifies
+        each of them once.
+        """
+        self._write_listeners.append(listener)
+
+    def _notify_write(self, query: str):
+        for table in _write_targets(query):
+            for listener in self._write_listeners:
+                try:
+                    listener(table)
+                except Exception as e:
+                    logger.error(f"Write listener error for table '{table}': {e}")
+
     async def fetch(self, query: str, *args) -> list[asyncpg.Record]:
         async with self.pool.acquire() as conn:
-            return await conn.fetch(query, *args)
+            rows = await conn.fetch(query, *args)
+        self._notify_write(query)
+        return rows
 
     async def fetchrow(self, query: str, *args) -> asyncpg.Record | None:
         async with self.pool.acquire() as conn:
-            return await conn.fetchrow(query, *args)
+            row = await conn.fetchrow(query, *args)
+        self._notify_write(query)
+        return row
 
     async def fetchval(self, query: str, *args):
         async with self.pool.acquire() as conn:
-            return await conn.fetchval(query, *args)
+            value = await conn.fetchval(query, *args)
+        self._notify_write(query)
+        return value
+
+    async def stream(self, query: str, *args, prefetch: int = 500) -> AsyncIterator[asyncpg.Record]:
+        """Iterate a large result set through a server-side cursor.
+
+        Rows are fetched ``prefetch`` at a time, so memory stays constant
+        regardless of result size. Holds one pooled connection until exhausted.
+        """
+        async with self.pool.acquire() as conn:
+            async with conn.transaction(readonly=True):
+                async for row in conn.cursor(query, *args, prefetch=prefetch):
+                    yield row
 
     async def execute(self, query: str, *args) -> str:
         async with self.pool.acquire() as conn:
-            return await conn.execute(query, *args)
+            status = await conn.execute(query, *args)
+        self._notify_write(query)
+        return status
+
+    async def _run_named(self, method: str, name: str, columns: tuple[str, ...] | None, params: dict):
+        sql, args = queries.bind(name, params, columns)
+        async with self.pool.acquire() as conn:
+            start = time.perf_counter()
+            result = await getattr(conn, method)(sql, *args)
+            queries.observe(name, (time.perf_counter() - start) * 1000, sql)
+        self._notify_write(sql)
+        return result
+
+    async def fetch_named(
+        self, name: str, columns: tuple[str, ...] | None = None, **params
+    ) -> list[asyncpg.Record]:
+        return await self._run_named("fetch", name, columns, params)
+
+    async def fetchrow_named(
+        self, name: str, columns: tuple[str, ...] | None = None, **params
+    ) -> asyncpg.Record | None:
+        return await self._run_named("fetchrow", name, columns, params)
+
+    async def fetchval_named(self, name: str, **params):
+        return await self._run_named("fetchval", name, None, params)
+
+    async def execute_named(self, name: str, **params) -> str:
+        return await self._run_named("execute", name, None, params)
 
 
 db_pool = DatabasePool()
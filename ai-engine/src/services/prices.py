@@ -0,0 +1,140 @@
+"""Price service — one in-memory snapshot of the latest price for every symbol.
+
+The scheduler refreshes the snapshot with a single bulk ticker request
+(``binance_ws.get_all_prices``). When ``U2ALGO_PRICE_CACHE_REFRESH`` is on, rows
+that the Go engine writes to ``ualgo_price_cache`` are merged in as well, and
+they are the fallback when the ticker request fails. Readers (RiskSentinel,
+alerts, position marking) get O(1) dict lookups instead of one HTTP request per
+symbol.
+"""
+
+import logging
+import time
+from collections.abc import Mapping
+from datetime import datetime, timezone
+
+from src.config import settings
+from src.services.binance_ws import get_all_prices
+from src.services.db import db_pool
+from src.services.queries import queries
+
+logger = logging.getLogger(__name__)
+
+queries.register(
+    "prices.cache_rows",
+    """SELECT symbol, price, updated_at
+       FROM ualgo_price_cache
+       WHERE TRUE {filters}""",
+    optional={"since": "AND updated_at >= :since"},
+)
+
+
+class PriceService:
+    """Latest price per symbol, refreshed in bulk."""
+
+    def __init__(self):
+        self._prices: dict[str, float] = {}
+        self._updated_at: dict[str, float] = {}
+        # Newest updated_at read, and the symbols already read at exactly that
+        # time: rows are re-read with >= so a late row at the same timestamp
+        # is not missed, and these are skipped
+        self._db_watermark: datetime | None = None
+        self._db_watermark_symbols: set[str] = set()
+        self.refreshed_at: float | None = None
+        self.ticker_refreshes = 0
+        self.ticker_failures = 0
+        self.db_rows_applied = 0
+
+    @property
+    def prices(self) -> Mapping[str, float]:
+        """Read-only view of the whole snapshot (symbol → price)."""
+        return self._prices
+
+    def get(self, symbol: str, max_age_seconds: float | None = None) -> float | None:
+        """Latest price for ``symbol``, or None if unknown or older than ``max_age_seconds``."""
+        symbol = symbol.upper()
+        price = self._prices.get(symbol)
+        if price is None or max_age_seconds is None:
+            return price
+        if time.time() - self._updated_at.get(symbol, 0.0) > max_age_seconds:
+            return None
+        return price
+
+    def get_many(self, symbols: list[str]) -> dict[str, float]:
+        """Prices for the requested symbols that are in the snapshot."""
+        return {s.upper(): self._prices[s.upper()] for s in symbols if s.upper() in self._prices}
+
+    def update(self, prices: Mapping[str, float], at: float | None = None):
+        """Merge a batch of prices into the snapshot."""
+        at = at if at is not None else time.time()
+        for symbol, price in prices.items():
+            self._prices[symbol] = price
+            self._updated_at[symbol] = at
+        self.refreshed_at = at
+
+    async def refresh(self) -> int:
+        """Refresh from one bulk ticker request, plus ``ualgo_price_cache`` if enabled.
+
+        Returns:
+            Number of symbols updated.
+        """
+        prices = await get_all_prices()
+        if prices:
+            self.update(prices)
+            self.ticker_refreshes += 1
+        else:
+            self.ticker_failures += 1
+
+        applied = 0
+        if settings.price_cache_refresh:
+            applied = await self.refresh_from_db()
+        return len(prices) + applied
+
+    async def refresh_from_db(self) -> int:
+        """Merge ``ualgo_price_cache`` rows changed since the last read.
+
+        A row only replaces an in-memory price that is older than the row.
+        """
+        try:
+            rows = await db_pool.fetch_named("prices.cache_rows", since=self._db_watermark)
+        except Exception as e:
+            logger.error(f"Price cache read failed: {e}")
+            return 0
+
+        applied = 0
+        for row in rows:
+            symbol = row["symbol"].upper()
+            updated_at = row["updated_at"]
+            if updated_at == self._db_watermark:
+                if symbol in self._db_watermark_symbols:
+                    continue
+                self._db_watermark_symbols.add(symbol)
+            elif self._db_watermark is None or updated_at > self._db_watermark:
+                self._db_watermark = updated_at
+                self._db_watermark_symbols = {symbol}
+            row_ts = updated_at.timestamp()
+            if row_ts > self._updated_at.get(symbol, 0.0):
+                self._prices[symbol] = float(row["price"])
+                self._updated_at[symbol] = row_ts
+                applied += 1
+        if applied:
+            self.refreshed_at = max(self.refreshed_at or 0.0, time.time())
+            self.db_rows_applied += applied
+        return applied
+
+    def get_stats(self) -> dict:
+        return {
+            "symbols": len(self._prices),
+            "refreshed_at": (
+                datetime.fromtimestamp(self.refreshed_at, tz=timezone.utc).isoformat()
+                if self.refreshed_at else None
+            ),
+            "ticker_refreshes": self.ticker_refreshes,
+            "ticker_failures": self.ticker_failures,
+            "db_refresh_enabled": settings.price_cache_refresh,
+            "db_rows_applied": self.db_rows_applied,
+        }
+
+
+# Global singleton
+price_service = PriceService()
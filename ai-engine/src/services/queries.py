@@ -0,0 +1,180 @@
+"""Named query registry — canonical SQL variants and per-query latency histograms.
+
+Queries are registered once with ``:name`` placeholders and optional filter
+clauses. Each combination of present filters (and column projection) renders to
+one canonical SQL text with stable ``$n`` numbering, so asyncpg's per-connection
+statement cache prepares every variant once per connection and reuses it,
+instead of seeing a new string for every parameter mix.
+
+Example:
+
+    queries.register(
+        "memory.recall",
+        "SELECT ... WHERE agent_name = :agent_name {filters} LIMIT :limit",
+        optional={"symbol": "AND symbol = :symbol"},
+    )
+    rows = await db_pool.fetch_named("memory.recall", agent_name="x", symbol=None, limit=10)
+"""
+
+import bisect
+import logging
+import re
+from dataclasses import dataclass, field
+
+from src.config import settings
+
+logger = logging.getLogger(__name__)
+
+# ``:name`` placeholders; ``::type`` casts are left alone. String literals,
+# quoted identifiers, dollar-quoted bodies and comments are matched first
+# (without a ``name`` group) so a ``:name`` inside them is never substituted.
+_PLACEHOLDER = re.compile(
+    r"""'(?:[^']|'')*'"""
+    r'|"(?:[^"]|"")*"'
+    r"|\$([A-Za-z_][A-Za-z0-9_]*|)\$.*?\$\1\$"
+    r"|--[^\n]*"
+    r"|/\*.*?\*/"
+    r"|(?<!:):(?P<name>[A-Za-z_][A-Za-z0-9_]*)",
+    re.DOTALL,
+)
+
+# Latency histogram bucket upper bounds in milliseconds (last bucket is +inf)
+LATENCY_BUCKETS_MS: tuple[float, ...] = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+
+@dataclass(frozen=True)
+class NamedQuery:
+    """A registered query template.
+
+    ``sql`` may contain ``{filters}`` (replaced by the present optional clauses in
+    declaration order) and ``{columns}`` (replaced by the requested projection).
+    An optional clause is included when the parameter it is keyed by is not None.
+    """
+    name: str
+    sql: str
+    optional: dict[str, str] = field(default_factory=dict)
+    default_columns: tuple[str, ...] = ()
+
+
+@dataclass
+class LatencyHistogram:
+    """Fixed-bucket latency histogram for one named query."""
+    counts: list[int] = field(default_factory=lambda: [0] * (len(LATENCY_BUCKETS_MS) + 1))
+    count: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    slow_count: int = 0
+
+    def observe(self, elapsed_ms: float, slow: bool):
+        self.counts[bisect.bisect_left(LATENCY_BUCKETS_MS, elapsed_ms)] += 1
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        if slow:
+            self.slow_count += 1
+
+    def quantile(self, q: float) -> float | None:
+        """Upper bucket bound containing the q-th observation (bucket resolution)."""
+        if not self.count:
+            return None
+        target = q * self.count
+        seen = 0
+        for i, c in enumerate(self.counts):
+            seen += c
+            if seen >= target:
+                return LATENCY_BUCKETS_MS[i] if i < len(LATENCY_BUCKETS_MS) else self.max_ms
+        return self.max_ms
+
+    def summary(self) -> dict:
+        return {
+            "count": self.count,
+            "avg_ms": round(self.total_ms / self.count, 3) if self.count else None,
+            "max_ms": round(self.max_ms, 3),
+            "p50_ms": self.quantile(0.50),
+            "p95_ms": self.quantile(0.95),
+            "p99_ms": self.quantile(0.99),
+            "slow_count": self.slow_count,
+            "buckets": {
+                (f"le_{b:g}" if i < len(LATENCY_BUCKETS_MS) else "inf"): c
+                for i, (b, c) in enumerate(zip((*LATENCY_BUCKETS_MS, float("inf")), self.counts))
+            },
+        }
+
+
+class QueryRegistry:
+    """Holds named queries, their rendered variants and latency stats."""
+
+    def __init__(self, slow_query_ms: float = 250.0):
+        self.slow_query_ms = slow_query_ms
+        self._queries: dict[str, NamedQuery] = {}
+        self._variants: dict[tuple, tuple[str, tuple[str, ...]]] = {}
+        self._histograms: dict[str, LatencyHistogram] = {}
+
+    def register(
+        self,
+        name: str,
+        sql: str,
+        optional: dict[str, str] | None = None,
+        default_columns: tuple[str, ...] = (),
+    ) -> NamedQuery:
+        """Register (or replace) a named query template."""
+        query = NamedQuery(name, sql, dict(optional or {}), tuple(default_columns))
+        self._queries[name] = query
+        self._variants = {k: v for k, v in self._variants.items() if k[0] != name}
+        return query
+
+    def bind(
+        self, name: str, params: dict, columns: tuple[str, ...] | None = None
+    ) -> tuple[str, list]:
+        """Resolve a named query to (canonical SQL, positional args)."""
+        query = self._queries.get(name)
+        if query is None:
+            raise KeyError(f"Unknown named query '{name}'")
+        present = frozenset(k for k in query.optional if params.get(k) is not None)
+        cols = tuple(columns) if columns else query.default_columns
+        key = (name, present, cols)
+        variant = self._variants.get(key)
+        if variant is None:
+            variant = self._render(query, present, cols)
+            self._variants[key] = variant
+        sql, arg_names = variant
+        try:
+            return sql, [params[a] for a in arg_names]
+        except KeyError as e:
+            raise KeyError(f"Missing parameter {e} for named query '{name}'") from None
+
+    def _render(
+        self, query: NamedQuery, present: frozenset[str], columns: tuple[str, ...]
+    ) -> tuple[str, tuple[str, ...]]:
+        filters = " ".join(clause for key, clause in query.optional.items() if key in present)
+        text = query.sql.replace("{filters}", filters).replace("{columns}", ", ".join(columns))
+        arg_names: list[str] = []
+
+        def number(match: re.Match) -> str:
+            arg = match.group("name")
+            if arg is None:
+                return match.group(0)
+            if arg not in arg_names:
+                arg_names.append(arg)
+            return f"${arg_names.index(arg) + 1}"
+
+        return _PLACEHOLDER.sub(number, text), tuple(arg_names)
+
+    def observe(self, name: str, elapsed_ms: float, sql: str):
+        """Record a named query's latency and log it if slow."""
+        slow = elapsed_ms >= self.slow_query_ms
+        self._histograms.setdefault(name, LatencyHistogram()).observe(elapsed_ms, slow)
+        if slow:
+            logger.warning(f"Slow query '{name}': {elapsed_ms:.1f}ms — {' '.join(sql.split())[:200]}")
+
+    def get_stats(self) -> dict:
+        return {
+            "slow_query_ms": self.slow_query_ms,
+            "registered": len(self._queries),
+            "variants": len(self._variants),
+            "queries": {name: h.summary() for name, h in sorted(self._histograms.items())},
+        }
+
+
+# Global singleton
+queries = QueryRegistry(slow_query_ms=settings.slow_query_ms)
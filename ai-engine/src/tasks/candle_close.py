@@ -0,0 +1,135 @@
+"""Candle close dispatch — runs analysis when a (symbol, timeframe) candle closes.
+
+The scheduler calls ``run_candle_close`` once per minute, just after the minute
+boundary. Every kline interval closes on a minute boundary, so each call works
+out which timeframes closed at that boundary and only then:
+
+- refreshes the shared indicator snapshots of every affected symbol in one
+  batched pass per timeframe (indicator-signal alerts and subscribed features
+  are evaluated by the snapshot listeners),
+- evaluates ``OncePerBarClose`` price alerts against each closed bar's close,
+- re-scores each (symbol, timeframe) an active strategy scans in the scan
+  priority queue, and
+- scans the pairs the queue says are due, within the per-minute scan budget
+  (see ``scan_priority``), for every strategy covering them in one shared DAG
+  (see ``scan_planner``).
+
+Between closes nothing is re-analysed; intra-candle work is limited to the
+cheap latest-price jobs (price alerts, risk checks) and scans deferred by the
+budget on an earlier minute.
+"""
+
+import asyncio
+import logging
+import time
+
+from src.core.indicator_snapshot import closed_candles, indicator_snapshots
+from src.services.binance_ws import closed_intervals, get_recent_candles, interval_seconds
+from src.tasks.scan_priority import scan_priority
+
+logger = logging.getLogger(__name__)
+
+# Binance may publish a closed kline a moment after the boundary; retry this
+# many times before giving up on the bar
+CLOSE_RETRIES = 3
+CLOSE_RETRY_SECONDS = 2.0
+
+# Candles fetched per snapshot (matches the orchestrator's default window)
+SNAPSHOT_CANDLES = 100
+
+# Last bar (open time, ms) dispatched per (symbol, timeframe) — a bar is scanned once
+_last_bar: dict[tuple[str, str], int] = {}
+
+
+async def _fetch_closed(symbol: str, timeframe: str, bar_ms: int) -> list[dict] | None:
+    """Fetch candles until the bar opening at ``bar_ms`` is the last closed one."""
+    for attempt in range(CLOSE_RETRIES):
+        candles = await get_recent_candles(symbol, interval=timeframe, limit=SNAPSHOT_CANDLES)
+        closed = closed_candles(candles)
+        if closed and closed[-1].get("open_time", 0) >= bar_ms:
+            return candles
+        if attempt < CLOSE_RETRIES - 1:
+            await asyncio.sleep(CLOSE_RETRY_SECONDS)
+    logger.warning(f"Closed {timeframe} candle for {symbol} not available (bar {bar_ms})")
+    return None
+
+
+async def run_candle_close(boundary: int | None = None) -> dict:
+    """Dispatch work for every timeframe whose candle closed at ``boundary``.
+
+    Args:
+        boundary: Epoch seconds of the minute boundary (default: the current one).
+
+    Returns:
+        Summary of closed timeframes, scans run and snapshots refreshed.
+    """
+    from src.core.alert_engine import alert_engine
+    from src.core.feature_store import feature_store
+    from src.tasks.scan_planner import scan_planner
+
+    boundary = boundary if boundary is not None else int(time.time() // 60 * 60)
+    timeframes = closed_intervals(boundary)
+    summary = {"boundary": boundary, "timeframes": timeframes, "scans": 0, "deferred": 0, "decisions": 0, "snapshots": 0}
+
+    universe = scan_planner.pairs()
+    scan_pairs = {pair for pair in universe if pair[1] in timeframes}
+    # Pairs that only need a snapshot: indicator / bar-close alerts and strategy features
+    close_alert_pairs = alert_engine.close_targets()
+    listener_pairs = [
+        pair for pair in sorted(alert_engine.indicator_targets() | close_alert_pairs | feature_store.targets())
+        if pair[1] in timeframes and pair not in scan_pairs
+    ]
+
+    fetched_this_minute: dict[tuple[str, str], list[dict]] = {}
+    for timeframe in timeframes:
+        bar_ms = (boundary - interval_seconds(timeframe)) * 1000
+        pairs = [
+            pair for pair in [*listener_pairs, *sorted(scan_pairs)]
+            if pair[1] == timeframe and _last_bar.get(pair, -1) < bar_ms
+        ]
+        if not pairs:
+            continue
+
+        # One batched indicator pass over every symbol that closed this bar
+        fetched = await asyncio.gather(*(_fetch_closed(symbol, timeframe, bar_ms) for symbol, _ in pairs))
+        candles_by_symbol = {symbol: candles for (symbol, _), candles in zip(pairs, fetched) if candles}
+        fetched_this_minute.update({(symbol, timeframe): c for symbol, c in candles_by_symbol.items()})
+        try:
+            snapshots = indicator_snapshots.compute_batch(timeframe, candles_by_symbol)
+        except Exception as e:
+            logger.error(f"Indicator batch failed for {timeframe}: {e}")
+            continue
+        summary["snapshots"] += len(snapshots)
+
+        for symbol, snapshot in snapshots.items():
+            pair = (symbol, timeframe)
+            if pair in close_alert_pairs and snapshot.bar_time > _last_bar.get(pair, -1):
+                alert_engine.on_candle_close(symbol, timeframe, snapshot.current_price, snapshot.bar_time)
+            _last_bar[pair] = snapshot.bar_time
+        scan_priority.update_batch(
+            timeframe,
+            {symbol: snap for symbol, snap in snapshots.items() if (symbol, timeframe) in scan_pairs},
+        )
+
+    # Due scans, including ones deferred by the budget on earlier minutes; pairs
+    # fetched above reuse their candles, deferred ones are fetched again
+    due = [pair for pair in scan_priority.pop_due() if pair in universe]
+    summary["deferred"] = scan_priority.last_deferred
+    if due:
+        try:
+            results = await scan_planner.run(due, candles=fetched_this_minute)
+            summary["scans"] = len(due)
+            summary["decisions"] = sum(len(r) for r in results.values())
+        except Exception as e:
+            logger.error(f"Candle close scan failed: {e}")
+
+    if not timeframes and not summary["scans"]:
+        return summary
+
+    await alert_engine.flush()
+    logger.info(
+        f"Candle close {', '.join(timeframes) or 'deferred'}: {summary['scans']} scans "
+        f"({summary['deferred']} deferred), {summary['decisions']} strategy decisions, "
+        f"{summary['snapshots']} snapshots"
+    )
+    return summary
@@ -0,0 +1,374 @@
+"""Scan planner — one shared computation DAG for every active strategy.
+
+Each active ``ualgo_strategy`` row scans its own symbols × timeframes with its
+own agents and confidence threshold. Running each strategy's scans on their
+own would repeat the expensive work — candle fetch, indicators, agent analysis
+— once per strategy on the same pair. The planner builds one DAG per dispatch
+instead:
+
+    fetch(symbol, tf) → indicators(symbol, tf) → technical(symbol, tf) ─┬───────────────────────┐
+                             every technical(·) → sizing ───────────────┴→ risk(strategy, symbol, tf) ─┐
+    sentiment(symbol) ─────────────────────────────────────────────────────────────────────────────────┴→ decision(strategy, symbol, tf)
+
+Nodes are keyed by what they compute, so a node several strategies need is
+added once and runs once; ``sentiment`` is keyed by symbol alone and shared
+across timeframes, and is only added when a strategy enables Alpha Scout.
+
+``sizing`` is a single node per dispatch: it sizes every strategy's candidate
+in one ``orchestrator.size_candidates`` call, so risk-parity allocation,
+concentration and gross exposure see the whole cycle, and each candidate is
+held to its strategy's ``config.max_risk_per_trade``. Sizes differ per
+strategy, so ``risk`` (the Risk Sentinel veto) and ``decision`` nodes are per
+strategy: ``orchestrator.run_scan_cycle`` applies the strategy's
+``agents_enabled``, ``config.min_confidence`` and ``is_paper`` to the shared
+results, and records the strategy's ``config.features`` values from the
+feature store with the signal.
+
+Nodes start as soon as their inputs are ready, at most ``scan_concurrency`` at
+a time (waiting on inputs does not hold a slot). A failed node fails only its
+dependents. Until strategies have been loaded (or while the database is
+unreachable) the planner scans the configured default symbols and timeframes
+as the ``default`` strategy.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from functools import partial
+from typing import Awaitable, Callable
+
+from src.agents.orchestrator import MIN_CONSENSUS_CONFIDENCE, orchestrator
+from src.config import settings
+from src.core.feature_store import FeatureSpec, feature_store, parse_features
+from src.core.indicator_snapshot import indicator_snapshots
+from src.services.binance_ws import get_recent_candles
+from src.services.db import db_pool
+from src.services.queries import queries
+
+logger = logging.getLogger(__name__)
+
+ALL_AGENTS = ("alpha_scout", "technical_analyst", "risk_sentinel")
+
+# Candles fetched per pair (matches the orchestrator's default window)
+SCAN_CANDLES = 100
+
+queries.register(
+    "strategies.active",
+    """SELECT id, symbols, timeframes, agents_enabled, config, is_paper
+       FROM ualgo_strategy
+       WHERE is_active = true
+       ORDER BY id""",
+)
+
+
+@dataclass(frozen=True)
+class StrategyPlan:
+    """What one strategy scans and how it decides."""
+    id: str
+    symbols: tuple[str, ...]
+    timeframes: tuple[str, ...]
+    agents_enabled: tuple[str, ...] = ALL_AGENTS
+    min_confidence: float = MIN_CONSENSUS_CONFIDENCE
+    max_risk_per_trade: float | None = None     # None → U2ALGO_MAX_RISK_PER_TRADE
+    is_paper: bool = True
+    features: tuple[FeatureSpec, ...] = ()
+
+    @classmethod
+    def from_row(cls, row) -> "StrategyPlan":
+        config = row["config"]
+        if isinstance(config, str):
+            config = json.loads(config)
+        config = config or {}
+        max_risk = config.get("max_risk_per_trade")
+        return cls(
+            id=row["id"],
+            symbols=tuple(s.upper() for s in row["symbols"]),
+            timeframes=tuple(row["timeframes"]),
+            agents_enabled=tuple(row["agents_enabled"]),
+            min_confidence=float(config.get("min_confidence", MIN_CONSENSUS_CONFIDENCE)),
+            max_risk_per_trade=float(max_risk) if max_risk is not None else None,
+            is_paper=row["is_paper"] is not False,
+            features=tuple(parse_features(config)),
+        )
+
+    def scans(self, symbol: str, timeframe: str) -> bool:
+        return symbol in self.symbols and timeframe in self.timeframes
+
+
+def default_plan() -> StrategyPlan:
+    return StrategyPlan(
+        id="default",
+        symbols=tuple(s.upper() for s in settings.default_symbols),
+        timeframes=tuple(settings.default_timeframes),
+    )
+
+
+class _Node:
+    __slots__ = ("fn", "deps", "allow_failed")
+
+    def __init__(self, fn: Callable[..., Awaitable], deps: tuple, allow_failed: bool):
+        self.fn = fn
+        self.deps = deps
+        self.allow_failed = allow_failed
+
+
+class ScanDAG:
+    """Deduplicated graph of async steps, run with bounded concurrency."""
+
+    def __init__(self, concurrency: int):
+        self.concurrency = max(concurrency, 1)
+        self._nodes: dict[tuple, _Node] = {}
+        self.requested = 0
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def add(
+        self, key: tuple, fn: Callable[..., Awaitable], deps: tuple = (), allow_failed: bool = False
+    ) -> tuple:
+        """Add a step called with its dependencies' results; an existing key is reused.
+
+        With ``allow_failed`` a failed dependency is passed in as its exception
+        instead of failing the step.
+        """
+        self.requested += 1
+        if key not in self._nodes:
+            self._nodes[key] = _Node(fn, tuple(deps), allow_failed)
+        return key
+
+    async def run(self) -> dict[tuple, object]:
+        """Run every step; a failed step (or one whose input failed) maps to its exception."""
+        slots = asyncio.Semaphore(self.concurrency)
+        tasks: dict[tuple, asyncio.Task] = {}
+
+        async def run_node(node: _Node):
+            inputs = []
+            for dep in node.deps:
+                try:
+                    inputs.append(await tasks[dep])
+                except Exception as e:
+                    if not node.allow_failed:
+                        raise
+                    inputs.append(e)
+            async with slots:
+                return await node.fn(*inputs)
+
+        for key, node in self._nodes.items():
+            tasks[key] = asyncio.ensure_future(run_node(node))
+        await asyncio.gather(*tasks.values(), return_exceptions=True)
+        return {key: task.exception() or task.result() for key, task in tasks.items()}
+
+
+class ScanPlanner:
+    """Active strategies and the shared scan DAG built over them."""
+
+    def __init__(self, concurrency: int):
+        self.concurrency = concurrency
+        self._strategies: list[StrategyPlan] = []
+        self.loaded_at: float | None = None
+        self.last_error: str | None = None
+        self.runs = 0
+        self.decisions = 0
+        self.candidates_sized = 0
+        self.failures = 0
+        self.nodes_run = 0
+        self.nodes_requested = 0
+        self.run_seconds = 0.0
+
+    @property
+    def strategies(self) -> list[StrategyPlan]:
+        return self._strategies if self.loaded_at is not None else [default_plan()]
+
+    async def refresh(self) -> int:
+        """Reload active strategies and their feature subscriptions."""
+        try:
+            rows = await db_pool.fetch_named("strategies.active")
+        except Exception as e:
+            self.last_error = str(e)
+            logger.error(f"Scan planner strategy load failed: {e}")
+            return len(self.strategies)
+        strategies = []
+        for row in rows:
+            try:
+                strategies.append(StrategyPlan.from_row(row))
+            except Exception as e:
+                logger.warning(f"Scan planner: skipping strategy {row['id']}: {e}")
+        if settings.feature_store_enabled:
+            feature_store.apply(rows)
+        self._strategies = strategies
+        self.loaded_at = time.time()
+        self.last_error = None
+        return len(strategies)
+
+    def pairs(self) -> set[tuple[str, str]]:
+        """(SYMBOL, timeframe) pairs scanned by at least one strategy."""
+        return {(s, tf) for plan in self.strategies for s in plan.symbols for tf in plan.timeframes}
+
+    def build(self, pairs: list[tuple[str, str]], candles: dict[tuple[str, str], list[dict]] | None = None) -> ScanDAG:
+        """DAG scanning ``pairs`` for every strategy that covers them."""
+        candles = candles or {}
+        dag = ScanDAG(self.concurrency)
+        scans: list[tuple[StrategyPlan, str, str, tuple, tuple]] = []
+        for symbol, timeframe in sorted(pairs):
+            symbol = symbol.upper()
+            strategies = [plan for plan in self.strategies if plan.scans(symbol, timeframe)]
+            if not strategies:
+                continue
+
+            # --- Shared per (symbol, timeframe) ---
+            fetch = dag.add(("fetch", symbol, timeframe), partial(_fetch, symbol, timeframe, candles.get((symbol, timeframe))))
+            indicators = dag.add(("indicators", symbol, timeframe), partial(_indicators, symbol, timeframe), (fetch,))
+            technical = dag.add(("technical", symbol, timeframe), partial(_technical, symbol, timeframe), (fetch, indicators))
+            scans += [(plan, symbol, timeframe, fetch, technical) for plan in strategies]
+
+        # --- Shared per dispatch: one sizing pass over every candidate ---
+        if not scans:
+            return dag
+        technicals = list(dict.fromkeys(technical for *_, technical in scans))
+        entries = tuple(
+            (plan, symbol, timeframe, technicals.index(technical)) for plan, symbol, timeframe, _, technical in scans
+        )
+        sizing = dag.add(("sizing",), partial(self._size, entries), tuple(technicals), allow_failed=True)
+
+        # --- Per strategy ---
+        for plan, symbol, timeframe, fetch, technical in scans:
+            risk = dag.add(("risk", plan.id, symbol, timeframe), partial(_risk, plan, symbol, timeframe), (technical, sizing))
+            deps = [fetch, technical, risk]
+            if "alpha_scout" in plan.agents_enabled:
+                deps.append(dag.add(("sentiment", symbol), partial(_sentiment, symbol)))
+            dag.add(("decision", plan.id, symbol, timeframe), partial(_decide, plan, symbol, timeframe), tuple(deps))
+        return dag
+
+    async def _size(self, entries: tuple, *technicals) -> dict[tuple[str, str, str], dict]:
+        """Size every strategy's candidate of the dispatch in one call, keyed by (strategy, symbol, tf)."""
+        keys, candidates = [], []
+        for plan, symbol, timeframe, i in entries:
+            technical = technicals[i]
+            if isinstance(technical, BaseException) or orchestrator.skip_reason(technical):
+                continue
+            keys.append((plan.id, symbol, timeframe))
+            candidates.append(orchestrator.candidate(symbol, technical, plan.max_risk_per_trade))
+        sizings = await orchestrator.size_candidates(candidates)
+        self.candidates_sized += len(sizings)
+        return dict(zip(keys, sizings))
+
+    async def run(
+        self, pairs: list[tuple[str, str]], candles: dict[tuple[str, str], list[dict]] | None = None
+    ) -> dict[str, list[dict]]:
+        """Scan ``pairs`` for all strategies. Returns decision results per strategy id.
+
+        Args:
+            pairs: (symbol, timeframe) pairs due for a scan.
+            candles: Candles already fetched this minute, keyed like ``pairs``.
+        """
+        start = time.perf_counter()
+        dag = self.build(pairs, candles)
+        results = await dag.run()
+
+        by_strategy: dict[str, list[dict]] = defaultdict(list)
+        for key, result in results.items():
+            if key[0] != "decision":
+                continue
+            strategy_id, symbol, timeframe = key[1:]
+            if isinstance(result, BaseException):
+                self.failures += 1
+                logger.error(f"Scan failed for {strategy_id} {symbol} {timeframe}: {result}")
+                result = {"symbol": symbol, "timeframe": timeframe, "strategy_id": strategy_id, "error": str(result)}
+            by_strategy[strategy_id].append(result)
+
+        decisions = sum(len(r) for r in by_strategy.values())
+        self.runs += 1
+        self.decisions += decisions
+        self.nodes_run += len(dag)
+        self.nodes_requested += dag.requested
+        self.run_seconds += time.perf_counter() - start
+        if decisions:
+            logger.info(
+                f"Scan planner: {decisions} strategy decisions over {len(pairs)} pairs "
+                f"from {len(dag)} steps ({dag.requested} requested)"
+            )
+        return dict(by_strategy)
+
+    def get_stats(self) -> dict:
+        return {
+            "strategies": len(self.strategies),
+            "loaded_at": self.loaded_at,
+            "last_error": self.last_error,
+            "pairs": len(self.pairs()),
+            "runs": self.runs,
+            "decisions": self.decisions,
+            "candidates_sized": self.candidates_sized,
+            "failures": self.failures,
+            "steps_run": self.nodes_run,
+            "steps_requested": self.nodes_requested,
+            "dedup_ratio": round(self.nodes_requested / self.nodes_run, 2) if self.nodes_run else None,
+            "avg_run_ms": round(self.run_seconds / self.runs * 1000, 1) if self.runs else None,
+        }
+
+
+# --- DAG steps ---
+
+async def _fetch(symbol: str, timeframe: str, prefetched: list[dict] | None) -> list[dict]:
+    if prefetched is not None:
+        return prefetched
+    return await get_recent_candles(symbol, interval=timeframe, limit=SCAN_CANDLES)
+
+
+async def _indicators(symbol: str, timeframe: str, candles: list[dict]):
+    return indicator_snapshots.compute(symbol, timeframe, candles) if candles else None
+
+
+async def _technical(symbol: str, timeframe: str, candles: list[dict], _snapshot) -> dict:
+    from src.agents.technical_analyst import technical_analyst
+    return await technical_analyst.run_with_tracking(symbol, candles=candles, timeframe=timeframe)
+
+
+async def _sentiment(symbol: str) -> dict:
+    from src.agents.alpha_scout import alpha_scout
+    return await alpha_scout.run_with_tracking(symbol, include_macro=True)
+
+
+async def _risk(plan: StrategyPlan, symbol: str, timeframe: str, technical: dict, sizings: dict) -> dict | None:
+    # No candidate signal, nothing to size or veto
+    if orchestrator.skip_reason(technical):
+        return None
+    return await orchestrator.assess_risk(
+        symbol, timeframe, technical,
+        sizing=sizings[(plan.id, symbol, timeframe)],
+        max_risk_per_trade=plan.max_risk_per_trade,
+    )
+
+
+async def _decide(
+    plan: StrategyPlan, symbol: str, timeframe: str, candles: list[dict], technical: dict,
+    risk: dict | None, alpha: dict | None = None,
+) -> dict:
+    return await orchestrator.run_scan_cycle(
+        symbol,
+        strategy_id=plan.id,
+        timeframe=timeframe,
+        inputs={"candles": candles, "technical": technical, "alpha": alpha},
+        risk=risk,
+        min_confidence=plan.min_confidence,
+        agents_enabled=list(plan.agents_enabled),
+        paper=plan.is_paper,
+        max_risk_per_trade=plan.max_risk_per_trade,
+        features=_features(plan, symbol, timeframe),
+    )
+
+
+def _features(plan: StrategyPlan, symbol: str, timeframe: str) -> dict[str, dict | None]:
+    """The strategy's subscribed feature values at the latest closed bar, by label."""
+    if not settings.feature_store_enabled:
+        return {}
+    return {
+        spec.label: feature_store.get(symbol, timeframe, spec.indicator, dict(spec.params))
+        for spec in plan.features
+    }
+
+
+# Global singleton
+scan_planner = ScanPlanner(concurrency=settings.scan_concurrency)
@@ -0,0 +1,203 @@
+"""Scan priority — adaptive per-symbol scan frequency under a global compute budget.
+
+Indicator snapshots are refreshed for every symbol on each candle close (one
+cheap batched pass), but full orchestrator scans are expensive. This module
+decides which (symbol, timeframe) pairs get a full scan and when:
+
+- Each pair gets a heat score in [0, 1] from its latest snapshot: normalized
+  ATR relative to the rest of the universe, volume spike on the closed candle,
+  and proximity to support/resistance or order-block zones.
+- Hot pairs are due on every candle close of their timeframe; warm and quiet
+  ones every 2nd / 4th close (``SCAN_MULTIPLIERS``).
+- Due pairs sit in a heap ordered by (due time, -heat), where the due time is
+  the close that made them due. Each dispatch pops at most the remaining
+  per-minute budget; overflow stays queued for the next minute, oldest first,
+  and is scanned against the latest closed candle when its turn comes.
+
+Multipliers only ever stretch a pair's interval: the hottest pairs are scanned
+once per close, never more often. A scan between closes would analyse the same
+closed candle again, so there is nothing to gain from a shorter interval.
+"""
+
+import heapq
+import itertools
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass
+
+import numpy as np
+
+from src.config import settings
+from src.core.indicator_snapshot import IndicatorSnapshot
+
+logger = logging.getLogger(__name__)
+
+# Heat component weights — must sum to 1.0
+HEAT_WEIGHTS = {
+    "volatility": 0.40,
+    "volume": 0.30,
+    "proximity": 0.30,
+}
+
+# (min heat, scan every N candle closes), checked in order
+SCAN_MULTIPLIERS: tuple[tuple[float, int], ...] = (
+    (0.60, 1),
+    (0.30, 2),
+    (0.00, 4),
+)
+
+# Distance (in ATRs) to a level/zone at which proximity heat reaches 0
+PROXIMITY_ATRS = 2.0
+
+
+@dataclass
+class _PairState:
+    heat: float = 0.0
+    multiplier: int = 1
+    closes_since_scan: int = 0
+    due_since: float | None = None
+    deferred: bool = False
+    entry_id: int = -1
+
+
+class ScanPriorityQueue:
+    """Heap-based due-time queue of (symbol, timeframe) scans."""
+
+    def __init__(self, budget_per_minute: int):
+        self.budget_per_minute = budget_per_minute
+        self._heap: list[tuple[float, float, int, str, str]] = []
+        self._pairs: dict[tuple[str, str], _PairState] = {}
+        self._ids = itertools.count()
+        self._scan_times: deque[float] = deque()
+        self.scans_dispatched = 0
+        self.scans_deferred = 0      # due scans that waited at least one dispatch
+        self.last_deferred = 0       # due scans left queued by the latest dispatch
+
+    def update_batch(self, timeframe: str, snapshots: dict[str, IndicatorSnapshot], now: float | None = None):
+        """Re-score pairs from a batch of fresh snapshots and reschedule them."""
+        now = now if now is not None else time.time()
+        if not snapshots:
+            return
+        natr = {
+            symbol: s.atr / s.current_price if s.current_price else 0.0
+            for symbol, s in snapshots.items()
+        }
+        median_natr = float(np.median(list(natr.values()))) or 1.0
+        for symbol, snapshot in snapshots.items():
+            heat = heat_score(snapshot, natr[symbol] / median_natr)
+            self._reschedule((symbol.upper(), timeframe), heat, now)
+
+    def _reschedule(self, key: tuple[str, str], heat: float, now: float):
+        state = self._pairs.get(key)
+        if state is None:
+            # Never scanned — due on its first close
+            state = self._pairs[key] = _PairState(closes_since_scan=SCAN_MULTIPLIERS[-1][1] - 1)
+        state.heat = heat
+        state.multiplier = next(n for threshold, n in SCAN_MULTIPLIERS if heat >= threshold)
+        state.closes_since_scan += 1
+        if state.due_since is None and state.closes_since_scan < state.multiplier:
+            return
+        if state.due_since is None:
+            state.due_since = now
+        # Re-push (also when already queued) so the heap sees the new heat
+        state.entry_id = next(self._ids)
+        heapq.heappush(self._heap, (state.due_since, -state.heat, state.entry_id, *key))
+
+    def pop_due(self, now: float | None = None) -> list[tuple[str, str]]:
+        """Pairs to scan now, hottest first among equally due, within the budget."""
+        now = now if now is not None else time.time()
+        while self._scan_times and self._scan_times[0] <= now - 60:
+            self._scan_times.popleft()
+        budget = self.budget_per_minute - len(self._scan_times)
+
+        due: list[tuple[str, str]] = []
+        while self._heap and self._heap[0][0] <= now:
+            _, _, entry_id, symbol, timeframe = self._heap[0]
+            state = self._pairs.get((symbol, timeframe))
+            if state is None or state.entry_id != entry_id:
+                heapq.heappop(self._heap)  # superseded by a reschedule
+                continue
+            if len(due) >= budget:
+                break
+            heapq.heappop(self._heap)
+            state.closes_since_scan = 0
+            state.due_since = None
+            state.deferred = False
+            due.append((symbol, timeframe))
+            self._scan_times.append(now)
+
+        # --- Deferrals: every queued pair this dispatch, each pair once per wait ---
+        deferred = 0
+        for state in self._pairs.values():
+            if state.due_since is None:
+                continue
+            deferred += 1
+            if not state.deferred:
+                state.deferred = True
+                self.scans_deferred += 1
+        self.scans_dispatched += len(due)
+        self.last_deferred = deferred
+        if deferred:
+            logger.info(f"Scan budget reached: {len(due)} dispatched, {deferred} deferred")
+        return due
+
+    def get_stats(self) -> dict:
+        by_multiplier: dict[int, int] = {}
+        for state in self._pairs.values():
+            by_multiplier[state.multiplier] = by_multiplier.get(state.multiplier, 0) + 1
+        hottest = sorted(self._pairs.items(), key=lambda kv: -kv[1].heat)[:10]
+        return {
+            "pairs": len(self._pairs),
+            "budget_per_minute": self.budget_per_minute,
+            "scans_last_minute": len(self._scan_times),
+            "scans_dispatched": self.scans_dispatched,
+            "scans_deferred": self.scans_deferred,
+            "last_dispatch_deferred": self.last_deferred,
+            "queued": sum(1 for state in self._pairs.values() if state.due_since is not None),
+            "pairs_by_multiplier": {f"every_{n}_closes": c for n, c in sorted(by_multiplier.items())},
+            "hottest": [
+                {"symbol": s, "timeframe": tf, "heat": round(st.heat, 3), "multiplier": st.multiplier}
+                for (s, tf), st in hottest
+            ],
+        }
+
+
+def heat_score(snapshot: IndicatorSnapshot, relative_natr: float) -> float:
+    """Blend volatility, volume spike and level proximity into a heat score in [0, 1].
+
+    Args:
+        snapshot: Latest indicator snapshot for the pair.
+        relative_natr: ATR/price divided by the universe median for the timeframe.
+    """
+    price, atr = snapshot.current_price, snapshot.atr
+
+    # 2x the median normalized ATR (or more) is maximally hot
+    volatility = min(max(relative_natr / 2, 0.0), 1.0)
+
+    # 3x the baseline volume (or more) is maximally hot
+    rvol = snapshot.volume.get("relative_volume")
+    volume = min(max((rvol - 1) / 2, 0.0), 1.0) if rvol is not None else 0.0
+
+    levels = [
+        snapshot.support_resistance.get("nearest_support"),
+        snapshot.support_resistance.get("nearest_resistance"),
+    ]
+    for side in ("bullish", "bearish"):
+        zones = snapshot.order_blocks.get(side, [])
+        if zones:
+            levels += [zones[-1]["low"], zones[-1]["high"]]
+    distances = [abs(price - level) for level in levels if level]
+    proximity = 0.0
+    if distances and atr > 0:
+        proximity = min(max(1 - min(distances) / (PROXIMITY_ATRS * atr), 0.0), 1.0)
+
+    return (
+        HEAT_WEIGHTS["volatility"] * volatility
+        + HEAT_WEIGHTS["volume"] * volume
+        + HEAT_WEIGHTS["proximity"] * proximity
+    )
+
+
+# Global singleton
+scan_priority = ScanPriorityQueue(budget_per_minute=settings.scan_budget_per_minute)
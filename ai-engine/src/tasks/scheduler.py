@@ -1,6 +1,8 @@
 """APScheduler — Periodic task scheduling for agent scan cycles."""
 
 import logging
+import time
+from datetime import datetime, timezone
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 
@@ -16,13 +18,19 @@ def start_scheduler():
     global _scheduler
     _scheduler = AsyncIOScheduler()
 
-    # Alpha Scout + Technical Analyst: scan every 60s
+    # Alpha Scout + Technical Analyst: scan on each (symbol, timeframe) candle close.
+    # Runs just after every minute boundary; each run only dispatches the
+    # timeframes that actually closed.
+    next_minute = (int(time.time()) // 60 + 1) * 60 + settings.candle_close_delay_seconds
     _scheduler.add_job(
-        _run_scan_cycle,
+        _run_candle_close,
         "interval",
-        seconds=settings.scan_interval_seconds,
-        id="scan_cycle",
-        name="Agent Scan Cycle",
+        seconds=60,
+        start_date=datetime.fromtimestamp(next_minute, tz=timezone.utc),
+        id="candle_close",
+        name="Candle Close Scan",
+        max_instances=1,
+        coalesce=True,
     )
 
     # Risk Sentinel: check every 5s
@@ -44,6 +52,18 @@ def start_scheduler():
         name="Nightly Optimization",
     )
 
+    # Consensus weights: load at startup, then fold in newly resolved votes
+    _scheduler.add_job(
+        _run_agent_weights,
+        "interval",
+        seconds=settings.agent_weights_calibration_seconds,
+        next_run_time=datetime.now(timezone.utc),
+        id="agent_weights",
+        name="Agent Weight Calibration",
+        max_instances=1,
+        coalesce=True,
+    )
+
     # Agent heartbeat: every 30s
     _scheduler.add_job(
         _run_heartbeats,
@@ -53,6 +73,64 @@ def start_scheduler():
         name="Agent Heartbeats",
     )
 
+    # Price snapshot: one bulk refresh, then price alerts against it
+    _scheduler.add_job(
+        _run_price_refresh,
+        "interval",
+        seconds=settings.price_refresh_interval_seconds,
+        id="price_refresh",
+        name="Price Refresh",
+        max_instances=1,
+        coalesce=True,
+    )
+
+    # Open positions: periodic reload for mark-to-market and SL/TP exits,
+    # bulk write of repriced positions
+    if settings.mark_to_market_enabled or settings.exit_triggers_enabled:
+        _scheduler.add_job(
+            _run_mark_to_market,
+            "interval",
+            seconds=settings.mark_to_market_flush_seconds,
+            id="mark_to_market",
+            name="Mark To Market Flush",
+            max_instances=1,
+            coalesce=True,
+        )
+
+    # User alerts: incremental sync
+    if settings.alert_engine_enabled:
+        _scheduler.add_job(
+            _run_alert_sync,
+            "interval",
+            seconds=settings.alert_sync_interval_seconds,
+            id="alert_sync",
+            name="Alert Sync",
+        )
+
+    # Active strategies (scan planner + feature subscriptions): at startup, then periodically
+    _scheduler.add_job(
+        _run_strategy_sync,
+        "interval",
+        seconds=settings.strategy_sync_seconds,
+        next_run_time=datetime.now(timezone.utc),
+        id="strategy_sync",
+        name="Strategy Sync",
+        max_instances=1,
+        coalesce=True,
+    )
+
+    # Feature store: periodic persistence
+    if settings.feature_store_enabled:
+        _scheduler.add_job(
+            _run_feature_flush,
+            "interval",
+            seconds=settings.feature_store_flush_seconds,
+            id="feature_flush",
+            name="Feature Store Flush",
+            max_instances=1,
+            coalesce=True,
+        )
+
     _scheduler.start()
     logger.info("Scheduler started with all jobs")
 
@@ -63,17 +141,19 @@ def stop_scheduler():
     if _scheduler:
         _scheduler.shutdown()
         _scheduler = None
+        if settings.feature_store_enabled:
+            from src.core.feature_store import feature_store
+            feature_store.flush()
         logger.info("Scheduler stopped")
 
 
-async def _run_scan_cycle():
-    """Run a full scan cycle for all configured symbols."""
+async def _run_candle_close():
+    """Run analysis for every (symbol, timeframe) whose candle just closed."""
     try:
-        from src.agents.orchestrator import orchestrator
-        for symbol in settings.default_symbols:
-            await orchestrator.run_scan_cycle(symbol)
+        from src.tasks.candle_close import run_candle_close
+        await run_candle_close(int((time.time() - settings.candle_close_delay_seconds) // 60 * 60))
     except Exception as e:
-        logger.error(f"Scan cycle error: {e}")
+        logger.error(f"Candle close scan error: {e}")
 
 
 async def _run_risk_check():
@@ -95,6 +175,15 @@ async def _run_optimization():
         logger.error(f"Optimization error: {e}")
 
 
+async def _run_agent_weights():
+    """Recalibrate consensus weights from votes resolved since the last run."""
+    try:
+        from src.core.agent_weights import agent_weights
+        await agent_weights.calibrate()
+    except Exception as e:
+        logger.error(f"Agent weight calibration error: {e}")
+
+
 async def _run_heartbeats():
     """Send heartbeats for all agents."""
     try:
@@ -108,3 +197,75 @@ async def _run_heartbeats():
             await agent.heartbeat()
     except Exception as e:
         logger.error(f"Heartbeat error: {e}")
+
+
+async def _run_alert_sync():
+    """Apply created/cancelled alerts and flush queued triggers."""
+    try:
+        from src.core.alert_engine import alert_engine
+        await alert_engine.sync()
+        await alert_engine.flush()
+    except Exception as e:
+        logger.error(f"Alert sync error: {e}")
+
+
+async def _run_price_refresh():
+    """Refresh the shared price snapshot and evaluate price alerts against it."""
+    try:
+        from src.services.prices import price_service
+        if not await price_service.refresh():
+            return
+        if settings.paper_trading_enabled:
+            from src.execution.paper_executor import paper_executor
+            paper_executor.on_prices(price_service.prices)
+            await paper_executor.flush()
+        if settings.mark_to_market_enabled:
+            from src.core.mark_to_market import mark_to_market
+            mark_to_market.on_prices(price_service.prices)
+        if settings.exit_triggers_enabled:
+            from src.core.exit_triggers import exit_triggers
+            exit_triggers.on_prices(price_service.prices)
+            await exit_triggers.flush()
+        if settings.alert_engine_enabled:
+            from src.core.alert_engine import alert_engine
+            alert_engine.on_prices(price_service.prices)
+            await alert_engine.flush()
+    except Exception as e:
+        logger.error(f"Price refresh error: {e}")
+
+
+async def _run_mark_to_market():
+    """Reload open positions when due, then write repriced rows in bulk."""
+    try:
+        from src.core.exit_triggers import exit_triggers
+        from src.core.mark_to_market import mark_to_market
+
+        def reload_due(loaded_at: float | None) -> bool:
+            return loaded_at is None or time.time() - loaded_at >= settings.mark_to_market_reload_seconds
+
+        if settings.exit_triggers_enabled and reload_due(exit_triggers.loaded_at):
+            await exit_triggers.load()
+        if settings.mark_to_market_enabled:
+            if reload_due(mark_to_market.loaded_at):
+                await mark_to_market.load()
+            await mark_to_market.flush()
+    except Exception as e:
+        logger.error(f"Mark-to-market error: {e}")
+
+
+async def _run_strategy_sync():
+    """Reload active strategies for the scan planner and their feature subscriptions."""
+    try:
+        from src.tasks.scan_planner import scan_planner
+        await scan_planner.refresh()
+    except Exception as e:
+        logger.error(f"Strategy sync error: {e}")
+
+
+async def _run_feature_flush():
+    """Persist feature series updated since the last flush."""
+    try:
+        from src.core.feature_store import feature_store
+        feature_store.flush()
+    except Exception as e:
+        logger.error(f"Feature flush error: {e}")
@@ -0,0 +1,115 @@
+"""Agent weight calibration tests."""
+
+import pytest
+
+from src.core import agent_weights as weights_module
+from src.core.agent_weights import (
+    DEFAULT_REGIME,
+    PRIOR_WEIGHTS,
+    UNKNOWN_AGENT_WEIGHT,
+    AgentWeights,
+    build_weights,
+)
+
+
+def _row(agent: str, votes: int, correct: int, regime: str = DEFAULT_REGIME) -> dict:
+    return {"agent_name": agent, "regime": regime, "votes": votes, "correct": correct}
+
+
+class _AccuracyTable:
+    """In-memory ualgo_agent_accuracy answering the calibration queries."""
+
+    def __init__(self, rows: list[dict], fail: bool = False):
+        self.rows = rows
+        self.fail = fail
+        self.executed: list[str] = []
+
+    async def execute_named(self, name: str, **params):
+        if self.fail:
+            raise ConnectionError("pool closed")
+        self.executed.append(name)
+
+    async def fetch_named(self, name: str, **params):
+        return self.rows
+
+
+def test_no_resolved_votes_keeps_the_prior():
+    assert build_weights([]) == {DEFAULT_REGIME: PRIOR_WEIGHTS}
+
+
+def test_accurate_agent_gains_weight_and_the_total_is_preserved():
+    # accuracy = (80 + 20 × 0.5) / (100 + 20) = 0.75 → multiplier 1.5
+    weights = build_weights([_row("technical_analyst", 100, 80)])[DEFAULT_REGIME]
+
+    raw_total = 0.35 * 1.5 + 0.20 + 0.30 + 0.15
+    assert weights["technical_analyst"] == pytest.approx(0.35 * 1.5 / raw_total, abs=1e-6)
+    assert weights["alpha_scout"] == pytest.approx(0.20 / raw_total, abs=1e-6)
+    assert sum(weights.values()) == pytest.approx(sum(PRIOR_WEIGHTS.values()), abs=1e-5)
+
+
+def test_multiplier_is_clipped_for_a_consistently_wrong_agent():
+    weights = build_weights([_row("alpha_scout", 1000, 0)])[DEFAULT_REGIME]
+
+    raw_total = 0.20 * 0.25 + 0.35 + 0.30 + 0.15
+    assert weights["alpha_scout"] == pytest.approx(0.20 * 0.25 / raw_total, abs=1e-6)
+
+
+def test_few_votes_barely_move_the_weight():
+    weights = build_weights([_row("risk_sentinel", 2, 2)])[DEFAULT_REGIME]
+
+    assert weights["risk_sentinel"] == pytest.approx(PRIOR_WEIGHTS["risk_sentinel"], rel=0.1)
+
+
+def test_thin_regime_falls_back_to_the_agents_overall_record():
+    rows = [
+        _row("technical_analyst", 200, 160, "trend_up_low_vol"),
+        _row("technical_analyst", 1, 0, "range_high_vol"),
+    ]
+    weights = build_weights(rows)
+
+    overall = weights[DEFAULT_REGIME]["technical_analyst"]
+    thin = weights["range_high_vol"]["technical_analyst"]
+    assert thin > PRIOR_WEIGHTS["technical_analyst"]
+    assert thin == pytest.approx(overall, rel=0.05)
+    assert weights["trend_up_low_vol"]["technical_analyst"] > overall
+
+
+def test_weight_lookup_falls_back_to_default_regime_and_unknown_agent():
+    engine = AgentWeights()
+    engine.apply([_row("orchestrator", 100, 90, "trend_down_high_vol")])
+
+    assert engine.weight("orchestrator", "unseen_regime") == engine.weight("orchestrator")
+    assert engine.weight("orchestrator", "trend_down_high_vol") > engine.weight("orchestrator")
+    assert engine.weight("sentiment_bot") == UNKNOWN_AGENT_WEIGHT
+
+
+def test_version_bumps_only_when_weights_change():
+    engine = AgentWeights()
+    rows = [_row("technical_analyst", 100, 80)]
+
+    first = engine.apply(rows)
+    assert first.version == 1
+    assert engine.apply(rows) is first
+    assert engine.apply([_row("technical_analyst", 100, 30)]).version == 2
+
+
+async def test_calibrate_accumulates_then_reloads(monkeypatch):
+    table = _AccuracyTable([_row("technical_analyst", 100, 80)])
+    monkeypatch.setattr(weights_module, "db_pool", table)
+    engine = AgentWeights()
+
+    result = await engine.calibrate()
+
+    assert table.executed == ["agent_accuracy.accumulate"]
+    assert result.version == 1 and engine.calibrations == 1
+    assert engine.weight("technical_analyst") > PRIOR_WEIGHTS["technical_analyst"]
+
+
+async def test_failed_calibration_keeps_the_current_table(monkeypatch):
+    monkeypatch.setattr(weights_module, "db_pool", _AccuracyTable([], fail=True))
+    engine = AgentWeights()
+    before = engine.table
+
+    assert await engine.calibrate() is before
+    assert engine.calibrations == 0
+    assert engine.last_error == "pool closed"
@@ -0,0 +1,97 @@
+"""AlertEngine tests."""
+
+from datetime import datetime, timezone
+
+from src.core.alert_engine import AlertEngine
+
+HOUR_MS = 3_600_000
+
+
+def _row(alert_id: str, target: float, frequency: str = "OnlyOnce", **overrides) -> dict:
+    row = {
+        "id": alert_id,
+        "user_id": "u1",
+        "symbol": "btcusdt",
+        "timeframe": "1h",
+        "alert_type": "price_above",
+        "target_price": target,
+        "indicator_type": None,
+        "signal_subtype": None,
+        "status": "active",
+        "condition": "Crossing",
+        "frequency": frequency,
+        "expiration_time": None,
+        "last_triggered_bar_time": None,
+        "name": None,
+        "updated_at": datetime.now(timezone.utc),
+    }
+    row.update(overrides)
+    return row
+
+
+def _engine(*rows: dict) -> AlertEngine:
+    engine = AlertEngine()
+    for row in rows:
+        engine._apply_row(row)
+    return engine
+
+
+def test_crossing_alert_fires_once_when_price_crosses_the_target():
+    engine = _engine(_row("a1", 100.0))
+
+    assert engine.on_price("BTCUSDT", 99.0) == 0
+    assert engine.on_price("BTCUSDT", 101.0) == 1
+    assert set(engine._pending) == {"a1"}
+    # OnlyOnce alerts leave the book once fired
+    assert engine.on_price("BTCUSDT", 99.0) == 0
+    assert engine.on_price("BTCUSDT", 102.0) == 0
+
+
+def test_crossing_down_alert_ignores_moves_that_stay_above():
+    engine = _engine(_row("a1", 100.0, alert_type="price_below"))
+
+    engine.on_prices({"BTCUSDT": 105.0})
+    assert engine.on_prices({"BTCUSDT": 101.0}) == 0
+    assert engine.on_prices({"BTCUSDT": 99.5}) == 1
+
+
+def test_level_alert_fires_without_a_previous_price():
+    engine = _engine(_row("a1", 100.0, condition="GreaterThan"))
+
+    assert engine.on_price("BTCUSDT", 100.5) == 1
+
+
+def test_bar_close_alert_fires_only_on_the_close():
+    engine = _engine(_row("a1", 100.0, frequency="OncePerBarClose"))
+    assert engine.close_targets() == {("BTCUSDT", "1h")}
+
+    engine.on_candle_close("BTCUSDT", "1h", 99.0, 0)
+    # Intra-bar ticks through the target don't trigger a bar-close alert
+    assert engine.on_prices({"BTCUSDT": 99.0}) == 0
+    assert engine.on_prices({"BTCUSDT": 103.0}) == 0
+    assert engine.on_price("BTCUSDT", 101.0) == 0
+    assert not engine._pending
+
+    assert engine.on_candle_close("BTCUSDT", "1h", 101.0, HOUR_MS) == 1
+    assert engine._pending["a1"].bar_time == HOUR_MS
+
+
+def test_bar_close_alert_fires_once_per_bar():
+    engine = _engine(_row("a1", 100.0, frequency="OncePerBarClose", condition="GreaterThan"))
+
+    assert engine.on_candle_close("BTCUSDT", "1h", 101.0, HOUR_MS) == 1
+    engine._pending.clear()
+    # The same bar replayed doesn't fire again; the next one does
+    assert engine.on_candle_close("BTCUSDT", "1h", 102.0, HOUR_MS) == 0
+    assert engine.on_candle_close("BTCUSDT", "1h", 102.0, 2 * HOUR_MS) == 1
+
+
+def test_close_targets_follow_alert_changes():
+    engine = _engine(
+        _row("a1", 100.0, frequency="OncePerBarClose"),
+        _row("a2", 100.0),
+    )
+    assert engine.close_targets() == {("BTCUSDT", "1h")}
+
+    engine._apply_row(_row("a1", 100.0, frequency="OncePerBarClose", status="cancelled"))
+    assert engine.close_targets() == set()
@@ -0,0 +1,39 @@
+"""DatabasePool write hook tests."""
+
+from src.services.db import DatabasePool, _write_targets
+
+
+def _notified(query: str) -> list[str]:
+    pool = DatabasePool()
+    tables: list[str] = []
+    pool.on_write(tables.append)
+    pool._notify_write(query)
+    return tables
+
+
+def test_plain_writes_notify_their_table():
+    assert _notified("INSERT INTO ualgo_signal (symbol) VALUES ($1)") == ["ualgo_signal"]
+    assert _notified("  update UALGO_POSITION set current_price = $1") == ["ualgo_position"]
+    assert _notified("DELETE FROM ONLY ualgo_alert_log WHERE id = $1") == ["ualgo_alert_log"]
+
+
+def test_reads_notify_nothing():
+    assert _notified("SELECT * FROM ualgo_signal ORDER BY created_at DESC LIMIT 50") == []
+    assert _notified("SELECT id FROM ualgo_position WHERE status = 'open' FOR UPDATE SKIP LOCKED") == []
+
+
+def test_data_modifying_ctes_notify_every_target_once():
+    query = """WITH fills AS (SELECT * FROM unnest($1::bigint[]) AS t(signal_id)),
+           trades AS (INSERT INTO ualgo_trade (signal_id) SELECT signal_id FROM fills),
+           executed AS (UPDATE ualgo_signal SET status = 'executed' WHERE id IN (SELECT signal_id FROM fills)),
+           more AS (INSERT INTO ualgo_trade (signal_id) SELECT signal_id FROM fills)
+       INSERT INTO ualgo_position (signal_id) SELECT signal_id FROM fills RETURNING id"""
+
+    assert _notified(query) == ["ualgo_trade", "ualgo_signal", "ualgo_position"]
+
+
+def test_upsert_and_quoted_keywords_are_not_targets():
+    query = """INSERT INTO ualgo_agent_weight (agent, weight) VALUES ($1, $2)
+       ON CONFLICT (agent) DO UPDATE SET weight = EXCLUDED.weight, note = 'update ualgo_signal'"""
+
+    assert _write_targets(query) == ("ualgo_agent_weight",)
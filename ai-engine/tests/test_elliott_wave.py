@@ -0,0 +1,92 @@
+"""Elliott wave tracker tests."""
+
+import numpy as np
+
+from src.indicators.elliott_wave import WaveTracker, detect_elliott_wave
+
+# Single 5% degree so each leg below is exactly one zigzag swing
+DEGREE = (("minor", 0.05),)
+
+# 1-2-3-4-5 up, A-B-C down; every rule holds
+IMPULSE = [100, 120, 110, 150, 130, 160, 140]
+CYCLE = IMPULSE + [150, 125, 135]
+
+
+def _path(pivots: list[float]) -> np.ndarray:
+    """Closes walking between ``pivots`` one point per bar."""
+    legs = [np.linspace(a, b, int(abs(b - a)) + 1)[:-1] for a, b in zip(pivots, pivots[1:])]
+    return np.concatenate(legs + [np.array([pivots[-1]], dtype=float)])
+
+
+def _track(pivots: list[float]) -> WaveTracker:
+    tracker = WaveTracker(DEGREE)
+    for i, close in enumerate(_path(pivots).tolist()):
+        tracker.update(close, close, i)
+    return tracker
+
+
+def test_impulse_is_counted_through_wave_five():
+    tracker = _track(IMPULSE)
+    result = tracker.result()
+
+    assert result["wave_count"] == 5
+    assert result["trend"] == "bullish"
+    assert result["current_wave_type"] == "impulse"
+    structure = result["degrees"]["minor"]
+    assert structure["in_progress"] == "A"
+    assert [(w["label"], w["from_price"], w["to_price"]) for w in structure["waves"]] == [
+        ("1", 100, 120), ("2", 120, 110), ("3", 110, 150), ("4", 150, 130), ("5", 130, 160),
+    ]
+
+
+def test_correction_completes_the_cycle_and_restarts_from_c():
+    tracker = _track(CYCLE)
+    structure = tracker.result()["degrees"]["minor"]
+
+    assert tracker.result()["wave_label"] == "C"
+    assert tracker.result()["current_wave_type"] == "correction"
+    assert structure["cycles"] == 1
+    assert structure["invalidations"] == 0
+
+    # The next confirmed pivot is wave 1 of a count starting at C's end
+    for i, close in enumerate(_path([135, 170, 160]).tolist(), start=tracker.bars):
+        tracker.update(close, close, i)
+    structure = tracker.result()["degrees"]["minor"]
+    assert structure["completed_wave"] == "1"
+    assert structure["waves"][0]["from_price"] == 125
+
+
+def test_wave_two_below_the_origin_restarts_the_count():
+    tracker = _track([100, 120, 95, 101])
+    structure = tracker.result()["degrees"]["minor"]
+
+    assert structure["invalidations"] == 1
+    # The break becomes wave 1 of a bearish count
+    assert structure["trend"] == "bearish"
+    assert structure["completed_wave"] == "1"
+    assert (structure["waves"][0]["from_price"], structure["waves"][0]["to_price"]) == (120, 95)
+
+
+def test_wave_four_overlapping_wave_one_is_invalid():
+    tracker = _track([100, 120, 110, 150, 118, 125])
+
+    assert tracker.result()["degrees"]["minor"]["invalidations"] == 1
+    assert tracker.result()["wave_label"] == "1"
+
+
+def test_incremental_tracking_matches_a_one_off_pass():
+    closes = _path(CYCLE)
+    tracker = WaveTracker()
+    for i, close in enumerate(closes.tolist()):
+        tracker.update(close, close, i)
+
+    assert tracker.result() == detect_elliott_wave(closes)
+
+
+def test_result_is_reused_until_a_pivot_confirms():
+    tracker = _track(IMPULSE)
+    first = tracker.result()
+
+    # Still inside the A leg: no new pivot, same cached result
+    tracker.update(139.0, 139.0, tracker.bars)
+    assert tracker.result() is first
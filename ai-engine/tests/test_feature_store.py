@@ -0,0 +1,97 @@
+"""FeatureStore tests."""
+
+from types import SimpleNamespace
+
+import numpy as np
+
+from src.core.feature_store import FeatureStore, FeatureSpec
+
+
+def _row(strategy_id: str, features: list) -> dict:
+    return {
+        "id": strategy_id,
+        "symbols": ["btcusdt"],
+        "timeframes": ["1h"],
+        "config": {"features": features},
+    }
+
+
+def test_subscriptions_share_one_series(tmp_path):
+    store = FeatureStore(tmp_path)
+    store.apply([_row("a", ["rsi"]), _row("b", [{"indicator": "rsi", "params": {"period": 14}}])])
+
+    assert store.get_stats()["features"] == 1
+    assert store.get_stats()["subscriptions"] == 2
+    assert store.targets() == {("BTCUSDT", "1h")}
+
+
+def test_get_reads_the_latest_value(tmp_path):
+    store = FeatureStore(tmp_path)
+    store.subscribe("s", "BTCUSDT", "1h", "ema", {"period": 50})
+    series = store._series[("BTCUSDT", "1h", FeatureSpec.parse("ema", {"period": 50}))]
+    series.append(1_000, (101.5,))
+    series.append(2_000, (102.0,))
+
+    assert store.get("btcusdt", "1h", "ema", {"period": 50}) == {"bar_time": 2_000, "value": 102.0}
+    assert store.get("BTCUSDT", "1h", "ema", {"period": 50}, bar_time=1_000)["value"] == 101.5
+    assert store.get("BTCUSDT", "1h", "ema") is None     # period 20 is not subscribed
+
+
+def test_failed_write_on_release_does_not_abort_apply(tmp_path):
+    # A file where the store directory should be makes every write fail
+    root = tmp_path / "features"
+    root.write_text("")
+    store = FeatureStore(root)
+    store.apply([_row("a", ["rsi"]), _row("b", ["atr"])])
+    for series in store._series.values():
+        series.append(1_000, (1.0,))
+
+    store.apply([_row("b", ["atr", "sma"])])
+
+    assert {spec.indicator for _, _, spec in store._series} == {"atr", "sma"}
+    assert store.get_stats()["subscribers"] == 1
+
+
+def _snapshot(bar_time: int, closes: list[float]) -> SimpleNamespace:
+    return SimpleNamespace(symbol="BTCUSDT", timeframe="1h", bar_time=bar_time, closes=np.array(closes))
+
+
+def test_shared_feature_is_computed_once_and_reloaded_from_disk(tmp_path):
+    store = FeatureStore(tmp_path)
+    store.subscribe("strategy:a", "btcusdt", "1h", "sma", {"period": 3})
+    store.subscribe("strategy:b", "BTCUSDT", "1h", "sma", {"period": 3})
+
+    store.on_snapshot(_snapshot(1_000, [1.0, 2.0, 3.0, 4.0]))
+    store.on_snapshot(_snapshot(1_000, [1.0, 2.0, 3.0, 4.0]))     # same bar again
+    assert store.computed == 1
+    assert store.get("BTCUSDT", "1h", "sma", {"period": 3}) == {"bar_time": 1_000, "value": 3.0}
+
+    # One subscriber leaving keeps the series for the other
+    store.unsubscribe("strategy:a")
+    store.on_snapshot(_snapshot(2_000, [2.0, 3.0, 4.0, 8.0]))
+    assert store.get("BTCUSDT", "1h", "sma", {"period": 3})["value"] == 5.0
+    assert store.flush() == 1
+    assert store.flush() == 0
+    path = store.path("BTCUSDT", "1h", FeatureSpec.parse("sma", {"period": 3}))
+    assert path.exists()
+
+    reloaded = FeatureStore(tmp_path)
+    reloaded.subscribe("strategy:c", "BTCUSDT", "1h", "sma", {"period": 3})
+    assert reloaded.loaded == 1
+    assert reloaded.get("BTCUSDT", "1h", "sma", {"period": 3}, bar_time=1_000)["value"] == 3.0
+    # Bars already on disk are not recomputed
+    reloaded.on_snapshot(_snapshot(2_000, [2.0, 3.0, 4.0, 8.0]))
+    assert reloaded.computed == 0
+    assert reloaded.history("BTCUSDT", "1h", "sma", {"period": 3}).tolist() == [[1_000, 3.0], [2_000, 5.0]]
+
+
+def test_releasing_the_last_subscriber_persists_unflushed_bars(tmp_path):
+    store = FeatureStore(tmp_path)
+    store.subscribe("strategy:a", "BTCUSDT", "1h", "sma", {"period": 2})
+    store.on_snapshot(_snapshot(1_000, [1.0, 3.0]))
+
+    store.unsubscribe("strategy:a")
+
+    assert store.targets() == set()
+    path = store.path("BTCUSDT", "1h", FeatureSpec.parse("sma", {"period": 2}))
+    assert np.load(path).tolist() == [[1_000, 2.0]]
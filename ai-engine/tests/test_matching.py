@@ -0,0 +1,200 @@
+"""MatchingEngine tests."""
+
+import pytest
+
+from src.execution.matching import (
+    FeeModel,
+    MatchingEngine,
+    Order,
+    OrderSide,
+    OrderStatus,
+    OrderType,
+    SlippageModel,
+)
+
+
+def _engine(half_spread_bps: float = 0.0, impact_bps: float = 0.0) -> MatchingEngine:
+    return MatchingEngine(
+        slippage=SlippageModel(half_spread_bps=half_spread_bps, impact_bps=impact_bps),
+        fees=FeeModel(maker_bps=2.0, taker_bps=5.0),
+    )
+
+
+def _order(side: OrderSide, type_: OrderType, quantity: float = 1.0, **kwargs) -> Order:
+    return Order(symbol="btcusdt", side=side, type=type_, quantity=quantity, **kwargs)
+
+
+# --- Market orders ---
+
+def test_market_order_fills_immediately_with_slippage_and_taker_fee():
+    engine = _engine(half_spread_bps=10.0)
+    engine.on_price("BTCUSDT", 100.0)
+
+    [fill] = engine.submit(_order(OrderSide.BUY, OrderType.MARKET, quantity=2.0))
+
+    assert fill.price == pytest.approx(100.1)
+    assert fill.slippage == pytest.approx(0.001)
+    assert fill.liquidity == "taker"
+    assert fill.fee == pytest.approx(100.1 * 2.0 * 5.0 / 10_000)
+    assert fill.order.status == OrderStatus.FILLED
+    assert fill.order.symbol == "BTCUSDT"
+
+
+def test_sell_slippage_moves_price_down():
+    engine = _engine(half_spread_bps=10.0)
+    engine.on_price("BTCUSDT", 100.0)
+    [fill] = engine.submit(_order(OrderSide.SELL, OrderType.MARKET))
+    assert fill.price == pytest.approx(99.9)
+
+
+def test_market_impact_grows_with_notional():
+    engine = _engine(impact_bps=10.0)
+    engine.on_price("BTCUSDT", 100.0)
+    # 100_000 notional is one impact unit: 10 bps
+    [fill] = engine.submit(_order(OrderSide.BUY, OrderType.MARKET, quantity=1000.0))
+    assert fill.price == pytest.approx(100.1)
+
+
+def test_market_order_without_price_waits_for_first_tick():
+    engine = _engine()
+    order = _order(OrderSide.BUY, OrderType.MARKET)
+    assert engine.submit(order) == []
+    assert engine.open_orders() == [order]
+
+    [fill] = engine.on_price("BTCUSDT", 50.0)
+    assert fill.order is order
+    assert fill.price == 50.0
+    assert engine.open_orders() == []
+
+
+# --- Limit orders ---
+
+def test_resting_limit_fills_at_limit_with_maker_fee():
+    engine = _engine(half_spread_bps=10.0)
+    engine.on_price("BTCUSDT", 100.0)
+    order = _order(OrderSide.BUY, OrderType.LIMIT, limit_price=95.0)
+    assert engine.submit(order) == []
+
+    assert engine.on_price("BTCUSDT", 96.0) == []
+    [fill] = engine.on_price("BTCUSDT", 94.0)
+
+    assert fill.price == 95.0
+    assert fill.liquidity == "maker"
+    assert fill.slippage == 0.0
+    assert fill.fee == pytest.approx(95.0 * 2.0 / 10_000)
+
+
+def test_resting_sell_limit_fills_when_price_rises_to_it():
+    engine = _engine()
+    engine.on_price("BTCUSDT", 100.0)
+    engine.submit(_order(OrderSide.SELL, OrderType.LIMIT, limit_price=105.0))
+    assert engine.on_price("BTCUSDT", 104.0) == []
+    [fill] = engine.on_price("BTCUSDT", 105.0)
+    assert fill.price == 105.0
+
+
+def test_marketable_limit_fills_as_taker_capped_at_limit():
+    engine = _engine(half_spread_bps=50.0)
+    engine.on_price("BTCUSDT", 100.0)
+
+    # Slipped price 100.5 is capped at the 100.2 limit
+    [capped] = engine.submit(_order(OrderSide.BUY, OrderType.LIMIT, limit_price=100.2))
+    assert capped.liquidity == "taker"
+    assert capped.price == pytest.approx(100.2)
+
+    # Within the limit the slipped price stands
+    [slipped] = engine.submit(_order(OrderSide.BUY, OrderType.LIMIT, limit_price=101.0))
+    assert slipped.price == pytest.approx(100.5)
+
+    [sell] = engine.submit(_order(OrderSide.SELL, OrderType.LIMIT, limit_price=99.8))
+    assert sell.price == pytest.approx(99.8)
+
+
+def test_limit_order_requires_limit_price():
+    with pytest.raises(ValueError):
+        _engine().submit(_order(OrderSide.BUY, OrderType.LIMIT))
+
+
+# --- Stop orders ---
+
+def test_buy_stop_triggers_at_or_above_stop_as_taker():
+    engine = _engine(half_spread_bps=10.0)
+    engine.on_price("BTCUSDT", 100.0)
+    engine.submit(_order(OrderSide.BUY, OrderType.STOP, stop_price=105.0))
+
+    assert engine.on_price("BTCUSDT", 104.9) == []
+    [fill] = engine.on_price("BTCUSDT", 106.0)
+
+    # Filled off the triggering price, not the stop level
+    assert fill.price == pytest.approx(106.0 * 1.001)
+    assert fill.liquidity == "taker"
+    assert fill.fee == pytest.approx(fill.notional * 5.0 / 10_000)
+
+
+def test_sell_stop_triggers_at_or_below_stop():
+    engine = _engine()
+    engine.on_price("BTCUSDT", 100.0)
+    engine.submit(_order(OrderSide.SELL, OrderType.STOP, stop_price=95.0))
+    assert engine.on_price("BTCUSDT", 95.1) == []
+    [fill] = engine.on_price("BTCUSDT", 95.0)
+    assert fill.price == 95.0
+
+
+def test_stop_already_through_fills_on_submit():
+    engine = _engine()
+    engine.on_price("BTCUSDT", 90.0)
+    [fill] = engine.submit(_order(OrderSide.SELL, OrderType.STOP, stop_price=95.0))
+    assert fill.price == 90.0
+
+
+def test_stop_order_requires_stop_price():
+    with pytest.raises(ValueError):
+        _engine().submit(_order(OrderSide.SELL, OrderType.STOP))
+
+
+# --- Cancel ---
+
+def test_cancel_removes_resting_order():
+    engine = _engine()
+    engine.on_price("BTCUSDT", 100.0)
+    order = _order(OrderSide.BUY, OrderType.LIMIT, limit_price=95.0)
+    engine.submit(order)
+
+    assert engine.cancel(order.id)
+    assert order.status == OrderStatus.CANCELED
+    assert engine.on_price("BTCUSDT", 90.0) == []
+    assert not engine.cancel(order.id)
+
+
+def test_cancel_pending_market_order():
+    engine = _engine()
+    order = _order(OrderSide.BUY, OrderType.MARKET)
+    engine.submit(order)
+    assert engine.cancel(order.id)
+    assert engine.on_price("BTCUSDT", 100.0) == []
+
+
+def test_non_positive_quantity_is_rejected():
+    with pytest.raises(ValueError):
+        _engine().submit(_order(OrderSide.BUY, OrderType.MARKET, quantity=0.0))
+
+
+# --- Price batches ---
+
+def test_on_prices_normalizes_symbol_case():
+    engine = _engine()
+    engine.on_price("BTCUSDT", 100.0)
+    engine.submit(_order(OrderSide.BUY, OrderType.LIMIT, limit_price=95.0))
+
+    [fill] = engine.on_prices({"btcusdt": 94.0, "ethusdt": 10.0})
+
+    assert fill.price == 95.0
+    assert engine.last_price("BTCUSDT") == 94.0
+    assert engine.last_price("ETHUSDT") == 10.0
+
+
+def test_replay_feeds_ticks_in_order():
+    engine = _engine()
+    engine.submit(_order(OrderSide.SELL, OrderType.STOP, stop_price=95.0))
+    fills = engine.replay([(1.0, "BTCUSDT", 100.0), (2.0, "BTCUSDT", 96.0), (3.0, "BTCUSDT", 94.0)])
+    assert [(f.ts, f.price) for f in fills] == [(3.0, 94.0)]
@@ -0,0 +1,84 @@
+"""Portfolio VaR / CVaR tests."""
+
+import numpy as np
+import pytest
+
+from src.core import portfolio_var as var_module
+from src.core.portfolio_var import PortfolioVaR, _tail
+
+HOUR_MS = 3_600_000
+
+
+@pytest.fixture(autouse=True)
+def _settings(monkeypatch):
+    monkeypatch.setattr(var_module.settings, "var_confidence", 0.95)
+    monkeypatch.setattr(var_module.settings, "var_horizon_bars", 1)
+    monkeypatch.setattr(var_module.settings, "var_simulations", 200_000)
+
+
+def _candles(returns) -> list[dict]:
+    closes = 100.0 * np.cumprod(np.concatenate([[1.0], 1.0 + np.asarray(returns)]))
+    return [{"open_time": i * HOUR_MS, "close": float(c)} for i, c in enumerate(closes)]
+
+
+def test_tail_of_a_uniform_loss_sample():
+    var, cvar = _tail(np.arange(1.0, 101.0), 0.95)
+
+    assert var == 95.0
+    assert cvar == pytest.approx(np.mean([95, 96, 97, 98, 99, 100]))
+
+
+def test_historical_var_is_the_empirical_loss_quantile():
+    # 200 one-bar returns of −0.1% … −20% → a long 1000 notional loses 1 … 200
+    rng = np.random.default_rng(7)
+    returns = -rng.permutation(np.arange(1, 201)) / 1000
+    var = PortfolioVaR(seed=1)
+    var.build({"BTCUSDT": _candles(returns)})
+
+    result = var.evaluate({"BTCUSDT": 1000.0}, equity=10_000.0, method="historical")
+
+    assert result["scenarios"] == 200
+    assert result["var"] == pytest.approx(190.0)
+    assert result["cvar"] == pytest.approx(np.mean(np.arange(190, 201)))
+    assert result["var_pct"] == pytest.approx(0.019)
+
+
+def test_monte_carlo_matches_the_normal_quantile():
+    rng = np.random.default_rng(3)
+    returns = rng.normal(0.0005, 0.02, 400)
+    mu, sigma = returns.mean(), returns.std(ddof=1)
+    var = PortfolioVaR(seed=11)
+    var.build({"ETHUSDT": _candles(returns)})
+
+    result = var.evaluate({"ETHUSDT": 10_000.0}, equity=100_000.0, method="monte_carlo")
+
+    z, density = 1.6448536, 0.1031356     # N(0,1) 95% quantile and its pdf
+    assert result["var"] == pytest.approx(10_000.0 * (z * sigma - mu), rel=0.02)
+    assert result["cvar"] == pytest.approx(10_000.0 * (sigma * density / 0.05 - mu), rel=0.02)
+    assert result["cvar"] > result["var"]
+
+
+def test_offsetting_positions_on_identical_series_carry_no_risk():
+    returns = np.random.default_rng(5).normal(0.0, 0.03, 300)
+    var = PortfolioVaR(seed=2)
+    var.build({"BTCUSDT": _candles(returns), "BTCUSDC": _candles(returns)})
+
+    for method in ("historical", "monte_carlo"):
+        result = var.evaluate({"BTCUSDT": 5000.0, "BTCUSDC": -5000.0}, equity=10_000.0, method=method)
+        assert result["var"] == pytest.approx(0.0, abs=0.01)
+
+
+def test_short_history_and_unknown_symbols_are_reported_uncovered():
+    var = PortfolioVaR(seed=0)
+    var.build({
+        "BTCUSDT": _candles(np.full(200, 0.001)),
+        "NEWUSDT": _candles(np.full(20, 0.001)),
+    })
+
+    result = var.evaluate({"NEWUSDT": 1000.0, "XRPUSDT": 500.0}, equity=10_000.0)
+
+    assert var.symbols == ["BTCUSDT"]
+    assert result["uncovered_symbols"] == ["NEWUSDT", "XRPUSDT"]
+    assert result["var"] == 0.0
+    with pytest.raises(ValueError):
+        var.evaluate({"BTCUSDT": 1000.0}, equity=10_000.0, method="parametric")
@@ -0,0 +1,54 @@
+"""Position sizing tests."""
+
+import pytest
+
+from src.core.position_sizing import PositionSizer
+
+
+def _candidate(symbol: str, max_risk: float | None = None, atr: float = 2.0) -> dict:
+    return {"symbol": symbol, "entry_price": 100.0, "stop_loss": 95.0, "atr": atr, "max_risk_per_trade": max_risk}
+
+
+def test_per_candidate_risk_limit(monkeypatch):
+    monkeypatch.setattr("src.core.position_sizing.settings.max_risk_per_trade", 0.02)
+    monkeypatch.setattr("src.core.position_sizing.settings.max_single_asset_ratio", 1.0)
+    monkeypatch.setattr("src.core.position_sizing.settings.sizing_gross_exposure", 10.0)
+
+    strict, default = PositionSizer().size(
+        [_candidate("BTCUSDT", 0.005), _candidate("ETHUSDT")], equity=10_000, method="fixed_fractional"
+    )
+
+    # 0.5% and 2% of 10k over a 5.0 stop
+    assert strict["quantity"] == pytest.approx(10.0)
+    assert strict["risk_amount"] == pytest.approx(50.0)
+    assert strict["max_risk_per_trade"] == 0.005
+    assert default["quantity"] == pytest.approx(40.0)
+    assert default["max_risk_per_trade"] == 0.02
+
+
+def test_risk_parity_splits_the_cycle_allocation(monkeypatch):
+    monkeypatch.setattr("src.core.position_sizing.settings.sizing_cycle_allocation", 0.10)
+    monkeypatch.setattr("src.core.position_sizing.settings.max_risk_per_trade", 1.0)
+    monkeypatch.setattr("src.core.position_sizing.settings.max_single_asset_ratio", 1.0)
+
+    calm, wild = PositionSizer().size(
+        [_candidate("BTCUSDT", atr=1.0), _candidate("ETHUSDT", atr=3.0)], equity=10_000, method="risk_parity"
+    )
+
+    # 1_000 allocated in inverse proportion to ATR: 750 / 250
+    assert calm["notional"] == pytest.approx(750.0)
+    assert wild["notional"] == pytest.approx(250.0)
+
+
+def test_concentration_is_cumulative_across_the_batch(monkeypatch):
+    monkeypatch.setattr("src.core.position_sizing.settings.max_risk_per_trade", 0.02)
+    monkeypatch.setattr("src.core.position_sizing.settings.max_single_asset_ratio", 0.25)
+
+    first, second = PositionSizer().size(
+        [_candidate("BTCUSDT"), _candidate("BTCUSDT")], equity=10_000, method="fixed_fractional"
+    )
+
+    # Each wants 4_000 notional; the symbol is capped at 2_500 in total
+    assert first["notional"] == pytest.approx(2_500.0)
+    assert second["notional"] == pytest.approx(0.0)
+    assert first["capped_by"] == second["capped_by"] == "concentration"
@@ -0,0 +1,53 @@
+"""Price service tests."""
+
+from datetime import datetime, timedelta, timezone
+
+from src.services import prices as prices_module
+from src.services.prices import PriceService
+
+T0 = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+class _CacheTable:
+    """In-memory ualgo_price_cache answering the prices.cache_rows query."""
+
+    def __init__(self):
+        self.rows: dict[str, dict] = {}
+        self.queries: list[datetime | None] = []
+
+    def write(self, symbol: str, price: float, updated_at: datetime):
+        self.rows[symbol] = {"symbol": symbol, "price": price, "updated_at": updated_at}
+
+    async def fetch_named(self, name: str, since: datetime | None = None):
+        self.queries.append(since)
+        return [r for r in self.rows.values() if since is None or r["updated_at"] >= since]
+
+
+async def test_row_written_at_the_watermark_time_is_picked_up(monkeypatch):
+    table = _CacheTable()
+    monkeypatch.setattr(prices_module, "db_pool", table)
+    service = PriceService()
+
+    table.write("BTCUSDT", 100.0, T0)
+    assert await service.refresh_from_db() == 1
+
+    # Committed after the previous read, with the same updated_at
+    table.write("ETHUSDT", 10.0, T0)
+    assert await service.refresh_from_db() == 1
+    assert service.get("ETHUSDT") == 10.0
+    assert table.queries[-1] == T0
+
+
+async def test_rows_at_the_watermark_are_not_applied_twice(monkeypatch):
+    table = _CacheTable()
+    monkeypatch.setattr(prices_module, "db_pool", table)
+    service = PriceService()
+
+    table.write("BTCUSDT", 100.0, T0)
+    await service.refresh_from_db()
+    assert await service.refresh_from_db() == 0
+
+    table.write("BTCUSDT", 101.0, T0 + timedelta(seconds=1))
+    assert await service.refresh_from_db() == 1
+    assert service.get("BTCUSDT") == 101.0
+    assert service.db_rows_applied == 2
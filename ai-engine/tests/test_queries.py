@@ -0,0 +1,41 @@
+"""Named query rendering tests."""
+
+from src.services.queries import QueryRegistry
+
+
+def _bind(sql: str, **params):
+    registry = QueryRegistry()
+    registry.register("q", sql)
+    return registry.bind("q", params)
+
+
+def test_placeholders_are_numbered_in_order_and_reused():
+    sql, args = _bind("SELECT * FROM t WHERE a = :a AND b = :b OR a2 = :a", a=1, b=2)
+    assert sql == "SELECT * FROM t WHERE a = $1 AND b = $2 OR a2 = $1"
+    assert args == [1, 2]
+
+
+def test_casts_are_left_alone():
+    sql, args = _bind("SELECT :ts::timestamptz, 'epoch'::timestamptz", ts="x")
+    assert sql == "SELECT $1::timestamptz, 'epoch'::timestamptz"
+    assert args == ["x"]
+
+
+def test_string_literals_are_not_substituted():
+    sql, args = _bind("SELECT 'at :noon', 'it''s :late' WHERE id = :id", id=7)
+    assert sql == "SELECT 'at :noon', 'it''s :late' WHERE id = $1"
+    assert args == [7]
+
+
+def test_quoted_identifiers_and_dollar_quotes_are_not_substituted():
+    sql, args = _bind('SELECT "col:x", $$ :body $$, $fn$ :tag $fn$ FROM t WHERE id = :id', id=1)
+    assert sql == 'SELECT "col:x", $$ :body $$, $fn$ :tag $fn$ FROM t WHERE id = $1'
+    assert args == [1]
+
+
+def test_comments_are_not_substituted():
+    sql, args = _bind(
+        "SELECT 1 -- filter by :ignored\nFROM t /* :also\nignored */ WHERE id = :id", id=3
+    )
+    assert sql == "SELECT 1 -- filter by :ignored\nFROM t /* :also\nignored */ WHERE id = $1"
+    assert args == [3]
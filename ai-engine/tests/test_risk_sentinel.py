@@ -0,0 +1,29 @@
+"""RiskSentinel tests."""
+
+import pytest
+
+from src.agents.risk_sentinel import RiskSentinelAgent
+
+
+def test_risk_summary_reports_configured_thresholds():
+    sentinel = RiskSentinelAgent()
+    sentinel.max_risk_per_trade = 0.015
+
+    summary = sentinel.get_risk_summary()
+
+    assert summary["kill_switch_active"] is False
+    assert summary["cool_down_active"] is False
+    assert summary["thresholds"]["max_risk_per_trade"] == 0.015
+
+
+def test_trade_risks_are_scored_in_one_pass():
+    sentinel = RiskSentinelAgent()
+    risks = sentinel.compute_trade_risks(
+        [
+            {"entry_price": 100.0, "stop_loss": 95.0, "quantity": 20.0},
+            {"entry_price": 100.0, "stop_loss": None, "quantity": 20.0},
+            {"entry_price": 50.0, "stop_loss": 52.0, "quantity": 10.0},
+        ],
+        {"total_value": 10_000.0},
+    )
+    assert risks.tolist() == pytest.approx([0.01, 0.0, 0.002])
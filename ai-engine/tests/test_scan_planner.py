@@ -0,0 +1,136 @@
+"""Scan planner tests: shared DAG steps and per-dispatch batch sizing."""
+
+import pytest
+
+from src.tasks import scan_planner as planner_module
+from src.core.feature_store import FeatureSpec
+from src.tasks.scan_planner import ScanDAG, ScanPlanner, StrategyPlan
+
+
+def _plan(plan_id: str, symbols: tuple[str, ...], max_risk: float | None = None) -> StrategyPlan:
+    return StrategyPlan(
+        id=plan_id,
+        symbols=symbols,
+        timeframes=("1h",),
+        agents_enabled=("technical_analyst", "risk_sentinel"),
+        max_risk_per_trade=max_risk,
+    )
+
+
+@pytest.fixture
+def planner(monkeypatch):
+    calls = {"size": [], "risk": [], "decide": []}
+    orchestrator = planner_module.orchestrator
+
+    async def fetch(symbol, timeframe, prefetched):
+        return [{"close": 1.0}]
+
+    async def indicators(symbol, timeframe, candles):
+        return None
+
+    async def technical(symbol, timeframe, candles, _snapshot):
+        if symbol == "BADUSDT":
+            raise RuntimeError("analysis failed")
+        if symbol == "FLATUSDT":
+            return {"direction": "NEUTRAL", "confidence": 0.1}
+        return {"direction": "LONG", "confidence": 0.8, "entry_price": 100.0, "stop_loss": 95.0, "atr": 2.0}
+
+    async def size_candidates(candidates):
+        calls["size"].append(candidates)
+        return [{"quantity": 1.0, "max_risk_per_trade": c["max_risk_per_trade"]} for c in candidates]
+
+    async def assess_risk(symbol, timeframe, tech_result, sizing=None, max_risk_per_trade=None):
+        calls["risk"].append((symbol, sizing, max_risk_per_trade))
+        return {"sizing": sizing, "risk": {"vote": "approve"}}
+
+    async def run_scan_cycle(symbol, strategy_id, timeframe, **kwargs):
+        calls["decide"].append((strategy_id, symbol, kwargs["risk"], kwargs["max_risk_per_trade"]))
+        calls.setdefault("features", {})[(strategy_id, symbol)] = kwargs["features"]
+        return {"symbol": symbol, "strategy_id": strategy_id}
+
+    monkeypatch.setattr(planner_module, "_fetch", fetch)
+    monkeypatch.setattr(planner_module, "_indicators", indicators)
+    monkeypatch.setattr(planner_module, "_technical", technical)
+    monkeypatch.setattr(orchestrator, "size_candidates", size_candidates)
+    monkeypatch.setattr(orchestrator, "assess_risk", assess_risk)
+    monkeypatch.setattr(orchestrator, "run_scan_cycle", run_scan_cycle)
+    monkeypatch.setattr(planner_module.settings, "feature_store_enabled", True)
+    monkeypatch.setattr(
+        planner_module.feature_store, "get",
+        lambda symbol, timeframe, indicator, params=None, bar_time=None: {"bar_time": 0, "value": params["period"]},
+    )
+
+    planner = ScanPlanner(concurrency=4)
+    planner._strategies = [
+        _plan("a", ("BTCUSDT", "ETHUSDT", "FLATUSDT", "BADUSDT"), max_risk=0.01),
+        StrategyPlan(
+            id="b", symbols=("BTCUSDT",), timeframes=("1h",), agents_enabled=("technical_analyst",),
+            features=(FeatureSpec.parse("ema", {"period": 50}),),
+        ),
+    ]
+    planner.loaded_at = 0.0
+    return planner, calls
+
+
+async def test_all_candidates_are_sized_in_one_call(planner):
+    planner, calls = planner
+    pairs = [("BTCUSDT", "1h"), ("ETHUSDT", "1h"), ("FLATUSDT", "1h"), ("BADUSDT", "1h")]
+
+    results = await planner.run(pairs)
+
+    # One call for the dispatch: failed and directionless scans are left out
+    [candidates] = calls["size"]
+    assert {(c["symbol"], c["max_risk_per_trade"]) for c in candidates} == {
+        ("BTCUSDT", 0.01), ("BTCUSDT", None), ("ETHUSDT", 0.01),
+    }
+    assert len(candidates) == 3
+    assert planner.candidates_sized == 3
+
+    # Each strategy's risk check gets its own sizing and limit
+    assert {(s, limit) for s, _, limit in calls["risk"]} == {
+        ("BTCUSDT", 0.01), ("BTCUSDT", None), ("ETHUSDT", 0.01),
+    }
+    assert all(sizing["max_risk_per_trade"] == limit for _, sizing, limit in calls["risk"])
+    decided = {(strategy, symbol): limit for strategy, symbol, _, limit in calls["decide"]}
+    assert decided[("a", "BTCUSDT")] == 0.01
+    assert decided[("b", "BTCUSDT")] is None
+    assert decided[("a", "FLATUSDT")] == 0.01
+
+    # Each strategy's decision carries its own feature values
+    assert calls["features"][("b", "BTCUSDT")] == {"ema(period=50)": {"bar_time": 0, "value": 50}}
+    assert calls["features"][("a", "BTCUSDT")] == {}
+
+    # Only the pair whose analysis failed fails its decision
+    assert [r for r in results["a"] if "error" in r] == [
+        {"symbol": "BADUSDT", "timeframe": "1h", "strategy_id": "a", "error": "analysis failed"}
+    ]
+
+
+async def test_dag_passes_failed_inputs_only_when_allowed():
+    dag = ScanDAG(concurrency=2)
+
+    async def boom():
+        raise ValueError("boom")
+
+    async def echo(value):
+        return value
+
+    dag.add(("boom",), boom)
+    dag.add(("strict",), echo, (("boom",),))
+    dag.add(("tolerant",), echo, (("boom",),), allow_failed=True)
+    results = await dag.run()
+
+    assert isinstance(results[("strict",)], ValueError)
+    assert isinstance(results[("tolerant",)], ValueError)
+    assert results[("tolerant",)] is results[("boom",)]
+
+
+def test_strategy_row_risk_limit():
+    row = {
+        "id": "s1", "symbols": ["btcusdt"], "timeframes": ["1h"], "agents_enabled": ["technical_analyst"],
+        "config": '{"min_confidence": 0.6, "max_risk_per_trade": 0.005}', "is_paper": True,
+    }
+    plan = StrategyPlan.from_row(row)
+    assert plan.max_risk_per_trade == 0.005
+    assert plan.features == ()
+    assert StrategyPlan.from_row({**row, "config": None}).max_risk_per_trade is None
@@ -0,0 +1,36 @@
+"""Scan priority queue tests."""
+
+from src.tasks.scan_priority import ScanPriorityQueue
+
+
+def _queue_hot(queue: ScanPriorityQueue, n: int, now: float = 0.0):
+    for i in range(n):
+        queue._reschedule((f"S{i}USDT", "1m"), 0.9, now)
+
+
+def test_deferrals_are_reported_per_dispatch():
+    queue = ScanPriorityQueue(budget_per_minute=2)
+    _queue_hot(queue, 5)
+
+    assert len(queue.pop_due(1.0)) == 2
+    assert queue.last_deferred == 3
+
+    # Budget exhausted: nothing dispatched, the same three are still waiting
+    assert queue.pop_due(2.0) == []
+    assert queue.last_deferred == 3
+
+    assert len(queue.pop_due(70.0)) == 2
+    assert queue.last_deferred == 1
+
+    assert len(queue.pop_due(140.0)) == 1
+    assert queue.last_deferred == 0
+
+
+def test_a_waiting_scan_is_counted_as_deferred_once():
+    queue = ScanPriorityQueue(budget_per_minute=2)
+    _queue_hot(queue, 5)
+    for now in (1.0, 2.0, 3.0, 70.0, 140.0):
+        queue.pop_due(now)
+
+    assert queue.scans_dispatched == 5
+    assert queue.scans_deferred == 3
@@ -0,0 +1,42 @@
+"""ThresholdIndex tests."""
+
+from src.core.threshold_index import ThresholdIndex
+
+
+def _index(*levels: tuple[float, str]) -> ThresholdIndex:
+    index = ThresholdIndex()
+    for price, item_id in levels:
+        index.add(price, item_id)
+    return index
+
+
+def test_levels_stay_sorted_with_ids_in_parallel():
+    index = _index((105.0, "c"), (100.0, "a"), (102.5, "b"))
+    assert index.prices == [100.0, 102.5, 105.0]
+    assert index.ids == ["a", "b", "c"]
+    assert len(index) == 3
+
+
+def test_equal_levels_keep_insertion_order():
+    index = _index((100.0, "a"), (100.0, "b"), (100.0, "c"))
+    assert index.ids == ["a", "b", "c"]
+
+
+def test_remove_matches_level_and_id():
+    index = _index((100.0, "a"), (100.0, "b"), (101.0, "c"))
+    assert index.remove(100.0, "b")
+    assert index.ids == ["a", "c"]
+    assert not index.remove(100.0, "b")
+    assert not index.remove(101.0, "a")
+    assert len(index) == 2
+
+
+def test_between_bounds():
+    index = _index((99.0, "a"), (100.0, "b"), (101.0, "c"), (102.0, "d"))
+    assert index.between(100.0, 101.0, True, True) == ["b", "c"]
+    assert index.between(100.0, 101.0, False, True) == ["c"]
+    assert index.between(100.0, 101.0, True, False) == ["b"]
+    assert index.between(100.0, 101.0, False, False) == []
+    assert index.between(float("-inf"), 100.0, True, True) == ["a", "b"]
+    assert index.between(101.5, float("inf"), True, True) == ["d"]
+    assert index.between(103.0, 99.0, True, True) == []
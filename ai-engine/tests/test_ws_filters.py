@@ -0,0 +1,65 @@
+"""WebSocket subscription filter tests."""
+
+from src.api.endpoints.ws import TOPICS, _WsClient, _handle_control
+
+
+def _event(topic: str, symbol: str | None = None) -> dict:
+    payload = {"symbol": symbol} if symbol else {}
+    return {"type": f"agent:{topic}", "data": {"topic": topic, "payload": payload}}
+
+
+def test_default_client_receives_everything():
+    client = _WsClient(ws=None)
+    assert all(client.wants(_event(topic, "BTCUSDT")) for topic in TOPICS)
+
+
+def test_unsubscribe_topic_from_default_client():
+    client = _WsClient(ws=None)
+    reply = _handle_control(client, {"type": "unsubscribe", "topics": ["heartbeat"]})
+
+    assert not client.wants(_event("heartbeat"))
+    assert client.wants(_event("signal", "BTCUSDT"))
+    assert "heartbeat" not in reply["topics"]
+    assert "signal" in reply["topics"]
+
+
+def test_unsubscribe_last_topic_leaves_none():
+    client = _WsClient(ws=None)
+    _handle_control(client, {"type": "subscribe", "topics": ["signal"]})
+    assert client.wants(_event("signal"))
+    assert not client.wants(_event("consensus"))
+
+    reply = _handle_control(client, {"type": "unsubscribe", "topics": ["signal"]})
+
+    assert reply["topics"] == []
+    assert not any(client.wants(_event(topic)) for topic in TOPICS)
+
+
+def test_unsubscribe_symbol_from_default_client():
+    client = _WsClient(ws=None)
+    _handle_control(client, {"type": "unsubscribe", "symbols": ["ETHUSDT"]})
+
+    assert not client.wants(_event("signal", "ETHUSDT"))
+    assert client.wants(_event("signal", "BTCUSDT"))
+    # Events without a symbol are only filtered by topic
+    assert client.wants(_event("kill_switch"))
+
+
+def test_unsubscribe_last_symbol_leaves_none():
+    client = _WsClient(ws=None)
+    _handle_control(client, {"type": "subscribe", "symbols": "BTCUSDT"})
+    _handle_control(client, {"type": "unsubscribe", "symbols": ["BTCUSDT"]})
+
+    assert not client.wants(_event("signal", "BTCUSDT"))
+    assert not client.wants(_event("signal", "ETHUSDT"))
+    assert client.wants(_event("heartbeat"))
+
+
+def test_subscribe_adds_to_explicit_set():
+    client = _WsClient(ws=None)
+    _handle_control(client, {"type": "subscribe", "topics": ["signal"]})
+    _handle_control(client, {"type": "subscribe", "topics": ["consensus"]})
+
+    assert client.wants(_event("signal"))
+    assert client.wants(_event("consensus"))
+    assert not client.wants(_event("heartbeat"))
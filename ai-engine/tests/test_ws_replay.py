@@ -0,0 +1,66 @@
+"""WebSocket replay/resume tests."""
+
+import asyncio
+import json
+
+from src.api.endpoints import ws as ws_endpoint
+from src.api.endpoints.ws import _WsClient, _on_agent_event, _replay, _replay_gap, _ws_clients
+from src.core.message_bus import AgentMessage
+
+
+class _SlowSocket:
+    """Records sent frames; each send yields so live events can arrive mid-replay."""
+
+    def __init__(self):
+        self.frames: list[dict] = []
+
+    async def send_text(self, text: str):
+        await asyncio.sleep(0)
+        self.frames.append(json.loads(text))
+
+
+def _seqs(frames: list[dict]) -> list[int]:
+    seqs = []
+    for frame in frames:
+        if frame["type"] == "replay":
+            seqs.extend(e["seq"] for e in frame["events"])
+        elif frame["type"].startswith("agent:"):
+            seqs.append(frame["seq"])
+    return seqs
+
+
+async def _publish(n: int):
+    for i in range(n):
+        await _on_agent_event(AgentMessage(sender="test", topic="signal", payload={"i": i}))
+
+
+async def test_resume_holds_live_events_until_replay_finishes(monkeypatch):
+    monkeypatch.setattr(ws_endpoint, "REPLAY_CHUNK_SIZE", 1)
+    start = _replay.last_seq
+    await _publish(5)
+
+    client = _WsClient(ws=_SlowSocket())
+    _ws_clients[client.ws] = client
+    try:
+        client.replaying = True
+        try:
+            await asyncio.gather(_replay_gap(client, start), _publish(3))
+        finally:
+            client.replaying = False
+        await _publish(1)
+    finally:
+        _ws_clients.pop(client.ws, None)
+
+    assert _seqs(client.ws.frames) == list(range(start + 1, start + 10))
+
+
+async def test_incomplete_replay_continues_from_head():
+    await _publish(1)
+    client = _WsClient(ws=_SlowSocket())
+
+    head = _replay.last_seq
+    await asyncio.gather(_replay_gap(client, start_seq := -5), _publish(2))
+
+    assert client.ws.frames[0]["type"] == "replay_incomplete"
+    assert client.ws.frames[0]["requested_since"] == start_seq
+    assert _seqs(client.ws.frames) == [head + 1, head + 2]
@@ -0,0 +1,91 @@
+"""ZoneBook lifecycle tests."""
+
+from src.core import zone_registry as zone_module
+from src.core.zone_registry import ZoneBook
+
+
+def _candle(t: int, open_: float, close: float, high: float, low: float) -> dict:
+    return {"open_time": t, "open": open_, "close": close, "high": high, "low": low}
+
+
+# Bearish candle then a strong bullish one (OB 97–101), then a gap up (FVG 101–105)
+SETUP = [
+    _candle(0, 100, 98, 101, 97),
+    _candle(1, 98, 106, 107, 97.5),
+    _candle(2, 106, 110, 111, 105),
+]
+
+
+def _book(*candles: dict) -> ZoneBook:
+    return ZoneBook.from_candles([*SETUP, *candles])
+
+
+def _zone(book: ZoneBook, kind: str):
+    [zone] = book.zones(kind)
+    return zone
+
+
+def test_order_block_and_gap_are_created_by_their_confirming_candles():
+    book = _book()
+
+    ob, fvg = _zone(book, "order_block"), _zone(book, "fvg")
+    assert (ob.side, ob.low, ob.high, ob.created_at) == ("bullish", 97, 101, 1)
+    assert (fvg.side, fvg.low, fvg.high, fvg.created_at) == ("bullish", 101, 105, 2)
+    assert ob.status == fvg.status == "active"
+    assert book.counts["created"] == 2
+
+
+def test_touch_then_fill_retires_the_gap():
+    book = _book(_candle(3, 110, 109, 110.5, 104))
+    fvg = _zone(book, "fvg")
+    assert (fvg.status, fvg.touches, fvg.touched_at) == ("touched", 1, 3)
+    assert book.entered == [fvg]
+
+    book.update(_candle(4, 109, 108, 109, 100.5))
+
+    assert book.zones("fvg") == []
+    assert (fvg.status, fvg.mitigated_at, fvg.retired_at) == ("mitigated", 4, 4)
+    assert book.history[-1] is fvg
+    # The order block was only entered, not traded to its midpoint (99)
+    assert _zone(book, "order_block").status == "touched"
+
+
+def test_revisits_count_once_per_visit():
+    book = _book(
+        _candle(3, 110, 109, 110.5, 104),
+        _candle(4, 109, 109.5, 110, 104.5),   # still inside the gap
+        _candle(5, 109.5, 109, 110, 106),     # out
+        _candle(6, 109, 109.5, 110, 104),     # back in
+    )
+
+    assert _zone(book, "fvg").touches == 2
+
+
+def test_close_below_an_order_block_flips_it_into_a_breaker():
+    book = _book(
+        _candle(3, 110, 109, 110.5, 104),
+        _candle(4, 109, 108, 109, 100.5),
+        _candle(5, 108, 96, 108, 95),
+    )
+
+    assert book.zones("order_block") == []
+    breaker = _zone(book, "breaker")
+    assert (breaker.side, breaker.low, breaker.high, breaker.created_at) == ("bearish", 97, 101, 5)
+    assert book.history[-1].status == "invalidated"
+    assert book.containing(99.0) == [breaker]
+    assert book.near(102.0, 0.02) == [breaker]
+    assert book.near(110.0, 0.02) == []
+
+    # A close back above the breaker retires it too
+    book.update(_candle(6, 96, 102, 103, 95.5))
+    assert book.zones() == []
+    assert book.counts["invalidated"] == 2
+
+
+def test_oldest_zones_expire_beyond_the_cap(monkeypatch):
+    monkeypatch.setattr(zone_module, "MAX_ACTIVE_ZONES", 1)
+    book = _book()
+
+    assert [z.kind for z in book.zones()] == ["fvg"]
+    assert book.history[-1].status == "expired"
+    assert book.get_stats()["expired"] == 1
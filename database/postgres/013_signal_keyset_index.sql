@@ -0,0 +1,11 @@
+-- =============================================================================
+-- 013: Signal History Keyset Pagination — (created_at, id) indexes
+-- =============================================================================
+
+-- Cursor pagination on /signals/recent orders by (created_at DESC, id DESC)
+CREATE INDEX IF NOT EXISTS idx_ualgo_signal_created_id
+  ON ualgo_signal (created_at DESC, id DESC);
+
+-- Same ordering within a symbol (the most common filter)
+CREATE INDEX IF NOT EXISTS idx_ualgo_signal_symbol_created_id
+  ON ualgo_signal (symbol, created_at DESC, id DESC);
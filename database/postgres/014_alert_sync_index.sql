@@ -0,0 +1,7 @@
+-- =============================================================================
+-- 014: User Alert Incremental Sync — updated_at index
+-- =============================================================================
+
+-- The ai-engine AlertEngine polls rows changed since its last watermark
+CREATE INDEX IF NOT EXISTS idx_user_alert_updated_at
+  ON user_alert (updated_at);
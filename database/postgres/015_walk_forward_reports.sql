@@ -0,0 +1,19 @@
+-- =============================================================================
+-- 015: Walk-Forward Validation — persisted stability reports
+-- =============================================================================
+
+-- One row per Quant Lab walk-forward run (ai-engine src/backtest/walk_forward.py)
+CREATE TABLE IF NOT EXISTS ualgo_walk_forward_report (
+  id                 BIGSERIAL PRIMARY KEY,
+  strategy_id        TEXT NOT NULL DEFAULT 'default',
+  timeframe          TEXT NOT NULL,
+  symbols            INTEGER NOT NULL,
+  windows_planned    INTEGER NOT NULL,
+  windows_completed  INTEGER NOT NULL,
+  stable             BOOLEAN NOT NULL DEFAULT FALSE,
+  duration_ms        INTEGER,
+  report             JSONB NOT NULL,
+  created_at         TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+CREATE INDEX IF NOT EXISTS idx_walk_forward_strategy
+  ON ualgo_walk_forward_report (strategy_id, created_at DESC);
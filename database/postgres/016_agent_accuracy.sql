@@ -0,0 +1,26 @@
+-- =============================================================================
+-- 016: Agent Accuracy — calibrated consensus weights per agent and regime
+-- =============================================================================
+
+-- Price regime the vote was cast in (market_regime detector on the scan timeframe)
+ALTER TABLE ualgo_consensus_vote
+  ADD COLUMN IF NOT EXISTS regime TEXT NOT NULL DEFAULT 'default';
+COMMENT ON COLUMN ualgo_consensus_vote.regime IS
+  'Price regime the vote was cast in (trend x volatility label, e.g. trend_up_high_vol); default when unknown';
+
+-- Resolved vote counts, accumulated incrementally by the ai-engine AgentWeights
+-- calibration (votes on signals whose position has closed)
+CREATE TABLE IF NOT EXISTS ualgo_agent_accuracy (
+  agent_name        TEXT NOT NULL,
+  regime            TEXT NOT NULL,
+  votes             BIGINT NOT NULL DEFAULT 0,
+  correct           BIGINT NOT NULL DEFAULT 0,
+  resolved_through  TIMESTAMPTZ NOT NULL,
+  updated_at        TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+  PRIMARY KEY (agent_name, regime)
+);
+
+-- Calibration scans positions closed after the watermark
+CREATE INDEX IF NOT EXISTS idx_position_closed_at
+  ON ualgo_position (closed_at) WHERE status = 'closed';
+CREATE INDEX IF NOT EXISTS idx_position_signal ON ualgo_position (signal_id);
@@ -0,0 +1,7 @@
+-- =============================================================================
+-- 017: Trade Signal Index — close fills together with their positions
+-- =============================================================================
+
+-- Exit triggers close a position's open ualgo_trade fill by signal_id
+CREATE INDEX IF NOT EXISTS idx_ualgo_trade_signal_open
+  ON ualgo_trade (signal_id) WHERE status = 'open';